@@ -0,0 +1,280 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from argparse import SUPPRESS, ArgumentParser
+from gc import callbacks, collect, disable, enable
+from json import dump, load, loads
+from math import ceil
+from pathlib import Path
+from subprocess import run
+from sys import executable, exit
+from typing import Any, Callable
+import tracemalloc
+
+from Secweb import SecWeb
+from Secweb.asgi import ASGIApp, Message
+from Secweb.index import MIDDLEWARE_REGISTRY
+from Secweb.ClearSiteData import ClearSiteData
+from Secweb.ClientHints import ClientHints
+from Secweb.ContentSecurityPolicy import ContentSecurityPolicy
+
+BUDGETS = Path(__file__).with_name('allocation_budgets.json')
+HEADROOM: dict[str, Callable[[float], float]] = {
+    'blocks': lambda value: value,
+    'bytes': lambda value: ceil(value * 1.1),
+    'surviving_blocks': lambda value: round(value + 0.05, 2),
+    'surviving_bytes': lambda value: round(value + 5, 2),
+    'gen0_per_10k': lambda value: value + 1,
+    'traced_peak_kib': lambda value: ceil(value * 1.1),
+}
+FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+
+
+async def endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def large_policy(hosts: int) -> dict[str, list[str]]:
+    """
+    Build a CSP policy with many allowed hosts.
+
+    Args:
+        hosts (int): The number of hosts in every fetch directive.
+
+    Returns:
+        dict[str, list[str]]: The CSP option dictionary.
+    """
+    sources = ["'self'"] + [f'https://cdn{i}.example.com' for i in range(hosts)]
+    return {directive: sources for directive in ('default-src', 'script-src', 'style-src', 'img-src', 'connect-src', 'font-src')}
+
+
+CASES: dict[str, Callable[[ASGIApp], ASGIApp]] = {
+    **{key: (lambda app, cls=cls: cls(app)) for key, (cls, default) in MIDDLEWARE_REGISTRY.items() if default},
+    'clientHints': lambda app: ClientHints(app, {'hints': ['Save-Data', 'ECT'], 'vary': True}),
+    'csp': lambda app: ContentSecurityPolicy(app),
+    'csp-nonce': lambda app: ContentSecurityPolicy(app, script_nonce=True, style_nonce=True),
+    'clearSiteData': lambda app: ClearSiteData(app, Routes=['/logout']),
+    'SecWeb': lambda app: SecWeb.wrap(app, Routes=['/logout']),
+}
+
+RSS_CASES: dict[str, Callable[[ASGIApp], ASGIApp]] = {
+    'clearSiteData-1-routes': lambda app: ClearSiteData(app, Routes=['/logout']),
+    'clearSiteData-100-routes': lambda app: ClearSiteData(app, Routes=[f'/r{i}/{{id:int}}' if i % 2 else f'/r{i}' for i in range(100)] + ['/logout']),
+    'clearSiteData-10000-routes': lambda app: ClearSiteData(app, Routes=[f'/r{i}/{{id:int}}' if i % 2 else f'/r{i}' for i in range(10000)] + ['/logout']),
+    'csp-500-hosts': lambda app: ContentSecurityPolicy(app, Option=large_policy(500)),
+    'csp-500-hosts-nonce': lambda app: ContentSecurityPolicy(app, script_nonce=True, Option=large_policy(500)),
+}
+
+
+def request(app: ASGIApp, inspect: Callable[[Message], None] = lambda message: None, headers: tuple[tuple[bytes, bytes], ...] = ()) -> None:
+    """
+    Send one GET request through the app, the coroutine is stepped directly because nothing in it waits on I/O.
+
+    Args:
+        app (ASGIApp): The application.
+        inspect (Callable, optional): Called with the response start message when it reaches the server. Defaults to a no-op.
+        headers (tuple, optional): Extra request headers. Defaults to ().
+
+    Returns:
+        None
+    """
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "https", "path": "/logout", "raw_path": b"/logout",
+             "root_path": "", "query_string": b"", "headers": [(b"host", b"example.com"), (b"user-agent", b"bench"), *headers], "client": ("127.0.0.1", 1), "server": ("example.com", 443), "state": {}}
+    message = {"type": "http.request", "body": b"", "more_body": False}
+
+    async def receive() -> Message:
+        return message
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            inspect(message)
+
+    try:
+        app(scope, receive, send).send(None)
+    except StopIteration:
+        pass
+
+
+def profile(app: ASGIApp, requests: int) -> dict[str, float]:
+    """
+    Measure the allocations of one app.
+
+    Args:
+        app (ASGIApp): The application.
+        requests (int): The number of requests used for the survivor and GC measurements.
+
+    Returns:
+        dict[str, float]: The blocks and bytes live at response start, the bytes and blocks that survive a request and the generation 0 collections per 10k requests.
+    """
+    for _ in range(100):
+        request(app)
+
+    disable()
+    collect()
+    live: dict[str, float] = {}
+    baseline = tracemalloc.take_snapshot().filter_traces(FILTERS)
+
+    def inspect(message: Message):
+        stats = tracemalloc.take_snapshot().filter_traces(FILTERS).compare_to(baseline, 'lineno')
+        live['blocks'] = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+        live['bytes'] = sum(stat.size_diff for stat in stats if stat.size_diff > 0)
+
+    request(app, inspect)
+
+    collect()
+    before = tracemalloc.take_snapshot().filter_traces(FILTERS)
+    for _ in range(requests):
+        request(app)
+    collect()
+    stats = tracemalloc.take_snapshot().filter_traces(FILTERS).compare_to(before, 'lineno')
+    enable()
+
+    collections = [0]
+
+    def count(phase: str, info: dict[str, Any]) -> None:
+        if phase == 'start' and info['generation'] == 0:
+            collections[0] += 1
+
+    callbacks.append(count)
+    try:
+        for _ in range(requests):
+            request(app)
+    finally:
+        callbacks.remove(count)
+
+    return {
+        'blocks': live['blocks'],
+        'bytes': live['bytes'],
+        'surviving_blocks': round(sum(stat.count_diff for stat in stats if stat.count_diff > 0) / requests, 2),
+        'surviving_bytes': round(sum(stat.size_diff for stat in stats if stat.size_diff > 0) / requests, 2),
+        'gen0_per_10k': round(collections[0] * 10000 / requests, 1),
+    }
+
+
+def peak(case: str) -> dict[str, float]:
+    """
+    Measure the memory of one large configuration in a fresh interpreter so the peak RSS is not shared with the other cases.
+
+    Args:
+        case (str): The name of the case in RSS_CASES.
+
+    Returns:
+        dict[str, float]: The peak RSS in KiB, where the resource module exists, and the traced peak of building the middleware and serving 1000 requests.
+    """
+    result = run([executable, __file__, '--child', case], capture_output=True, text=True, check=True)
+    return loads(result.stdout)
+
+
+def child(case: str) -> None:
+    """
+    Build one large configuration, serve 1000 requests and print its memory as JSON, runs in the fresh interpreter started by peak.
+
+    Args:
+        case (str): The name of the case in RSS_CASES.
+
+    Returns:
+        None
+    """
+    tracemalloc.start()
+    app = RSS_CASES[case](endpoint)
+    for _ in range(1000):
+        request(app)
+    traced = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    try:
+        from resource import RUSAGE_SELF, getrusage
+        rss = getrusage(RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        rss = None
+    print(f'{{"traced_peak_kib": {traced // 1024}, "peak_rss_kib": {"null" if rss is None else rss}}}')
+
+
+def check_headers() -> list[str]:
+    """
+    Check the headers of the configurations whose correctness depends on the order of the SecWeb layers, a budget is meaningless if they are wrong.
+
+    Returns:
+        list[str]: A message for every wrong header.
+    """
+    failures = []
+    seen: dict[str, list[bytes]] = {}
+
+    def inspect(message: Message) -> None:
+        seen['cache-control'] = [value for name, value in message["headers"] if name.lower() == b'cache-control']
+
+    save_data = SecWeb.wrap(endpoint, Option={'clientHints': {'hints': ['Save-Data'], 'saveDataCacheControl': {'no-store': True}}})
+    request(save_data, inspect, ((b'save-data', b'on'),))
+    if seen.get('cache-control') != [b'no-store']:
+        failures.append(f'SecWeb clientHints saveDataCacheControl sets Cache-Control {seen.get("cache-control")} instead of [no-store] for Save-Data requests')
+    request(save_data, inspect)
+    if seen.get('cache-control') != [b'max-age=604800, private']:
+        failures.append(f'SecWeb clientHints saveDataCacheControl sets Cache-Control {seen.get("cache-control")} instead of the default for other requests')
+    return failures
+
+
+def over_budget(results: dict[str, dict[str, float]], budgets: dict[str, dict[str, float]]) -> list[str]:
+    """
+    Compare the results against the committed budgets.
+
+    Args:
+        results (dict): The measurements keyed by case.
+        budgets (dict): The budgets keyed by case, a missing case or metric has no budget.
+
+    Returns:
+        list[str]: A message for every metric over its budget.
+    """
+    return [f'{case} {metric}: {value} > {budgets[case][metric]}'
+            for case, metrics in results.items() for metric, value in metrics.items()
+            if value is not None and case in budgets and metric in budgets[case] and value > budgets[case][metric]]
+
+
+def main() -> None:
+    parser = ArgumentParser(description='Allocations per request of every Secweb middleware, checked against allocation_budgets.json')
+    parser.add_argument('--requests', type=int, default=10000, help='the number of requests per case (default: 10000)')
+    parser.add_argument('--update', action='store_true', help='write the measurements as the new budgets')
+    parser.add_argument('--child', help=SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args.child)
+
+    failures = check_headers()
+    for failure in failures:
+        print(f'WRONG HEADERS {failure}')
+    if failures:
+        exit(1)
+
+    tracemalloc.start()
+    profile(CASES['SecWeb'](endpoint), 100)
+    results: dict[str, dict[str, float]] = {}
+    print(f'{"case":<28} {"blocks":>7} {"bytes":>7} {"surv.blocks":>12} {"surv.bytes":>11} {"gen0/10k":>9}')
+    for case, factory in CASES.items():
+        metrics = results[case] = profile(factory(endpoint), args.requests)
+        print(f'{case:<28} {metrics["blocks"]:>7} {metrics["bytes"]:>7} {metrics["surviving_blocks"]:>12} {metrics["surviving_bytes"]:>11} {metrics["gen0_per_10k"]:>9}')
+    tracemalloc.stop()
+
+    print(f'\n{"case":<28} {"traced peak KiB":>16} {"peak RSS KiB":>13}')
+    for case in RSS_CASES:
+        metrics = results[case] = peak(case)
+        print(f'{case:<28} {metrics["traced_peak_kib"]:>16} {str(metrics["peak_rss_kib"]):>13}')
+
+    if args.update:
+        with BUDGETS.open('w') as file:
+            dump({case: {metric: HEADROOM[metric](value) for metric, value in metrics.items() if metric in HEADROOM} for case, metrics in results.items()}, file, indent=4)
+            file.write('\n')
+        print(f'\nWrote {BUDGETS.name}')
+        return
+
+    with BUDGETS.open() as file:
+        failures = over_budget(results, load(file))
+    for failure in failures:
+        print(f'OVER BUDGET {failure}')
+    exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
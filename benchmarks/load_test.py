@@ -0,0 +1,201 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from argparse import ArgumentParser
+from asyncio import gather, open_connection, run, sleep
+from importlib.util import find_spec
+from os import environ, pathsep
+from pathlib import Path
+from socket import socket
+from subprocess import DEVNULL, Popen
+from sys import executable
+from time import perf_counter, perf_counter_ns
+
+from Secweb import SecWeb
+from Secweb.asgi import ASGIApp, Receive, Scope, Send
+from Secweb.ContentSecurityPolicy import Nonce_Processor
+
+PATHS = ('/', '/static/app.js', '/logout')
+SERVERS = {
+    'uvicorn': lambda port: ['-m', 'uvicorn', 'load_test:app', '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning', '--no-access-log'],
+    'hypercorn': lambda port: ['-m', 'hypercorn', 'load_test:app', '--bind', f'127.0.0.1:{port}', '--log-level', 'warning'],
+}
+
+
+async def reference(scope: Scope, receive: Receive, send: Send) -> None:
+    """
+    The reference application, a small HTML page that uses the script nonce, a static script and a logout page.
+
+    Args:
+        scope (Scope): The scope of the request.
+        receive (Receive): A function that returns a coroutine that reads messages from the server.
+        send (Send): A function that sends messages to the server.
+
+    Returns:
+        None
+    """
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            await send({"type": f"{message['type']}.complete"})
+            if message["type"] == "lifespan.shutdown":
+                return
+
+    if scope["path"] == "/static/app.js":
+        body, kind = b"console.log('secweb');", b"text/javascript"
+    else:
+        body, kind = f'<html><script nonce="{Nonce_Processor(16)}">1</script></html>'.encode('latin-1'), b"text/html; charset=utf-8"
+
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", kind), (b"content-length", str(len(body)).encode('latin-1'))]})
+    await send({"type": "http.response.body", "body": body})
+
+
+PROFILES = {
+    'none': lambda app: app,
+    'defaults': lambda app: SecWeb.wrap(app),
+    'csp-nonce': lambda app: SecWeb.wrap(app, Option={'csp': {'default-src': ["'self'"], 'script-src': ["'self'", "'strict-dynamic'"], 'style-src': ["'self'"], 'object-src': ["'none'"], 'base-uri': ["'none'"]}}, script_nonce=True, style_nonce=True),
+    'routes': lambda app: SecWeb.wrap(app, Option={'clearSiteData': {'cache': True, 'cookies': True}, 'bypass': {'paths': ['/healthz'], 'prefixes': ['/metrics']}},
+                                      Routes=[f'/account/{i}/logout' for i in range(1000)] + ['/logout/{session:uuid}', '/logout']),
+}
+
+app: ASGIApp = PROFILES[environ.get('SECWEB_PROFILE', 'none')](reference)
+
+
+def free_port() -> int:
+    """
+    Find a free loopback port.
+
+    Returns:
+        int: The port number.
+    """
+    with socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def wait_ready(port: int, timeout: float = 20.0) -> None:
+    """
+    Wait until the server accepts connections on the port.
+
+    Args:
+        port (int): The loopback port.
+        timeout (float, optional): The number of seconds to wait. Defaults to 20.0.
+
+    Raises:
+        TimeoutError: If the server does not start in time.
+
+    Returns:
+        None
+    """
+    end = perf_counter() + timeout
+    while perf_counter() < end:
+        try:
+            _, writer = await open_connection('127.0.0.1', port)
+            writer.close()
+            return
+        except OSError:
+            await sleep(0.05)
+    raise TimeoutError(f'The server on port {port} did not start')
+
+
+async def client(port: int, end: float, latencies: list[int]) -> None:
+    """
+    Send GET requests over one keep-alive HTTP/1.1 connection until the end time, cycling through the reference paths.
+
+    Args:
+        port (int): The loopback port.
+        end (float): The perf_counter time to stop at.
+        latencies (list[int]): The list the latency of every request is appended to, in nanoseconds.
+
+    Returns:
+        None
+    """
+    reader, writer = await open_connection('127.0.0.1', port)
+    requests = [f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nUser-Agent: secweb-load\r\n\r\n'.encode('latin-1') for path in PATHS]
+    count = 0
+    try:
+        while perf_counter() < end:
+            start = perf_counter_ns()
+            writer.write(requests[count % len(requests)])
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = 0
+            for line in head.split(b'\r\n'):
+                if line[:15].lower() == b'content-length:':
+                    length = int(line[15:])
+            await reader.readexactly(length)
+            latencies.append(perf_counter_ns() - start)
+            count += 1
+    finally:
+        writer.close()
+
+
+async def load(port: int, concurrency: int, duration: float, warmup: float) -> tuple[float, list[int]]:
+    """
+    Drive the server at a fixed concurrency.
+
+    Args:
+        port (int): The loopback port.
+        concurrency (int): The number of connections, each with one request in flight.
+        duration (float): The number of seconds to measure.
+        warmup (float): The number of seconds to run before measuring.
+
+    Returns:
+        tuple[float, list[int]]: The requests per second and the sorted latencies in nanoseconds.
+    """
+    await wait_ready(port)
+    await gather(*[client(port, perf_counter() + warmup, []) for _ in range(concurrency)])
+    latencies: list[int] = []
+    start = perf_counter()
+    await gather(*[client(port, start + duration, latencies) for _ in range(concurrency)])
+    elapsed = perf_counter() - start
+    latencies.sort()
+    return len(latencies) / elapsed, latencies
+
+
+def percentile(latencies: list[int], q: float) -> float:
+    """
+    Read a percentile from sorted latencies.
+
+    Args:
+        latencies (list[int]): The sorted latencies in nanoseconds.
+        q (float): The percentile between 0 and 100.
+
+    Returns:
+        float: The latency in milliseconds.
+    """
+    if not latencies:
+        return float('nan')
+    return latencies[min(len(latencies) - 1, int(len(latencies) * q / 100))] / 1e6
+
+
+def main() -> None:
+    parser = ArgumentParser(description='Throughput and latency of the reference app under real local ASGI servers with each Secweb profile')
+    parser.add_argument('--servers', nargs='+', default=list(SERVERS), choices=list(SERVERS), help='the servers to start (default: all installed)')
+    parser.add_argument('--profiles', nargs='+', default=list(PROFILES), choices=list(PROFILES), help='the Secweb profiles (default: all)')
+    parser.add_argument('--concurrency', type=int, default=32, help='the number of keep-alive connections (default: 32)')
+    parser.add_argument('--duration', type=float, default=10.0, help='the seconds measured per run (default: 10)')
+    parser.add_argument('--warmup', type=float, default=2.0, help='the seconds of warmup per run (default: 2)')
+    args = parser.parse_args()
+
+    print(f'{"server":<10} {"profile":<10} {"req/s":>10} {"p50 ms":>8} {"p99 ms":>8} {"p999 ms":>8}')
+    for server in args.servers:
+        if find_spec(server) is None:
+            print(f'{server:<10} not installed, skipped')
+            continue
+        for profile in args.profiles:
+            port = free_port()
+            env = {**environ, 'SECWEB_PROFILE': profile, 'PYTHONPATH': pathsep.join([str(Path(__file__).parent), *environ.get('PYTHONPATH', '').split(pathsep)]).rstrip(pathsep)}
+            process = Popen([executable, *SERVERS[server](port)], env=env, stdout=DEVNULL)
+            try:
+                rate, latencies = run(load(port, args.concurrency, args.duration, args.warmup))
+            finally:
+                process.terminate()
+                process.wait()
+            print(f'{server:<10} {profile:<10} {rate:>10.0f} {percentile(latencies, 50):>8.2f} {percentile(latencies, 99):>8.2f} {percentile(latencies, 99.9):>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from argparse import ArgumentParser
+from asyncio import new_event_loop
+from os import cpu_count
+from sys import version
+from threading import Barrier, Thread
+from time import perf_counter
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from Secweb import SecWeb
+from Secweb.ContentSecurityPolicy import Nonce_Processor
+
+
+async def endpoint(request):
+    return PlainTextResponse(Nonce_Processor(16))
+
+
+def build_app() -> Starlette:
+    """
+    Build a Starlette app with every default Secweb middleware and nonce based CSP.
+
+    Returns:
+        Starlette: The application.
+    """
+    app = Starlette(routes=[Route('/', endpoint)])
+    SecWeb(app=app, Option={'referrer': ['no-referrer']}, script_nonce=True, style_nonce=True)
+    return app
+
+
+async def drive(app: Starlette, requests: int) -> None:
+    """
+    Send requests straight through the ASGI interface of the app, without a server or sockets.
+
+    Args:
+        app (Starlette): The application.
+        requests (int): The number of requests.
+
+    Returns:
+        None
+    """
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(requests):
+        scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "https", "path": "/", "raw_path": b"/",
+                 "root_path": "", "query_string": b"", "headers": [(b"host", b"example.com"), (b"user-agent", b"bench")], "client": ("127.0.0.1", 1), "server": ("example.com", 443), "state": {}}
+        await app(scope, receive, send)
+
+
+def measure(app: Starlette, threads: int, requests: int) -> float:
+    """
+    Run the requests in threads, every thread with its own event loop.
+
+    Args:
+        app (Starlette): The application shared by the threads.
+        threads (int): The number of threads.
+        requests (int): The number of requests per thread.
+
+    Returns:
+        float: The requests per second of all the threads.
+    """
+    barrier = Barrier(threads + 1)
+
+    def worker():
+        loop = new_event_loop()
+        barrier.wait()
+        loop.run_until_complete(drive(app, requests))
+        loop.close()
+
+    workers = [Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * requests / (perf_counter() - start)
+
+
+def main() -> None:
+    parser = ArgumentParser(description='Requests per second of a Secweb protected app from 1 to N threads')
+    parser.add_argument('--threads', type=int, default=cpu_count() or 1, help='the largest number of threads (default: number of CPUs)')
+    parser.add_argument('--requests', type=int, default=2000, help='the number of requests per thread (default: 2000)')
+    args = parser.parse_args()
+
+    gil = getattr(__import__('sys'), '_is_gil_enabled', lambda: True)()
+    print(f'Python {version.split()[0]}, GIL {"enabled" if gil else "disabled"}, {cpu_count()} CPUs')
+
+    app = build_app()
+    measure(app, 1, 200)
+    baseline = None
+    print(f'{"threads":>8} {"req/s":>12} {"scaling":>8}')
+    threads = 1
+    while threads <= args.threads:
+        rate = measure(app, threads, args.requests)
+        baseline = baseline or rate
+        print(f'{threads:>8} {rate:>12.0f} {rate / baseline:>7.2f}x')
+        threads = threads * 2 if threads * 2 <= args.threads or threads == args.threads else args.threads
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from typing import Optional, TypedDict
+from ..asgi import Send, Receive, Scope, ASGIApp
+
+from ..routes import PathTrie
+
+BypassOptions = TypedDict(
+    'BypassOptions',
+    {
+        'paths': list[str],
+        'prefixes': list[str]
+    },
+    total=False
+)
+
+
+class Bypass:
+    ''' Bypass class sends the excluded requests straight to the application, past every Secweb middleware placed directly below it.
+
+    The exact paths are kept in a frozenset and the prefixes in a trie of path segments, the excluded requests get no send wrapper and no
+    header work. SecWeb adds it as its outermost layer when the 'bypass' option is set.
+
+    Example:
+        app.add_middleware(Bypass, Option={'paths': ['/healthz', '/readyz'], 'prefixes': ['/metrics']})
+
+    Parameter:
+        Option (BypassOptions):
+            - 'paths': The exact paths that are excluded, eg. '/healthz'.
+            - 'prefixes': The path prefixes that are excluded with every path below them, eg. '/metrics'.
+
+    '''
+    def __init__(self, app: ASGIApp, Option: BypassOptions = {}):
+        """
+        Initializes the class.
+
+        Args:
+            app (ASGIApp): The application object.
+            Option (BypassOptions):
+                - 'paths': The exact paths that are excluded, eg. '/healthz'.
+                - 'prefixes': The path prefixes that are excluded with every path below them, eg. '/metrics'.
+
+        Raises:
+            SyntaxError: If the options are empty or a path does not start with '/'.
+
+        Returns:
+            None
+        """
+        self.app = app
+        if set(Option.keys()) - {'paths', 'prefixes'}:
+            raise SyntaxError('Bypass has 2 options 1> "paths" 2> "prefixes"')
+
+        paths = list(Option.get('paths', []))
+        prefixes = list(Option.get('prefixes', []))
+        if paths.__len__() == 0 and prefixes.__len__() == 0:
+            raise SyntaxError('Cannot bypass Secweb if the paths and the prefixes are empty')
+        for path in paths + prefixes:
+            if not path.startswith('/'):
+                raise SyntaxError(f'The path {path} needs to start with "/"')
+
+        self.paths = frozenset(paths)
+        self.prefixes = PathTrie(prefixes)
+        self.inner_app: Optional[ASGIApp] = None
+
+    def __inner_app__(self) -> ASGIApp:
+        """
+        Finds the first application below this middleware that is not a Secweb middleware.
+
+        Returns:
+            ASGIApp: The application that receives the excluded requests.
+        """
+        app = self.app
+        while type(app).__module__.startswith('Secweb.') and hasattr(app, 'app'):
+            app = app.app
+        self.inner_app = app
+        return app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Asynchronously handles HTTP requests by sending the excluded paths straight to the application.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+            receive (Receive): A function that returns a coroutine that reads messages from the server.
+            send (Send): A function that sends messages to the server.
+
+        Returns:
+            None
+        """
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path in self.paths or (self.prefixes and self.prefixes.match(path)):
+                return await (self.inner_app or self.__inner_app__())(scope, receive, send)
+
+        await self.app(scope, receive, send)
@@ -0,0 +1 @@
+from .BypassMiddleware import Bypass as Bypass
\ No newline at end of file
@@ -5,9 +5,12 @@
   Copyright 2021-2026, Motagamwala Taha Arif Ali '''
 
 from typing import TypedDict
-from starlette.types import Send, Receive, Scope, Message, ASGIApp
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
 
-from starlette.datastructures import MutableHeaders
+from ..datastructures import MutableHeaders
+
+from ..dedupe import already_applied
+from ..policy import Policy
 
 CacheControlOptions = TypedDict(
     'CacheControlOptions', {
@@ -51,7 +54,7 @@ class CacheControl:
             - 'stale-if-error' (int): The maximum age of stale content in seconds if a server side error occurs.
     
     '''
-    def __init__(self, app: ASGIApp, Option: CacheControlOptions = {'max-age': 604800, 'private': True }):
+    def __init__(self, app: ASGIApp, Option: CacheControlOptions = Policy({'max-age': 604800, 'private': True})):
         """
         Initializes a new instance of the class.
 
@@ -80,6 +83,7 @@ class CacheControl:
         """
         self.app = app
         self.policyString = ''
+        Option = Option.copy()
         if 'max-age' in Option and Option['max-age'] >= 0:
             self.policyString += f'max-age={str(Option["max-age"])}' if list(Option.keys()).__len__() == 1 else f'max-age={str(Option["max-age"])}, '
             Option.pop('max-age')
@@ -134,7 +138,7 @@ class CacheControl:
         Returns:
             None
         """
-        if scope["type"] != "http":
+        if scope["type"] != "http" or already_applied(scope, b'cache-control'):
             return await self.app(scope, receive, send)
 
         async def set_Cache_Control(message: Message):
@@ -5,12 +5,13 @@
   Copyright 2021-2026, Motagamwala Taha Arif Ali '''
 
 from typing import Pattern, TypedDict
-from starlette.datastructures import MutableHeaders
-from starlette.types import Send, Receive, Scope, Message, ASGIApp
+from ..datastructures import MutableHeaders
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
 
-from starlette.convertors import CONVERTOR_TYPES
 from re import compile, escape
 
+from ..policy import Policy
+
 ClearSiteDataOptions = TypedDict(
     'ClearSiteDataOptions',
     {
@@ -24,6 +25,40 @@ ClearSiteDataOptions = TypedDict(
     total=False
 )
 
+CONVERTOR_TYPES: dict[str, str] = {
+    "str": "[^/]+",
+    "path": ".*",
+    "int": "[0-9]+",
+    "float": r"[0-9]+(\.[0-9]+)?",
+    "uuid": "[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}",
+}
+
+
+def __convertor_regex__(convertor_type: str) -> str:
+    """
+    Find the regular expression of a path convertor, Starlette convertors registered with register_url_convertor are used when Starlette is installed.
+
+    Args:
+        convertor_type (str): The name of the convertor, eg. 'int'.
+
+    Raises:
+        AssertionError: If the convertor is unknown.
+
+    Returns:
+        str: The regular expression of the convertor.
+    """
+    if convertor_type in CONVERTOR_TYPES:
+        return CONVERTOR_TYPES[convertor_type]
+    try:
+        from starlette.convertors import CONVERTOR_TYPES as STARLETTE_CONVERTOR_TYPES
+    except ImportError:
+        STARLETTE_CONVERTOR_TYPES = {}
+    assert (
+        convertor_type in STARLETTE_CONVERTOR_TYPES
+    ), f"Unknown path convertor '{convertor_type}'"
+    return STARLETTE_CONVERTOR_TYPES[convertor_type].regex
+
+
 def __path_regex_builder__(path: str) -> Pattern[str]:
     """
     Generate a regular expression pattern for a given path.
@@ -46,13 +81,10 @@ def __path_regex_builder__(path: str) -> Pattern[str]:
     for match in compile("{([a-zA-Z_][a-zA-Z0-9_]*)(:[a-zA-Z_][a-zA-Z0-9_]*)?}").finditer(path):
         param_name, convertor_type = match.groups("str")
         convertor_type = convertor_type.lstrip(":")
-        assert (
-            convertor_type in CONVERTOR_TYPES
-        ), f"Unknown path convertor '{convertor_type}'"
-        convertor = CONVERTOR_TYPES[convertor_type]
+        convertor = __convertor_regex__(convertor_type)
 
         path_regex += escape(path[idx : match.start()])
-        path_regex += f"(?P<{param_name}>{convertor.regex})"
+        path_regex += f"(?P<{param_name}>{convertor})"
 
         idx = match.end()
 
@@ -81,7 +113,7 @@ class ClearSiteData:
         Routes (list): The list of routes. Defaults to [].
     
     '''
-    def __init__(self, app: ASGIApp, Option: ClearSiteDataOptions = {'*': True}, Routes: list[str] = []):
+    def __init__(self, app: ASGIApp, Option: ClearSiteDataOptions = Policy({'*': True}), Routes: list[str] = []):
         """
         Initializes the class with the provided parameters.
 
@@ -108,6 +140,7 @@ class ClearSiteData:
             raise SyntaxError('Cannot Set Clear-Site-Data header if the routes are empty')
         
         self.pathregex = [__path_regex_builder__(i) for i in Routes]
+        Option = Option.copy()
 
         if '*' in Option and Option['*'] is True:
             self.policyString += '"*"'
@@ -0,0 +1,191 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from typing import Any, Literal, Optional, TypedDict
+from ..datastructures import MutableHeaders
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..CacheControl.CacheControlMiddleware import CacheControlOptions
+from ..compiler import compile_header, intern_headers
+from ..dedupe import already_applied, unapplied_headers
+from ..policy import Policy
+
+ClientHintLiteral = Literal['Save-Data', 'ECT', 'Downlink', 'RTT', 'DPR', 'Viewport-Width', 'Sec-CH-DPR', 'Sec-CH-Viewport-Width']
+
+ClientHintsOptions = TypedDict(
+    'ClientHintsOptions',
+    {
+        'hints': list[ClientHintLiteral],
+        'critical': list[ClientHintLiteral],
+        'delegate': list[str],
+        'vary': bool,
+        'saveDataCacheControl': CacheControlOptions
+    },
+    total=False
+)
+
+CLIENT_HINTS = frozenset(['Save-Data', 'ECT', 'Downlink', 'RTT', 'DPR', 'Viewport-Width', 'Sec-CH-DPR', 'Sec-CH-Viewport-Width'])
+
+
+def __number__(value: bytes) -> Optional[float]:
+    """
+    Parse a numeric client hint.
+
+    Args:
+        value (bytes): The value of the request header.
+
+    Returns:
+        Optional[float]: The number or None if the value is not a non-negative number.
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return number if 0 <= number < 1e6 else None
+
+
+def parse_client_hints(headers: list[tuple[bytes, bytes]]) -> dict[str, Any]:
+    """
+    Parse the Save-Data, ECT, Downlink, RTT, DPR and Viewport-Width hints from the raw request headers.
+
+    Args:
+        headers (list[tuple[bytes, bytes]]): The raw request headers.
+
+    Returns:
+        dict[str, Any]: 'save_data' (bool), 'ect' (str or None), 'downlink' (float or None), 'rtt' (float or None), 'dpr' (float or None) and 'viewport_width' (int or None).
+    """
+    hints: dict[str, Any] = {'save_data': False, 'ect': None, 'downlink': None, 'rtt': None, 'dpr': None, 'viewport_width': None}
+    for name, value in headers:
+        if name == b'save-data':
+            hints['save_data'] = value.strip().lower() == b'on'
+        elif name == b'ect':
+            if value in (b'slow-2g', b'2g', b'3g', b'4g'):
+                hints['ect'] = value.decode('latin-1')
+        elif name == b'downlink':
+            hints['downlink'] = __number__(value)
+        elif name == b'rtt':
+            hints['rtt'] = __number__(value)
+        elif name == b'dpr' or name == b'sec-ch-dpr':
+            hints['dpr'] = __number__(value)
+        elif name == b'viewport-width' or name == b'sec-ch-viewport-width':
+            width = __number__(value)
+            hints['viewport_width'] = int(width) if width is not None else None
+    return hints
+
+
+class ClientHints:
+    ''' ClientHints class sets the Accept-CH, Critical-CH and Permissions-Policy headers and parses the client hints of the request.
+
+    The hints are parsed once per request from the raw headers into `request.state.secweb_client_hints` so the handlers can serve lighter
+    payloads, the requested hints are added to the Vary header of the response and Save-Data clients can get their own Cache-Control. The
+    Save-Data Cache-Control replaces the Cache-Control of the application and of the inner layers, a layer outside this middleware that sets
+    Cache-Control adds its header after it, so add it after the Cache-Control middleware, SecWeb does.
+
+    Example:
+        app.add_middleware(ClientHints, Option={'hints': ['Save-Data', 'ECT', 'Downlink'], 'critical': ['Save-Data'], 'delegate': ['https://cdn.example.com'], 'vary': True, 'saveDataCacheControl': {'max-age': 60, 'private': True}})
+
+    Parameter:
+        Option (ClientHintsOptions, optional):
+            - 'hints': The client hints requested with Accept-CH. (Default: ['Save-Data', 'ECT', 'Downlink', 'DPR', 'Viewport-Width'])
+            - 'critical': The hints sent with Critical-CH, the browser retries the request once when they are missing. (Default: [])
+            - 'delegate': The third-party origins the hints are delegated to with Permissions-Policy. (Default: [])
+            - 'vary': Adds the hints to the Vary header of the response. (Default: True)
+            - 'saveDataCacheControl': The Cache-Control options that replace the Cache-Control of the responses to Save-Data clients. (Default: None)
+
+    '''
+    def __init__(self, app: ASGIApp, Option: ClientHintsOptions = Policy({'hints': ['Save-Data', 'ECT', 'Downlink', 'DPR', 'Viewport-Width']})):
+        """
+        Initializes the class and precompiles the headers.
+
+        Args:
+            app (ASGIApp): The application object.
+            Option (ClientHintsOptions, optional):
+                - 'hints': The client hints requested with Accept-CH. (Default: ['Save-Data', 'ECT', 'Downlink', 'DPR', 'Viewport-Width'])
+                - 'critical': The hints sent with Critical-CH, the browser retries the request once when they are missing. (Default: [])
+                - 'delegate': The third-party origins the hints are delegated to with Permissions-Policy. (Default: [])
+                - 'vary': Adds the hints to the Vary header of the response. (Default: True)
+                - 'saveDataCacheControl': The Cache-Control options that replace the Cache-Control of the responses to Save-Data clients. (Default: None)
+
+        Raises:
+            SyntaxError: If the options are not valid.
+
+        Returns:
+            None
+        """
+        self.app = app
+        if set(Option.keys()) - {'hints', 'critical', 'delegate', 'vary', 'saveDataCacheControl'}:
+            raise SyntaxError('ClientHints has 5 options 1> "hints" 2> "critical" 3> "delegate" 4> "vary" 5> "saveDataCacheControl"')
+
+        hints = list(Option.get('hints', ['Save-Data', 'ECT', 'Downlink', 'DPR', 'Viewport-Width']))
+        critical = list(Option.get('critical', []))
+        if hints.__len__() == 0 or set(hints) - CLIENT_HINTS:
+            raise SyntaxError(f'ClientHints hints needs to be one or more of {sorted(CLIENT_HINTS)}')
+        if set(critical) - set(hints):
+            raise SyntaxError('Every critical hint needs to be in hints')
+
+        headers = [(b'accept-ch', ', '.join(hints).encode('latin-1'))]
+        if critical:
+            headers.append((b'critical-ch', ', '.join(critical).encode('latin-1')))
+
+        delegate = list(Option.get('delegate', []))
+        for origin in delegate:
+            if not origin.startswith('https://') or origin.count('/') != 2:
+                raise SyntaxError(f'Client hints can only be delegated to https origins, {origin} is not valid')
+        if delegate:
+            allowlist = ' '.join(['self', *[f'"{origin}"' for origin in delegate]])
+            features = dict.fromkeys('ch-' + hint.lower().removeprefix('sec-ch-') for hint in hints)
+            headers.append((b'permissions-policy', ', '.join(f'{feature}=({allowlist})' for feature in features).encode('latin-1')))
+
+        self.headers = intern_headers(tuple(headers))
+        self.vary = ', '.join(hints) if Option.get('vary', True) else None
+        SaveData = Option.get('saveDataCacheControl')
+        self.SaveDataCacheControl = compile_header('cacheControl', SaveData)[1].decode('latin-1') if SaveData is not None else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Asynchronously handles HTTP requests by parsing the client hints and setting the client hints headers on the response.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+            receive (Receive): A function that returns a coroutine that reads messages from the server.
+            send (Send): A function that sends messages to the server.
+
+        Returns:
+            None
+        """
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        hints = parse_client_hints(scope["headers"])
+        scope.setdefault("state", {})["secweb_client_hints"] = hints
+        headers = unapplied_headers(scope, self.headers)
+        cache = self.SaveDataCacheControl if hints['save_data'] else None
+        if cache is not None:
+            # The profile replaces the Cache-Control of the application and the inner layers, the marker only keeps the inner layers from adding theirs
+            already_applied(scope, b'cache-control')
+
+        async def set_Client_Hints(message: Message):
+            """
+            Sets the client hints headers, the Vary entries and the Save-Data Cache-Control in the HTTP response.
+
+            Args:
+                message (Message): The message sent by the application.
+
+            Returns:
+                None
+            """
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *headers]
+                if self.vary is not None or cache is not None:
+                    response = MutableHeaders(scope=message)
+                    if self.vary is not None:
+                        response.add_vary_header(self.vary)
+                    if cache is not None:
+                        response['Cache-Control'] = cache
+
+            await send(message)
+
+        await self.app(scope, receive, set_Client_Hints)
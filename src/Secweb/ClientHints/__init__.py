@@ -0,0 +1 @@
+from .ClientHintsMiddleware import ClientHints as ClientHints
\ No newline at end of file
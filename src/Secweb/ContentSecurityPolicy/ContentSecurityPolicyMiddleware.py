@@ -4,15 +4,29 @@
 
   Copyright 2021-2026, Motagamwala Taha Arif Ali '''
 
+from collections import OrderedDict
+from contextvars import ContextVar
 from secrets import token_urlsafe
-from typing import TypedDict
+from threading import Lock
+from typing import Callable, Mapping, Optional, TypedDict, Union
+from zlib import crc32
 from warnings import warn
-from starlette.types import Send, Receive, Scope, Message, ASGIApp
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
 
-from starlette.datastructures import MutableHeaders
+from ..datastructures import MutableHeaders
 
-style_nonce = None
-script_nonce = None
+from ..dedupe import already_applied
+from ..policy import Policy
+from .ContentSecurityPolicyNonce import BucketedNonce
+from .ContentSecurityPolicyOptimizer import CSPOptimizationReport, optimize_policy
+
+NONCE = "secweb.nonce"
+
+CSP_DIRECTIVES = ('child-src', 'connect-src', 'default-src', 'font-src', 'frame-src', 'img-src', 'manifest-src', 'media-src', 'object-src', 'script-src', 'script-src-elem', 'script-src-attr', 'style-src', 'style-src-elem', 'style-src-attr', 'worker-src', 'base-uri', 'plugin-types', 'sandbox', 'form-action', 'frame-ancestors', 'navigate-to', 'report-uri', 'report-to', 'block-all-mixed-content', 'require-trusted-types-for', 'trusted-types', 'upgrade-insecure-requests', 'fenced-frame-src')
+
+CSPDelta = tuple[tuple[str, tuple[str, ...]], ...]
+
+__NONCE__: ContextVar[list[Optional[str]]] = ContextVar('secweb_nonce')
 
 ContentSecurityPolicyOptions = TypedDict(
     'ContentSecurityPolicyOptions',
@@ -53,6 +67,9 @@ def Nonce_Processor(DEFAULT_ENTROPY: int = 90) -> str:
     """
     Generate a nonce using the `token_urlsafe` function.
 
+    The nonce is stored in the holder the ContentSecurityPolicy middleware puts in the context of the request, the context is copied into
+    threadpool workers and child tasks with the same holder so the nonce of every request stays with that request.
+
     Args:
         DEFAULT_ENTROPY (int, optional): The entropy value for generating the nonce. (default: 90).
 
@@ -60,26 +77,73 @@ def Nonce_Processor(DEFAULT_ENTROPY: int = 90) -> str:
         str: The generated nonce.
 
     """
-    global style_nonce
-    global script_nonce
-    style_nonce = token_urlsafe(DEFAULT_ENTROPY)
-    script_nonce = style_nonce
-    return style_nonce
+    nonce = token_urlsafe(DEFAULT_ENTROPY)
+    holder = __NONCE__.get(None)
+    if holder is not None:
+        holder[0] = nonce
+    return nonce
+
+def csp_delta(delta: Union[Mapping[str, Union[str, list[str]]], CSPDelta]) -> CSPDelta:
+    """
+    Validate a per-response policy delta and convert it to the hashable form the middleware caches its variants by.
+
+    The middleware validates `request.state.secweb_csp` when the response starts, after the route has run, so a route can set
+    `request.state.secweb_csp = csp_delta({...})` to get the error inside the route instead.
+
+    Args:
+        delta (Union[Mapping[str, Union[str, list[str]]], CSPDelta]): The sources to add keyed by directive, a single source can be a string, eg. {'img-src': 'https://img.example.com'}.
+
+    Raises:
+        SyntaxError: If the delta is not a mapping, a directive does not exist or a source is not a string or contains whitespace, ';' or ','.
+
+    Returns:
+        CSPDelta: The directives with their sources as tuples, eg. (('img-src', ('https://img.example.com',)),).
+    """
+    if isinstance(delta, tuple):
+        delta = dict(delta)
+    if not isinstance(delta, Mapping):
+        raise SyntaxError(f'The Content-Security-Policy delta needs to be a dictionary of directives, not {type(delta).__name__}')
+
+    normalized = []
+    for directive, sources in delta.items():
+        if directive not in CSP_DIRECTIVES:
+            raise SyntaxError(f'The Content-Security-Policy delta uses the directive {directive!r} that does not exist')
+        sources = (sources,) if isinstance(sources, str) else tuple(sources) if isinstance(sources, (list, tuple)) else None
+        if sources is None or not all(isinstance(source, str) and source and not any(char.isspace() or char in ';,' for char in source) for source in sources):
+            raise SyntaxError(f'The sources of {directive} in the Content-Security-Policy delta need to be a string or a list of strings without whitespace, ";" or ","')
+        normalized.append((directive, sources))
+    return tuple(normalized)
+
 
 class ContentSecurityPolicy:
     ''' ContentSecurityPolicy class sets Content-Security-Policy/Content-Security-Policy-Report-Only header.
 
+    A handler can add sources to the policy of its own response by setting `request.state.secweb_csp = {'connect-src': ['https://api.example.com']}`,
+    the compiled variant of every delta is kept in a bounded LRU cache.
+
+    A Candidate policy can be sent as Content-Security-Policy-Report-Only next to the enforced policy to a deterministic share of the clients.
+
+    With a BucketedNonce the nonce is derived by the middleware for every request and kept in `request.state.secweb_nonce` for the templates,
+    so cached copies of a page within the bucket carry a CSP header that matches the nonces of their body.
+
     Example :
-        app.add_middleware(ContentSecurityPolicy, Option={}, script_nonce=False, report_only=False, style_nonce=True)
+        app.add_middleware(ContentSecurityPolicy, Option={}, script_nonce=False, report_only=False, style_nonce=True, MaxVariants=128, optimize=False, drop_deprecated=False, Candidate=None, CandidateSampleRate=1.0, SampleKey=None, Nonce=None)
 
     Parameters :
         script_nonce (bool, optional): The script_nonce parameter. Defaults to False.
         style_nonce (bool, optional): The style_nonce parameter. Defaults to False.
         report_only (bool, optional): The report_only parameter. Defaults to False.
         Option (ContentSecurityPolicyOptions, optional): The Option parameter. Defaults to {'default-src': ["'self'"], 'base-uri': ["'self'"], 'block-all-mixed-content': [], 'font-src': ["'self'", 'https:', 'data:'], 'frame-ancestors': ["'self'"], 'img-src': ["'self'", 'data:'], "object-src": ["'none'"], "script-src": ["'self'"], "script-src-attr": ["'none'"], "style-src": ["'self'", "https:", "'unsafe-inline'"], "upgrade-insecure-requests": [], "require-trusted-types-for": ["'script'"]}.
+        MaxVariants (int, optional): The number of compiled per-response policy variants that are cached. Defaults to 128.
+        optimize (bool, optional): Shrinks the policy at startup without changing what it allows, the result is kept in `OptimizationReport`. Defaults to False.
+        drop_deprecated (bool, optional): Removes 'plugin-types', 'navigate-to' and 'block-all-mixed-content' next to 'upgrade-insecure-requests' when optimizing. Defaults to False.
+        Candidate (ContentSecurityPolicyOptions, optional): The policy sent as Content-Security-Policy-Report-Only next to the enforced policy, it needs 'report-to' and/or 'report-uri'. Defaults to None.
+        CandidateSampleRate (float, optional): The fraction between 0 and 1 of the requests that get the Candidate policy. Defaults to 1.0.
+        SampleKey (Callable[[Scope], bytes], optional): Returns the key hashed for sampling the Candidate policy, the client address is used when it is None. Defaults to None.
+        Nonce (BucketedNonce, optional): Derives the nonce from an HMAC of a secret, a time bucket and the cache key instead of Nonce_Processor. Defaults to None.
     
     '''
-    def __init__(self, app: ASGIApp, script_nonce: bool = False, report_only: bool = False, style_nonce: bool = False, Option: ContentSecurityPolicyOptions = {'default-src': ["'self'"], 'base-uri': ["'self'"], 'block-all-mixed-content': [], 'font-src': ["'self'", 'https:', 'data:'], 'frame-ancestors': ["'self'"], 'img-src': ["'self'", 'data:'], "object-src": ["'none'"], "script-src": ["'self'"], "script-src-attr": ["'none'"], "style-src": ["'self'", "https:", "'unsafe-inline'"], "upgrade-insecure-requests": [], "require-trusted-types-for": ["'script'"]}):
+    def __init__(self, app: ASGIApp, script_nonce: bool = False, report_only: bool = False, style_nonce: bool = False, Option: ContentSecurityPolicyOptions = Policy({'default-src': ["'self'"], 'base-uri': ["'self'"], 'block-all-mixed-content': [], 'font-src': ["'self'", 'https:', 'data:'], 'frame-ancestors': ["'self'"], 'img-src': ["'self'", 'data:'], "object-src": ["'none'"], "script-src": ["'self'"], "script-src-attr": ["'none'"], "style-src": ["'self'", "https:", "'unsafe-inline'"], "upgrade-insecure-requests": [], "require-trusted-types-for": ["'script'"]}), MaxVariants: int = 128, optimize: bool = False, drop_deprecated: bool = False, Candidate: Optional[ContentSecurityPolicyOptions] = None, CandidateSampleRate: float = 1.0, SampleKey: Optional[Callable[[Scope], bytes]] = None, Nonce: Optional[BucketedNonce] = None):
         """
         Initialize the class with the given parameters.
 
@@ -88,6 +152,16 @@ class ContentSecurityPolicy:
             script_nonce (bool, optional): The script_nonce parameter. Defaults to False.
             style_nonce (bool, optional): The style_nonce parameter. Defaults to False.
             Option (ContentSecurityPolicyOptions, optional): The Option parameter. Defaults to {'default-src': ["'self'"], 'base-uri': ["'self'"], 'block-all-mixed-content': [], 'font-src': ["'self'", 'https:', 'data:'], 'frame-ancestors': ["'self'"], 'img-src': ["'self'", 'data:'], "object-src": ["'none'"], "script-src": ["'self'"], "script-src-attr": ["'none'"], "style-src": ["'self'", "https:", "'unsafe-inline'"], "upgrade-insecure-requests": [], "require-trusted-types-for": ["'script'"]}.
+            MaxVariants (int, optional): The number of compiled per-response policy variants that are cached. Defaults to 128.
+            optimize (bool, optional): Shrinks the policy at startup without changing what it allows, the result is kept in `OptimizationReport`. Defaults to False.
+            drop_deprecated (bool, optional): Removes 'plugin-types', 'navigate-to' and 'block-all-mixed-content' next to 'upgrade-insecure-requests' when optimizing. Defaults to False.
+            Candidate (ContentSecurityPolicyOptions, optional): The policy sent as Content-Security-Policy-Report-Only next to the enforced policy, it needs 'report-to' and/or 'report-uri'. Defaults to None.
+            CandidateSampleRate (float, optional): The fraction between 0 and 1 of the requests that get the Candidate policy. Defaults to 1.0.
+            SampleKey (Callable[[Scope], bytes], optional): Returns the key hashed for sampling the Candidate policy, the client address is used when it is None. Defaults to None.
+            Nonce (BucketedNonce, optional): Derives the nonce from an HMAC of a secret, a time bucket and the cache key instead of Nonce_Processor. Defaults to None.
+
+        Raises:
+            SyntaxError: If the Candidate policy is set together with report_only, the CandidateSampleRate is not between 0 and 1 or the Nonce is set without script_nonce or style_nonce.
 
         Returns:
             None
@@ -96,10 +170,79 @@ class ContentSecurityPolicy:
         self.PolicyString = ''
         self.ReportOnly = report_only
         self.HeaderName = 'Content-Security-Policy' if not report_only else 'Content-Security-Policy-Report-Only'
+        self.HeaderKey = self.HeaderName.lower().encode('latin-1')
         self.script_nonce = script_nonce
         self.style_nonce = style_nonce
-        Policy: list[str] = ['child-src', 'connect-src', 'default-src', 'font-src', 'frame-src', 'img-src', 'manifest-src', 'media-src', 'object-src', 'script-src', 'script-src-elem', 'script-src-attr', 'style-src', 'style-src-elem', 'style-src-attr', 'worker-src', 'base-uri', 'plugin-types', 'sandbox', 'form-action', 'frame-ancestors', 'navigate-to', 'report-uri', 'report-to', 'block-all-mixed-content', 'require-trusted-types-for', 'trusted-types', 'upgrade-insecure-requests', 'fenced-frame-src']
+        Policy: list[str] = list(CSP_DIRECTIVES)
+        self.optimize = optimize
+        self.drop_deprecated = drop_deprecated
+        self.OptimizationReport: Optional[CSPOptimizationReport] = None
+        self.Option = {key: list(values) for key, values in Option.items()}
+        if optimize:
+            Option, self.OptimizationReport = optimize_policy(Option, drop_deprecated, script_nonce, style_nonce)
         self.__PolicyCheck__(Option, Policy)
+        self.MaxVariants = MaxVariants
+        self.variants: OrderedDict[CSPDelta, str] = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.Candidate: Optional[ContentSecurityPolicy] = None
+        self.SampleKey = SampleKey
+        if Candidate is not None:
+            if report_only:
+                raise SyntaxError('Candidate policy cannot be used with report_only as both use the Content-Security-Policy-Report-Only header')
+            if not 0 <= CandidateSampleRate <= 1:
+                raise SyntaxError('CandidateSampleRate needs to be between 0 and 1')
+            self.Candidate = ContentSecurityPolicy(None, script_nonce=script_nonce, report_only=True, style_nonce=style_nonce, Option=Candidate, optimize=optimize, drop_deprecated=drop_deprecated)
+        self.CandidateThreshold = round(CandidateSampleRate * 10000)
+        if Nonce is not None and not script_nonce and not style_nonce:
+            raise SyntaxError('Nonce needs script_nonce and/or style_nonce')
+        self.Nonce = Nonce
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of per-response policy variants that were served from the cache.
+
+        Returns:
+            float: The hit rate between 0 and 1, 0 when no variant was requested yet.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __variant__(self, delta: Union[Mapping[str, Union[str, list[str]]], CSPDelta]) -> str:
+        """
+        Returns the compiled policy string of the base policy with the sources of the delta added to its directives.
+
+        Parameters:
+            delta (Union[Mapping[str, Union[str, list[str]]], CSPDelta]): The sources to add keyed by directive eg. {'connect-src': ['https://api.example.com']}.
+
+        Raises:
+            SyntaxError: If the delta is not valid, it is checked before anything is compiled or cached.
+
+        Returns:
+            str: The compiled policy string of the variant.
+        """
+        key = csp_delta(delta)
+        with self.lock:
+            variant = self.variants.get(key)
+            if variant is not None:
+                self.hits += 1
+                self.variants.move_to_end(key)
+                return variant
+            self.misses += 1
+
+        Option = {directive: list(sources) for directive, sources in self.Option.items()}
+        for directive, sources in key:
+            values = Option.setdefault(directive, [])
+            values.extend(source for source in sources if source not in values)
+
+        variant = ContentSecurityPolicy(None, script_nonce=self.script_nonce, report_only=self.ReportOnly, style_nonce=self.style_nonce, Option=Option, optimize=self.optimize, drop_deprecated=self.drop_deprecated).PolicyString
+        with self.lock:
+            self.variants[key] = variant
+            if len(self.variants) > self.MaxVariants:
+                self.variants.popitem(last=False)
+        return variant
     
     def __PolicyCheck__(self, Option: ContentSecurityPolicyOptions, Policy: list[str]) -> None:
         """
@@ -160,6 +303,46 @@ class ContentSecurityPolicy:
                 else:
                     self.PolicyString += ' '
 
+    def __sampled__(self, scope: Scope) -> bool:
+        """
+        Decide if the request gets the Candidate policy from a CRC32 hash of the sample key.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+
+        Returns:
+            bool: True if the Candidate policy is sent.
+        """
+        if self.CandidateThreshold >= 10000:
+            return True
+        if self.CandidateThreshold <= 0:
+            return False
+        if self.SampleKey is not None:
+            key = self.SampleKey(scope)
+        else:
+            client = scope.get("client")
+            key = client[0].encode('latin-1') if client else b''
+        return crc32(key) % 10000 < self.CandidateThreshold
+
+    def __nonced__(self, PS: str, nonce: Optional[str] = None) -> str:
+        """
+        Insert the nonce of the request into a compiled policy string.
+
+        Parameters:
+            PS (str): The compiled policy string.
+            nonce (str, optional): The nonce of the request from the BucketedNonce or Nonce_Processor. Defaults to None.
+
+        Returns:
+            str: The header value.
+        """
+        if self.script_nonce is True and self.style_nonce is True:
+            return PS.format(script_nonce_value=nonce, style_nonce_value=nonce)
+        elif self.style_nonce is True:
+            return PS.format(style_nonce_value=nonce)
+        elif self.script_nonce is True:
+            return PS.format(script_nonce_value=nonce)
+        return PS
+
     async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """
         Asynchronously handles HTTP requests by routing them to the appropriate handler based on the request path.
@@ -175,7 +358,16 @@ class ContentSecurityPolicy:
         if scope["type"] != "http":
             return await self.app(scope, receive, send)
 
-        PS = self.PolicyString
+        enforce = not already_applied(scope, self.HeaderKey)
+        candidate = self.Candidate if self.Candidate is not None and self.__sampled__(scope) and not already_applied(scope, self.Candidate.HeaderKey) else None
+        if not enforce and candidate is None:
+            return await self.app(scope, receive, send)
+
+        holder: list[Optional[str]] = [None]
+        if self.Nonce is not None:
+            holder[0] = scope.setdefault("state", {})["secweb_nonce"] = self.Nonce(scope)
+        elif self.script_nonce or self.style_nonce:
+            holder = scope.setdefault(NONCE, holder)
 
         async def set_Content_Security_Policy(message: Message):
             """
@@ -190,15 +382,23 @@ class ContentSecurityPolicy:
             """
             if message["type"] == "http.response.start":
                 headers = MutableHeaders(scope=message)
-                if self.script_nonce is True and self.style_nonce is True:
-                    headers.append(self.HeaderName, PS.format(script_nonce_value=script_nonce, style_nonce_value=style_nonce))
-                elif self.style_nonce is True:
-                    headers.append(self.HeaderName, PS.format(style_nonce_value=style_nonce))
-                elif self.script_nonce is True:
-                    headers.append(self.HeaderName, PS.format(script_nonce_value=script_nonce))
-                else:
-                    headers.append(self.HeaderName, PS)
+                nonce = holder[0]
+                if nonce is None and (self.script_nonce or self.style_nonce):
+                    nonce = holder[0] = token_urlsafe(90)
+                if enforce:
+                    delta = scope["state"].get("secweb_csp") if "state" in scope else None
+                    PS = self.PolicyString if delta is None else self.__variant__(delta)
+                    headers.append(self.HeaderName, self.__nonced__(PS, nonce))
+                if candidate is not None:
+                    headers.append(candidate.HeaderName, self.__nonced__(candidate.PolicyString, nonce))
 
             await send(message)
 
-        await self.app(scope, receive, set_Content_Security_Policy)
\ No newline at end of file
+        if not self.script_nonce and not self.style_nonce:
+            return await self.app(scope, receive, set_Content_Security_Policy)
+
+        token = __NONCE__.set(holder)
+        try:
+            await self.app(scope, receive, set_Content_Security_Policy)
+        finally:
+            __NONCE__.reset(token)
\ No newline at end of file
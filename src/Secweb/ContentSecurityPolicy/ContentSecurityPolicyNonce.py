@@ -0,0 +1,114 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from base64 import urlsafe_b64encode
+from hashlib import sha256
+from hmac import digest
+from threading import Lock
+from time import time
+from typing import Callable, Optional
+from ..asgi import Scope
+
+
+def __cache_key__(scope: Scope) -> bytes:
+    """
+    The default cache key, the path and the query string of the request.
+
+    Args:
+        scope (Scope): The scope of the request.
+
+    Returns:
+        bytes: The cache key.
+    """
+    return scope["path"].encode('utf-8') + b'?' + scope.get("query_string", b'')
+
+
+class BucketedNonce:
+    ''' BucketedNonce class derives the CSP nonce from an HMAC of a server secret, a time bucket and the cache key of the request.
+
+    Every response of the same cache key within a bucket gets the same nonce, so micro-cached or CDN cached pages keep a CSP header that
+    matches the nonces in their body. The nonce of a key is computed once per bucket and changing the secret with `rotate` changes every nonce. The key cache is replaced
+    under a lock so threads never clear it while another one inserts.
+
+    Example :
+        ContentSecurityPolicy(app, script_nonce=True, Nonce=BucketedNonce(Secret=b'...', Bucket=60, CacheKey=None))
+
+    Parameters :
+        Secret (bytes): The server secret, at least 32 bytes, shared by all the servers behind the cache.
+        Bucket (int, optional): The length of a time bucket in seconds, it should not be longer than the cache lifetime of the pages. Defaults to 60.
+        CacheKey (Callable[[Scope], bytes], optional): Returns the cache key of the request, the path and the query string are used when it is None. Defaults to None.
+        MaxKeys (int, optional): The number of cache keys whose nonce is kept for the current bucket. Defaults to 4096.
+
+    '''
+    __slots__ = ('Secret', 'Bucket', 'CacheKey', 'MaxKeys', 'bucket', 'nonces', 'lock')
+
+    def __init__(self, Secret: bytes, Bucket: int = 60, CacheKey: Optional[Callable[[Scope], bytes]] = None, MaxKeys: int = 4096):
+        """
+        Initializes the class.
+
+        Args:
+            Secret (bytes): The server secret, at least 32 bytes, shared by all the servers behind the cache.
+            Bucket (int, optional): The length of a time bucket in seconds, it should not be longer than the cache lifetime of the pages. Defaults to 60.
+            CacheKey (Callable[[Scope], bytes], optional): Returns the cache key of the request, the path and the query string are used when it is None. Defaults to None.
+            MaxKeys (int, optional): The number of cache keys whose nonce is kept for the current bucket. Defaults to 4096.
+
+        Raises:
+            SyntaxError: If the secret is shorter than 32 bytes or the bucket is not a positive number of seconds.
+
+        Returns:
+            None
+        """
+        if not isinstance(Bucket, int) or Bucket <= 0:
+            raise SyntaxError('Bucket needs to be a positive number of seconds')
+        self.Bucket = Bucket
+        self.CacheKey = CacheKey if CacheKey is not None else __cache_key__
+        self.MaxKeys = MaxKeys
+        self.bucket = -1
+        self.nonces: dict[bytes, str] = {}
+        self.lock = Lock()
+        self.rotate(Secret)
+
+    def rotate(self, Secret: bytes) -> None:
+        """
+        Replaces the server secret, the nonces of the current bucket are derived again.
+
+        Args:
+            Secret (bytes): The new server secret, at least 32 bytes.
+
+        Raises:
+            SyntaxError: If the secret is shorter than 32 bytes.
+
+        Returns:
+            None
+        """
+        if not isinstance(Secret, bytes) or len(Secret) < 32:
+            raise SyntaxError('The nonce Secret needs to be at least 32 bytes')
+        with self.lock:
+            self.Secret = Secret
+            self.nonces = {}
+
+    def __call__(self, scope: Scope) -> str:
+        """
+        Returns the nonce of the request.
+
+        Args:
+            scope (Scope): The scope of the request.
+
+        Returns:
+            str: The nonce.
+        """
+        bucket = int(time()) // self.Bucket
+        key = self.CacheKey(scope)
+        with self.lock:
+            if bucket != self.bucket:
+                self.bucket = bucket
+                self.nonces = {}
+            nonce = self.nonces.get(key)
+            if nonce is None:
+                if len(self.nonces) >= self.MaxKeys:
+                    self.nonces = {}
+                nonce = self.nonces[key] = urlsafe_b64encode(digest(self.Secret, b'%d\x00%s' % (bucket, key), sha256)).rstrip(b'=').decode('latin-1')
+        return nonce
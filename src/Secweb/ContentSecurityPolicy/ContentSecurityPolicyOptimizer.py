@@ -0,0 +1,245 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from re import compile
+from typing import Mapping, Optional, TypedDict
+
+CSPOptimizationReport = TypedDict(
+    'CSPOptimizationReport',
+    {
+        'original_bytes': int,
+        'optimized_bytes': int,
+        'bytes_saved': int,
+        'removed': list[str]
+    }
+)
+
+FALLBACK_CHAINS: dict[str, list[str]] = {
+    'default-src': [],
+    'child-src': ['default-src'],
+    'connect-src': ['default-src'],
+    'font-src': ['default-src'],
+    'frame-src': ['child-src', 'default-src'],
+    'fenced-frame-src': ['frame-src', 'child-src', 'default-src'],
+    'img-src': ['default-src'],
+    'manifest-src': ['default-src'],
+    'media-src': ['default-src'],
+    'object-src': ['default-src'],
+    'script-src': ['default-src'],
+    'script-src-elem': ['script-src', 'default-src'],
+    'script-src-attr': ['script-src', 'default-src'],
+    'style-src': ['default-src'],
+    'style-src-elem': ['style-src', 'default-src'],
+    'style-src-attr': ['style-src', 'default-src'],
+    'worker-src': ['child-src', 'script-src', 'default-src'],
+}
+
+SOURCE_LIST_DIRECTIVES = frozenset([*FALLBACK_CHAINS, 'base-uri', 'form-action', 'frame-ancestors', 'navigate-to'])
+
+NONCE_PLACEHOLDER = "'nonce-*'"
+
+__SCHEME_SOURCE__ = compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*:$')
+__HOST_SOURCE__ = compile(r'^(?:(?P<scheme>[a-zA-Z][a-zA-Z0-9+.-]*)://)?(?P<host>\*|(?:\*\.)?[^/:]+)(?P<port>:(?:\d+|\*))?(?P<path>/.*)?$')
+
+
+def __covers__(broad: str, narrow: str) -> bool:
+    """
+    Check if every URL matched by the narrow source expression is also matched by the broad one.
+
+    Only the cases that can be decided without knowing the protected resource are handled, anything else is reported as not covered.
+
+    Args:
+        broad (str): The broader source expression eg. 'https:'.
+        narrow (str): The narrower source expression eg. 'https://cdn.example.com'.
+
+    Returns:
+        bool: True if the narrow source is redundant next to the broad source.
+    """
+    if broad == narrow or narrow.startswith("'") or __SCHEME_SOURCE__.match(narrow):
+        return False
+
+    target = __HOST_SOURCE__.match(narrow)
+    if target is None:
+        return False
+
+    if __SCHEME_SOURCE__.match(broad):
+        return target.group('scheme') is not None and target.group('scheme').lower() == broad[:-1].lower()
+
+    if broad == '*':
+        return target.group('scheme') is None or target.group('scheme').lower() in ('http', 'https', 'ws', 'wss')
+
+    source = __HOST_SOURCE__.match(broad)
+    if source is None or not source.group('host').startswith('*.') or source.group('port') or source.group('path'):
+        return False
+
+    if (source.group('scheme') or '').lower() != (target.group('scheme') or '').lower() or target.group('port'):
+        return False
+
+    host = target.group('host').lower()
+    return not host.startswith('*') and host.endswith(source.group('host')[1:].lower())
+
+
+def __normalize__(sources: list[str]) -> list[str]:
+    """
+    Remove the duplicate sources and the sources covered by a broader source of the same list.
+
+    Args:
+        sources (list[str]): The source list of a directive.
+
+    Returns:
+        list[str]: The normalized source list in the original order.
+    """
+    unique = list(dict.fromkeys(sources))
+    return [source for source in unique if not any(__covers__(broad, source) for broad in unique)]
+
+
+def __resolve__(Option: Mapping[str, list[str]], directive: str) -> Optional[frozenset[str]]:
+    """
+    Resolve the effective source list of a fetch directive following the CSP fallback rules.
+
+    Args:
+        Option (Mapping[str, list[str]]): The policy.
+        directive (str): The fetch directive to resolve.
+
+    Returns:
+        Optional[frozenset[str]]: The normalized effective sources, None if the directive is unrestricted.
+    """
+    for name in [directive, *FALLBACK_CHAINS[directive]]:
+        if name in Option:
+            return frozenset(__normalize__(Option[name]))
+    return None
+
+
+def __with_nonces__(Option: Mapping[str, list[str]], script_nonce: bool, style_nonce: bool) -> dict[str, list[str]]:
+    """
+    Add a nonce placeholder to the directives that get a nonce from the middleware so resolution sees them.
+
+    Args:
+        Option (Mapping[str, list[str]]): The policy.
+        script_nonce (bool): Whether script-src gets a nonce.
+        style_nonce (bool): Whether style-src gets a nonce.
+
+    Returns:
+        dict[str, list[str]]: A copy of the policy with the placeholders added.
+    """
+    policy = {key: list(values) for key, values in Option.items()}
+    if script_nonce and 'script-src' in policy:
+        policy['script-src'].append(NONCE_PLACEHOLDER)
+    if style_nonce and 'style-src' in policy:
+        policy['style-src'].append(NONCE_PLACEHOLDER)
+    return policy
+
+
+def __serialized_length__(Option: Mapping[str, list[str]]) -> int:
+    """
+    Compute the length in bytes of the policy as the middleware serializes it, without the nonces.
+
+    Args:
+        Option (Mapping[str, list[str]]): The policy.
+
+    Returns:
+        int: The length of the header value.
+    """
+    return len('; '.join(' '.join([key, *values]) for key, values in Option.items()).encode('latin-1'))
+
+
+def is_equivalent(original: Mapping[str, list[str]], optimized: Mapping[str, list[str]], script_nonce: bool = False, style_nonce: bool = False, ignore: frozenset[str] = frozenset()) -> bool:
+    """
+    Check that two policies resolve to the same effective sources for every directive.
+
+    Args:
+        original (Mapping[str, list[str]]): The original policy.
+        optimized (Mapping[str, list[str]]): The optimized policy.
+        script_nonce (bool, optional): Whether script-src gets a nonce. Defaults to False.
+        style_nonce (bool, optional): Whether style-src gets a nonce. Defaults to False.
+        ignore (frozenset[str], optional): The directives removed on purpose that are not compared. Defaults to frozenset().
+
+    Returns:
+        bool: True if both policies enforce the same restrictions.
+    """
+    original = __with_nonces__(original, script_nonce, style_nonce)
+    optimized = __with_nonces__(optimized, script_nonce, style_nonce)
+
+    for directive in FALLBACK_CHAINS:
+        if __resolve__(original, directive) != __resolve__(optimized, directive):
+            return False
+
+    for directive in set(original) | set(optimized):
+        if directive in FALLBACK_CHAINS or directive in ignore:
+            continue
+        if directive not in original or directive not in optimized:
+            return False
+        if directive in SOURCE_LIST_DIRECTIVES:
+            if frozenset(__normalize__(original[directive])) != frozenset(__normalize__(optimized[directive])):
+                return False
+        elif list(dict.fromkeys(original[directive])) != list(dict.fromkeys(optimized[directive])):
+            return False
+
+    return True
+
+
+def optimize_policy(Option: Mapping[str, list[str]], drop_deprecated: bool = False, script_nonce: bool = False, style_nonce: bool = False) -> tuple[dict[str, list[str]], CSPOptimizationReport]:
+    """
+    Shrink a Content-Security-Policy without changing what it allows.
+
+    Duplicate sources and sources covered by a broader source of the same directive are removed, fetch directives that resolve to
+    the same sources as their fallback directive are dropped and with `drop_deprecated` the 'plugin-types' and 'navigate-to'
+    directives and 'block-all-mixed-content' next to 'upgrade-insecure-requests' are removed.
+
+    Args:
+        Option (Mapping[str, list[str]]): The policy in the ContentSecurityPolicyOptions format.
+        drop_deprecated (bool, optional): Whether to remove the deprecated directives. Defaults to False.
+        script_nonce (bool, optional): Whether script-src gets a nonce from the middleware. Defaults to False.
+        style_nonce (bool, optional): Whether style-src gets a nonce from the middleware. Defaults to False.
+
+    Raises:
+        AssertionError: If the optimized policy does not resolve to the same sources as the original policy.
+
+    Returns:
+        tuple[dict[str, list[str]], CSPOptimizationReport]: The optimized policy and the report of the removed bytes and items.
+    """
+    removed: list[str] = []
+    policy: dict[str, list[str]] = {}
+    for key, values in Option.items():
+        sources = __normalize__(list(values)) if key in SOURCE_LIST_DIRECTIVES else list(dict.fromkeys(values))
+        for value in dict.fromkeys(values):
+            if value not in sources:
+                removed.append(f'{key} {value}')
+        policy[key] = sources
+
+    deprecated: set[str] = set()
+    if drop_deprecated:
+        for key in ('plugin-types', 'navigate-to'):
+            if key in policy:
+                deprecated.add(key)
+        if 'block-all-mixed-content' in policy and 'upgrade-insecure-requests' in policy:
+            deprecated.add('block-all-mixed-content')
+        for key in deprecated:
+            policy.pop(key)
+            removed.append(key)
+
+    nonced = {'script-src'} if script_nonce else set()
+    if style_nonce:
+        nonced.add('style-src')
+
+    changed = True
+    while changed:
+        changed = False
+        for directive in reversed(list(FALLBACK_CHAINS)):
+            if directive not in policy or directive in nonced or directive == 'default-src':
+                continue
+            candidate = {key: values for key, values in policy.items() if key != directive}
+            if is_equivalent(policy, candidate, script_nonce, style_nonce):
+                policy = candidate
+                removed.append(directive)
+                changed = True
+
+    if not is_equivalent(Option, policy, script_nonce, style_nonce, frozenset(deprecated)):
+        raise AssertionError('The optimized Content-Security-Policy is not equivalent to the original policy')
+
+    original_bytes = __serialized_length__(Option)
+    optimized_bytes = __serialized_length__(policy)
+    return policy, {'original_bytes': original_bytes, 'optimized_bytes': optimized_bytes, 'bytes_saved': original_bytes - optimized_bytes, 'removed': removed}
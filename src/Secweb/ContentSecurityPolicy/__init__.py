@@ -1,2 +1,5 @@
 from .ContentSecurityPolicyMiddleware import ContentSecurityPolicy as ContentSecurityPolicy
 from .ContentSecurityPolicyMiddleware import Nonce_Processor as Nonce_Processor
+from .ContentSecurityPolicyMiddleware import csp_delta as csp_delta
+from .ContentSecurityPolicyNonce import BucketedNonce as BucketedNonce
+from .ContentSecurityPolicyOptimizer import optimize_policy as optimize_policy
@@ -6,9 +6,11 @@
 
 from typing import Literal, Union
 from warnings import warn
-from starlette.types import Send, Receive, Scope, Message, ASGIApp
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
 
-from starlette.datastructures import MutableHeaders
+from ..datastructures import MutableHeaders
+
+from ..dedupe import already_applied
 
 CrossOriginEmbedderPolicyLiteral = Literal['require-corp', 'unsafe-none', 'credentialless']
 
@@ -64,7 +66,7 @@ class CrossOriginEmbedderPolicy:
         Returns:
             None
         """
-        if scope["type"] != "http":
+        if scope["type"] != "http" or already_applied(scope, b'cross-origin-embedder-policy'):
             return await self.app(scope, receive, send)
 
         async def set_Cross_Origin_Embedder_Policy(message: Message):
@@ -0,0 +1,160 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from typing import Literal, Mapping, Optional, TypedDict
+from warnings import warn
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..ContentSecurityPolicy.ContentSecurityPolicyOptimizer import FALLBACK_CHAINS
+from ..CrossOriginResourcePolicy.CrossOriginResourcePolicyMiddleware import CrossOriginResourcePolicyLiteral
+from ..dedupe import unapplied_headers
+from ..policy import Policy
+from ..routes import RouteMatcher
+
+CrossOriginIsolationOptions = TypedDict(
+    'CrossOriginIsolationOptions',
+    {
+        'coep': Literal['require-corp', 'credentialless'],
+        'corp': CrossOriginResourcePolicyLiteral
+    },
+    total=False
+)
+
+
+class CrossOriginIsolation:
+    ''' CrossOriginIsolation class makes the configured document routes cross-origin isolated.
+
+    The document routes get Cross-Origin-Opener-Policy: same-origin with Cross-Origin-Embedder-Policy and the subresource routes get
+    Cross-Origin-Resource-Policy. Add it after SecWeb so it is the outermost layer and takes precedence over the app-wide headers.
+
+    Example:
+        app.add_middleware(CrossOriginIsolation, Option={'coep': 'require-corp', 'corp': 'same-origin'}, Routes=['/analytics'], Subresources=['/static/wasm/{file:path}'], CSP=None)
+
+    Parameters:
+        Option (CrossOriginIsolationOptions, optional):
+            - 'coep': 'require-corp' or 'credentialless' for the Cross-Origin-Embedder-Policy of the documents. (Default: 'require-corp')
+            - 'corp': 'same-origin', 'same-site' or 'cross-origin' for the Cross-Origin-Resource-Policy of the subresources. (Default: 'same-origin')
+        Routes (list): The list of document routes that are cross-origin isolated.
+        Subresources (list): The list of subresource routes loaded by the isolated documents. Defaults to [].
+        CSP (ContentSecurityPolicyOptions, optional): The Content-Security-Policy of the documents, checked against the isolation at startup. Defaults to None.
+
+    '''
+    def __init__(self, app: ASGIApp, Option: CrossOriginIsolationOptions = Policy({'coep': 'require-corp', 'corp': 'same-origin'}), Routes: list[str] = [], Subresources: list[str] = [], CSP: Optional[Mapping[str, list[str]]] = None):
+        """
+        Initializes the class, precompiles the headers and validates the isolation.
+
+        Args:
+            app (ASGIApp): The application object.
+            Option (CrossOriginIsolationOptions, optional):
+                - 'coep': 'require-corp' or 'credentialless' for the Cross-Origin-Embedder-Policy of the documents. (Default: 'require-corp')
+                - 'corp': 'same-origin', 'same-site' or 'cross-origin' for the Cross-Origin-Resource-Policy of the subresources. (Default: 'same-origin')
+            Routes (list): The list of document routes that are cross-origin isolated.
+            Subresources (list): The list of subresource routes loaded by the isolated documents. Defaults to [].
+            CSP (ContentSecurityPolicyOptions, optional): The Content-Security-Policy of the documents, checked against the isolation at startup. Defaults to None.
+
+        Raises:
+            SyntaxError: If the routes are empty, a route is both a document and a subresource, the options are not valid or the CSP sandboxes the documents.
+
+        Returns:
+            None
+        """
+        self.app = app
+        coep = Option.get('coep', 'require-corp')
+        corp = Option.get('corp', 'same-origin')
+
+        if Routes.__len__() == 0:
+            raise SyntaxError('Cannot set cross-origin isolation if the routes are empty')
+
+        if coep not in ('require-corp', 'credentialless'):
+            raise SyntaxError('Cross-origin isolation needs Cross-Origin-Embedder-Policy 1> "require-corp" or 2> "credentialless"')
+
+        if corp not in ('same-site', 'same-origin', 'cross-origin'):
+            raise SyntaxError('Cross-Origin-Resource-Policy has 3 options 1> "same-site" 2> "same-origin" 3> "cross-origin"')
+
+        if set(Option.keys()) - {'coep', 'corp'}:
+            raise SyntaxError('CrossOriginIsolation has 2 options 1> "coep" 2> "corp"')
+
+        overlap = set(Routes) & set(Subresources)
+        if overlap:
+            raise SyntaxError(f'The routes {sorted(overlap)} cannot be both documents and subresources')
+
+        if CSP is not None:
+            self.__CSPCheck__(CSP, coep)
+
+        self.documents = RouteMatcher(Routes)
+        self.subresources = RouteMatcher(Subresources)
+        self.DocumentHeaders = ((b'cross-origin-opener-policy', b'same-origin'), (b'cross-origin-embedder-policy', coep.encode('latin-1')))
+        self.SubresourceHeaders = ((b'cross-origin-resource-policy', corp.encode('latin-1')),)
+
+    def __CSPCheck__(self, CSP: Mapping[str, list[str]], coep: str) -> None:
+        """
+        Checks that the Content-Security-Policy of the documents does not contradict the isolation.
+
+        Parameters:
+            CSP (Mapping[str, list[str]]): The Content-Security-Policy of the documents.
+            coep (str): The Cross-Origin-Embedder-Policy of the documents.
+
+        Raises:
+            SyntaxError: If the sandbox directive gives the documents an opaque origin.
+
+        Returns:
+            None
+        """
+        if 'sandbox' in CSP and 'allow-same-origin' not in CSP['sandbox']:
+            raise SyntaxError('sandbox without allow-same-origin gives the documents an opaque origin and they cannot be cross-origin isolated')
+
+        if coep != 'require-corp':
+            return
+
+        for directive in FALLBACK_CHAINS:
+            if directive not in CSP:
+                continue
+            for source in CSP[directive]:
+                if not source.startswith("'") and source not in ('data:', 'blob:'):
+                    warn(f'{directive} allows {source}, with "require-corp" every cross-origin subresource needs Cross-Origin-Resource-Policy or CORS, "credentialless" loads them without credentials', SyntaxWarning, 3)
+                    return
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Asynchronously handles HTTP requests by setting the isolation headers on the document and subresource routes.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+            receive (Receive): A function that returns a coroutine that reads messages from the server.
+            send (Send): A function that sends messages to the server.
+
+        Returns:
+            None
+        """
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        if self.documents.match(scope["path"]):
+            headers = unapplied_headers(scope, self.DocumentHeaders)
+        elif self.subresources.match(scope["path"]):
+            headers = unapplied_headers(scope, self.SubresourceHeaders)
+        else:
+            return await self.app(scope, receive, send)
+
+        if not headers:
+            return await self.app(scope, receive, send)
+
+        async def set_Cross_Origin_Isolation(message: Message):
+            """
+            Appends the isolation headers to the HTTP response.
+
+            Args:
+                message (Message): The message sent by the application.
+
+            Returns:
+                None
+            """
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *headers]
+
+            await send(message)
+
+        await self.app(scope, receive, set_Cross_Origin_Isolation)
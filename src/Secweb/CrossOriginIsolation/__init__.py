@@ -0,0 +1 @@
+from .CrossOriginIsolationMiddleware import CrossOriginIsolation as CrossOriginIsolation
\ No newline at end of file
@@ -6,9 +6,11 @@
 
 from typing import Literal, Union
 from warnings import warn
-from starlette.types import Send, Receive, Scope, Message, ASGIApp
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
 
-from starlette.datastructures import MutableHeaders
+from ..datastructures import MutableHeaders
+
+from ..dedupe import already_applied
 
 CrossOriginOpenerPolicyLiteral = Literal['unsafe-none', 'same-origin-allow-popups', 'same-origin', 'noopener-allow-popups']
 
@@ -69,7 +71,7 @@ class CrossOriginOpenerPolicy:
         Returns:
             None
         """
-        if scope["type"] != "http":
+        if scope["type"] != "http" or already_applied(scope, b'cross-origin-opener-policy'):
             return await self.app(scope, receive, send)
 
         async def set_Cross_Origin_Opener_Policy(message: Message):
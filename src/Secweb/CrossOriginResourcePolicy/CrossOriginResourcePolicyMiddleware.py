@@ -6,9 +6,11 @@
 
 from typing import Literal, Union
 from warnings import warn
-from starlette.types import Send, Receive, Scope, Message, ASGIApp
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
 
-from starlette.datastructures import MutableHeaders
+from ..datastructures import MutableHeaders
+
+from ..dedupe import already_applied
 
 CrossOriginResourcePolicyLiteral = Literal['same-site', 'same-origin', 'cross-origin']
 
@@ -67,7 +69,7 @@ class CrossOriginResourcePolicy:
         Returns:
             None
         """
-        if scope["type"] != "http":
+        if scope["type"] != "http" or already_applied(scope, b'cross-origin-resource-policy'):
             return await self.app(scope, receive, send)
 
         async def set_Cross_Origin_Resource_Policy(message: Message):
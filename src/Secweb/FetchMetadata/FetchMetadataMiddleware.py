@@ -0,0 +1,185 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from threading import Lock
+from typing import Literal, Mapping, Optional, Pattern, TypedDict
+from ..asgi import Send, Receive, Scope, ASGIApp
+
+from ..ClearSiteData.ClearSiteDataMiddleware import __path_regex_builder__
+from ..policy import Policy
+
+FetchSiteLiteral = Literal['cross-site', 'same-site', 'same-origin', 'none']
+
+FetchMetadataOptions = TypedDict(
+    'FetchMetadataOptions',
+    {
+        'sameSite': bool,
+        'navigation': bool,
+        'legacy': bool
+    },
+    total=False
+)
+
+Allowlist = tuple[str, frozenset[bytes]]
+
+FORBIDDEN_BODY = b'Forbidden'
+FORBIDDEN_HEADERS = (
+    (b'content-type', b'text/plain; charset=utf-8'),
+    (b'content-length', str(len(FORBIDDEN_BODY)).encode('latin-1')),
+    (b'vary', b'Sec-Fetch-Site, Sec-Fetch-Mode, Sec-Fetch-Dest'),
+)
+
+
+class FetchMetadata:
+    ''' FetchMetadata class rejects cross-site requests with a 403 using the Sec-Fetch-Site, Sec-Fetch-Mode and Sec-Fetch-Dest request headers before they reach the application.
+
+    Same-origin, same-site and user initiated requests are allowed, cross-site requests are only allowed for top level GET navigations and for
+    the allowlisted routes. Cross-site websocket handshakes are closed before they are accepted.
+
+    Example:
+        app.add_middleware(FetchMetadata, Option={'sameSite': True, 'navigation': True, 'legacy': True}, Allow={'/api/public/{path:path}': ['cross-site']})
+
+    Parameters:
+        Option (FetchMetadataOptions, optional):
+            - 'sameSite': bool, # Allows same-site requests. (Default: True)
+            - 'navigation': bool, # Allows cross-site top level GET navigations. (Default: True)
+            - 'legacy': bool, # Allows requests from browsers that do not send the Fetch Metadata headers. (Default: True)
+        Allow (dict[str, list[FetchSiteLiteral]], optional): The routes that also allow the listed Sec-Fetch-Site values. Defaults to {}.
+
+    '''
+    def __init__(self, app: ASGIApp, Option: FetchMetadataOptions = Policy({'sameSite': True, 'navigation': True, 'legacy': True}), Allow: Mapping[str, list[FetchSiteLiteral]] = {}):
+        """
+        Initializes the class and precompiles the allowlists.
+
+        Args:
+            app (ASGIApp): The application object.
+            Option (FetchMetadataOptions, optional):
+                - 'sameSite': bool, # Allows same-site requests. (Default: True)
+                - 'navigation': bool, # Allows cross-site top level GET navigations. (Default: True)
+                - 'legacy': bool, # Allows requests from browsers that do not send the Fetch Metadata headers. (Default: True)
+            Allow (dict[str, list[FetchSiteLiteral]], optional): The routes that also allow the listed Sec-Fetch-Site values. Defaults to {}.
+
+        Raises:
+            SyntaxError: If the options or the allowlists are not valid.
+
+        Returns:
+            None
+        """
+        self.app = app
+        if set(Option.keys()) - {'sameSite', 'navigation', 'legacy'}:
+            raise SyntaxError('FetchMetadata has 3 options 1> "sameSite" 2> "navigation" 3> "legacy"')
+
+        self.navigation = Option.get('navigation', True)
+        self.legacy = Option.get('legacy', True)
+        self.allowed = frozenset([b'same-origin', b'none', b'same-site'] if Option.get('sameSite', True) else [b'same-origin', b'none'])
+
+        self.static: dict[str, Allowlist] = {}
+        self.pathregex: list[tuple[Pattern[str], Allowlist]] = []
+        for route, sites in Allow.items():
+            if set(sites) - {'cross-site', 'same-site', 'same-origin', 'none'}:
+                raise SyntaxError('Sec-Fetch-Site has 4 values 1> "cross-site" 2> "same-site" 3> "same-origin" 4> "none"')
+            allowlist = (route, frozenset(site.encode('latin-1') for site in sites))
+            if '{' in route:
+                self.pathregex.append((__path_regex_builder__(route), allowlist))
+            else:
+                self.static[route] = allowlist
+
+        self.counters: dict[str, int] = {'allowed': 0, 'rejected': 0, **{route: 0 for route in Allow}}
+        self.lock = Lock()
+
+    def __count__(self, *keys: str) -> None:
+        """
+        Increments the counters under the lock.
+
+        Parameters:
+            keys (str): The counters to increment.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            for key in keys:
+                self.counters[key] += 1
+
+    def __allowlist__(self, path: str) -> Optional[Allowlist]:
+        """
+        Finds the allowlist of the route.
+
+        Parameters:
+            path (str): The request path.
+
+        Returns:
+            Optional[Allowlist]: The route and its allowed Sec-Fetch-Site values or None.
+        """
+        allowlist = self.static.get(path)
+        if allowlist is not None:
+            return allowlist
+        for regex, allowlist in self.pathregex:
+            if regex.match(path):
+                return allowlist
+        return None
+
+    def __allowed__(self, scope: Scope) -> Optional[str]:
+        """
+        Checks the Fetch Metadata request headers against the policy.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+
+        Returns:
+            Optional[str]: 'allowed', the allowlisted route that allowed the request or None if the request is rejected.
+        """
+        site = mode = dest = None
+        for name, value in scope["headers"]:
+            if name == b'sec-fetch-site':
+                site = value
+            elif name == b'sec-fetch-mode':
+                mode = value
+            elif name == b'sec-fetch-dest':
+                dest = value
+
+        if site is None:
+            return 'allowed' if self.legacy else None
+        if site in self.allowed:
+            return 'allowed'
+        if self.navigation and mode == b'navigate' and scope.get("method") == "GET" and dest not in (b'object', b'embed'):
+            return 'allowed'
+
+        allowlist = self.__allowlist__(scope["path"])
+        if allowlist is not None and site in allowlist[1]:
+            return allowlist[0]
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Asynchronously handles HTTP and Websocket requests by rejecting the requests the policy does not allow without calling the application.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+            receive (Receive): A function that returns a coroutine that reads messages from the server.
+            send (Send): A function that sends messages to the server.
+
+        Returns:
+            None
+        """
+        if scope["type"] != "http" and scope["type"] != "websocket":
+            return await self.app(scope, receive, send)
+
+        allowed = self.__allowed__(scope)
+        if allowed is not None:
+            if allowed == 'allowed':
+                self.__count__('allowed')
+            else:
+                self.__count__('allowed', allowed)
+            return await self.app(scope, receive, send)
+
+        self.__count__('rejected')
+        if scope["type"] == "websocket":
+            return await send({"type": "websocket.close", "code": 1008})
+
+        # Outer layers edit the messages in place, every rejection gets its own dict and headers list
+        await send({"type": "http.response.start", "status": 403, "headers": list(FORBIDDEN_HEADERS)})
+        await send({"type": "http.response.body", "body": FORBIDDEN_BODY})
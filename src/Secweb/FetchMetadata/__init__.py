@@ -0,0 +1 @@
+from .FetchMetadataMiddleware import FetchMetadata as FetchMetadata
\ No newline at end of file
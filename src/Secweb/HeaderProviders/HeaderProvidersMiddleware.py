@@ -0,0 +1,104 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from typing import Iterable, Optional
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..compiler import HeaderTuple, compile_providers
+from ..dedupe import already_applied, unapplied_headers
+from ..providers import HeaderProvider, apply_providers
+
+Emitter = tuple[HeaderTuple, tuple[HeaderProvider, ...]]
+
+
+class HeaderProviders:
+    ''' HeaderProviders class sets the headers of the header providers in a single pass.
+
+    The static headers that are appended whatever the application sets are compiled into one tuple, the other providers are applied with their
+    conflict policy when the response starts. SecWeb does not use this middleware, it compiles the providers into the same pass as the
+    built-in headers, it is meant for apps that only need the providers.
+
+    Example:
+        app.add_middleware(HeaderProviders, Providers=None)
+
+    Parameter:
+        Providers (Iterable[HeaderProvider], optional): The header providers, the providers registered with `register_header` are used when it is None. Defaults to None.
+
+    '''
+    def __init__(self, app: ASGIApp, Providers: Optional[Iterable[HeaderProvider]] = None):
+        """
+        Initializes the class and compiles the static headers of every scope type.
+
+        Args:
+            app (ASGIApp): The application object.
+            Providers (Iterable[HeaderProvider], optional): The header providers, the providers registered with `register_header` are used when it is None. Defaults to None.
+
+        Returns:
+            None
+        """
+        self.app = app
+        providers = tuple(Providers) if Providers is not None else None
+        self.emitters: dict[str, Emitter] = {}
+        for kind in ('http', 'websocket'):
+            static, others = compile_providers(kind, providers)
+            if static or others:
+                self.emitters[kind] = (static, others)
+
+    def __headers__(self, raw: list[tuple[bytes, bytes]], scope: Scope, static: HeaderTuple, others: tuple[HeaderProvider, ...]) -> list[tuple[bytes, bytes]]:
+        """
+        Applies the providers to the headers of the response.
+
+        Parameters:
+            raw (list[tuple[bytes, bytes]]): The headers set by the application.
+            scope (Scope): The scope of the request.
+            static (HeaderTuple): The static headers that are appended.
+            others (tuple[HeaderProvider, ...]): The providers with a value function or a 'keep' or 'replace' conflict policy.
+
+        Returns:
+            list[tuple[bytes, bytes]]: The headers of the response.
+        """
+        raw = [*raw, *static]
+        return apply_providers(raw, scope, others) if others else raw
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Asynchronously handles HTTP and Websocket requests by setting the headers of the providers in a single pass.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+            receive (Receive): A function that returns a coroutine that reads messages from the server.
+            send (Send): A function that sends messages to the server.
+
+        Returns:
+            None
+        """
+        emitter = self.emitters.get(scope["type"])
+        if emitter is None:
+            return await self.app(scope, receive, send)
+
+        static = unapplied_headers(scope, emitter[0])
+        others = tuple(provider for provider in emitter[1] if not already_applied(scope, provider.name))
+        if not static and not others:
+            return await self.app(scope, receive, send)
+
+        start = "http.response.start" if scope["type"] == "http" else "websocket.accept"
+
+        async def set_Provided_Headers(message: Message):
+            """
+            Sets the headers of the providers on the HTTP response or the websocket accept message.
+
+            Args:
+                message (Message): The message sent by the application.
+
+            Returns:
+                None
+            """
+            if message["type"] == start:
+                message["headers"] = self.__headers__(list(message.get("headers", ())), scope, static, others)
+
+            await send(message)
+
+        await self.app(scope, receive, set_Provided_Headers)
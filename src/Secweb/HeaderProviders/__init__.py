@@ -0,0 +1 @@
+from .HeaderProvidersMiddleware import HeaderProviders as HeaderProviders
\ No newline at end of file
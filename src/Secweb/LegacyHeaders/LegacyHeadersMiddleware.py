@@ -0,0 +1,187 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from threading import Lock
+from typing import Literal, TypedDict, Union
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..compiler import HeaderTuple, compile_header, intern_headers
+from ..dedupe import claimed_headers
+from ..policy import Policy
+from ..XFrameOptions.XFrameOptionsMiddleware import XFrameOptions
+
+BrowserFamily = Literal['ie', 'edge-legacy', 'modern', 'unknown']
+
+VARY_USER_AGENT = (b'vary', b'User-Agent')
+
+LegacyHeadersOptions = TypedDict(
+    'LegacyHeadersOptions',
+    {
+        'xss': Literal[False],
+        'xdo': Literal[False],
+        'xframe': Union[Literal[False], XFrameOptions]
+    },
+    total=False
+)
+
+FAMILY_HEADERS: dict[BrowserFamily, frozenset[str]] = {
+    'ie': frozenset(['xss', 'xdo', 'xframe']),
+    'edge-legacy': frozenset(['xss', 'xframe']),
+    'modern': frozenset(),
+    'unknown': frozenset(['xss', 'xdo', 'xframe']),
+}
+
+
+def classify(agent: bytes) -> BrowserFamily:
+    """
+    Classify the User-Agent bytes into a browser family.
+
+    Args:
+        agent (bytes): The User-Agent request header.
+
+    Returns:
+        BrowserFamily: 'ie' for Internet Explorer, 'edge-legacy' for EdgeHTML, 'modern' for Chromium, Firefox and Safari and 'unknown' otherwise.
+    """
+    if b'Trident/' in agent or b'MSIE ' in agent:
+        return 'ie'
+    if b' Edge/' in agent:
+        return 'edge-legacy'
+    if agent.startswith(b'Mozilla/5.0') and (b'Chrome/' in agent or b'Firefox/' in agent or b'Safari/' in agent):
+        return 'modern'
+    return 'unknown'
+
+
+class LegacyHeaders:
+    ''' LegacyHeaders class sends X-XSS-Protection, X-Download-Options and X-Frame-Options only to the browsers that still use them.
+
+    The User-Agent is classified into a browser family and every family gets one of a few precompiled header sets, the family of every
+    User-Agent is kept in a bounded cache so a repeated User-Agent costs one dictionary lookup. When the families get different headers the
+    response also gets `Vary: User-Agent` so shared caches do not serve one family's headers to another. Add it after SecWeb so it is the outermost
+    layer, the inner SecWeb layers then skip the headers it owns.
+
+    Example:
+        app.add_middleware(LegacyHeaders, Option={'xframe': 'SAMEORIGIN'}, FrameAncestors=True, MaxEntries=1024)
+
+    Parameters:
+        Option (LegacyHeadersOptions, optional): The 'xss', 'xdo' and 'xframe' options of SecWeb, False leaves the header to the other middlewares. Defaults to {}.
+        FrameAncestors (bool, optional): The Content-Security-Policy of every response sets 'frame-ancestors', so modern browsers do not need X-Frame-Options. Only set it when that is true, the CSP is not checked. Defaults to False.
+        MaxEntries (int, optional): The number of User-Agents whose family is cached. Defaults to 1024.
+
+    '''
+    def __init__(self, app: ASGIApp, Option: LegacyHeadersOptions = Policy({}), FrameAncestors: bool = False, MaxEntries: int = 1024):
+        """
+        Initializes the class and precompiles the header set of every browser family.
+
+        Args:
+            app (ASGIApp): The application object.
+            Option (LegacyHeadersOptions, optional): The 'xss', 'xdo' and 'xframe' options of SecWeb, False leaves the header to the other middlewares. Defaults to {}.
+            FrameAncestors (bool, optional): The Content-Security-Policy of every response sets 'frame-ancestors', so modern browsers do not need X-Frame-Options. Only set it when that is true, the CSP is not checked. Defaults to False.
+            MaxEntries (int, optional): The number of User-Agents whose family is cached. Defaults to 1024.
+
+        Raises:
+            SyntaxError: If the options are not valid.
+
+        Returns:
+            None
+        """
+        self.app = app
+        if set(Option.keys()) - {'xss', 'xdo', 'xframe'}:
+            raise SyntaxError('LegacyHeaders has 3 options 1> "xss" 2> "xdo" 3> "xframe"')
+
+        headers = {key: compile_header(key, Option.get(key)) for key in ('xss', 'xdo', 'xframe') if Option.get(key) is not False}
+        self.names = frozenset(name for name, _ in headers.values())
+        self.families: dict[BrowserFamily, HeaderTuple] = {}
+        for family, keys in FAMILY_HEADERS.items():
+            if family == 'modern' and not FrameAncestors:
+                keys = keys | {'xframe'}
+            self.families[family] = tuple(header for key, header in headers.items() if key in keys)
+        # The header set depends on the User-Agent, shared caches have to key the response on it
+        if len(set(self.families.values())) > 1:
+            self.families = {family: (*family_headers, VARY_USER_AGENT) for family, family_headers in self.families.items()}
+        self.families = {family: intern_headers(family_headers) for family, family_headers in self.families.items()}
+
+        self.MaxEntries = MaxEntries
+        self.agents: dict[bytes, HeaderTuple] = {}
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The approximate fraction of requests whose User-Agent was found in the cache, the hits are counted without a lock.
+
+        Returns:
+            float: The hit rate between 0 and 1, 0 when no request was seen yet.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __headers__(self, scope: Scope) -> HeaderTuple:
+        """
+        Find the header set of the browser family of the request.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+
+        Returns:
+            HeaderTuple: The precompiled headers of the browser family.
+        """
+        agent = b''
+        for name, value in scope["headers"]:
+            if name == b'user-agent':
+                agent = value
+                break
+
+        headers = self.agents.get(agent)
+        if headers is not None:
+            # Approximate without the lock, concurrent hits on the free-threaded build may lose an increment
+            self.hits += 1
+            return headers
+
+        headers = self.families[classify(agent)]
+        with self.lock:
+            self.misses += 1
+            if len(self.agents) >= self.MaxEntries:
+                del self.agents[next(iter(self.agents))]
+            self.agents[agent] = headers
+        return headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Asynchronously handles HTTP requests by setting the header set of the browser family on the response.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+            receive (Receive): A function that returns a coroutine that reads messages from the server.
+            send (Send): A function that sends messages to the server.
+
+        Returns:
+            None
+        """
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = claimed_headers(scope, self.__headers__(scope), self.names)
+        if not headers:
+            return await self.app(scope, receive, send)
+
+        async def set_Legacy_Headers(message: Message):
+            """
+            Appends the header set of the browser family to the HTTP response.
+
+            Args:
+                message (Message): The message sent by the application.
+
+            Returns:
+                None
+            """
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *headers]
+
+            await send(message)
+
+        await self.app(scope, receive, set_Legacy_Headers)
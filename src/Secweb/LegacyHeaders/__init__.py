@@ -0,0 +1 @@
+from .LegacyHeadersMiddleware import LegacyHeaders as LegacyHeaders
\ No newline at end of file
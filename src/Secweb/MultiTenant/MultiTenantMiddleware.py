@@ -0,0 +1,210 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Callable, Optional
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..compiler import CompiledHeaders, HeaderTuple, compile_many, intern_headers
+from ..dedupe import unapplied_headers
+
+if TYPE_CHECKING:
+    from ..index import SecWebOptions
+
+Tenant = tuple[HeaderTuple, HeaderTuple, HeaderTuple]
+
+
+def __host__(scope: Scope) -> bytes:
+    """
+    Read the host name from the raw request headers without the port.
+
+    Args:
+        scope (Scope): The scope of the request.
+
+    Returns:
+        bytes: The lower-cased host name or b'' if the request has no Host header.
+    """
+    for name, value in scope["headers"]:
+        if name == b"host":
+            if value.startswith(b"["):
+                return value[:value.find(b"]") + 1].lower()
+            return value.split(b":", 1)[0].lower()
+    return b""
+
+
+class MultiTenant:
+    ''' MultiTenant class sets the security headers of the tenant selected by the Host header.
+
+    Example:
+        app.add_middleware(MultiTenant, Tenants={'a.example.com': {'hsts': {'max-age': 63072000, 'preload': True}}}, Default={}, Loader=None, Workers=0, MissTTL=60.0, MaxMisses=10000)
+
+    Parameters:
+        Tenants (dict[str, SecWebOptions], optional): The SecWeb options of every tenant keyed by host name. Defaults to {}.
+        Default (SecWebOptions, optional): The SecWeb options used for unknown hosts. Defaults to {}.
+        Loader (Callable[[str], Optional[SecWebOptions]], optional): Called with the host name the first time an unknown host is seen, returning None uses the Default options and is remembered for MissTTL seconds. Defaults to None.
+        Workers (int, optional): The number of processes used to compile the tenants at startup, 0 compiles them in this process. Defaults to 0.
+        MissTTL (float, optional): The seconds a host the Loader returned None for uses the Default options without calling the Loader again. Defaults to 60.0.
+        MaxMisses (int, optional): The number of such hosts remembered, the least recently seen are dropped first, 0 remembers none. Defaults to 10000.
+
+    '''
+    def __init__(self, app: ASGIApp, Tenants: dict[str, 'SecWebOptions'] = {}, Default: 'SecWebOptions' = {}, Loader: Optional[Callable[[str], Optional['SecWebOptions']]] = None, Workers: int = 0, MissTTL: float = 60.0, MaxMisses: int = 10000):
+        """
+        Initializes the class and compiles the headers of every tenant.
+
+        Headers common to the default and all the tenants are stored once in a shared tuple and every tenant only keeps its own
+        headers, with equal header pairs and tuples interned so they are shared between tenants.
+
+        Parameters:
+            app (ASGIApp): The application object.
+            Tenants (dict[str, SecWebOptions], optional): The SecWeb options of every tenant keyed by host name. Defaults to {}.
+            Default (SecWebOptions, optional): The SecWeb options used for unknown hosts. Defaults to {}.
+            Loader (Callable[[str], Optional[SecWebOptions]], optional): Called with the host name the first time an unknown host is seen, returning None uses the Default options and is remembered for MissTTL seconds. Defaults to None.
+            Workers (int, optional): The number of processes used to compile the tenants at startup, 0 compiles them in this process. Defaults to 0.
+            MissTTL (float, optional): The seconds a host the Loader returned None for uses the Default options without calling the Loader again. Defaults to 60.0.
+            MaxMisses (int, optional): The number of such hosts remembered, the least recently seen are dropped first, 0 remembers none. Defaults to 10000.
+
+        Raises:
+            SyntaxError: If the options of a tenant are not valid or use the route based 'clearSiteData' option, or MissTTL or MaxMisses is negative.
+
+        Returns:
+            None
+        """
+        self.app = app
+        self.Loader = Loader
+        if MissTTL < 0 or MaxMisses < 0:
+            raise SyntaxError('MissTTL and MaxMisses cannot be negative')
+        self.MissTTL = MissTTL
+        self.MaxMisses = MaxMisses
+        self.misses: OrderedDict[bytes, float] = OrderedDict()
+        self.lock = Lock()
+        compiled = compile_many({'': Default, **{host.lower(): Option for host, Option in Tenants.items()}}, Workers)
+        default = compiled.pop('')
+
+        common = set(default[0])
+        for http, _ in compiled.values():
+            common.intersection_update(http)
+        self.common: HeaderTuple = intern_headers(tuple(header for header in default[0] if header in common))
+        self.commonset = frozenset(self.common)
+
+        self.default = self.__compact__(default)
+        self.tenants: dict[bytes, Tenant] = {host.encode('latin-1'): self.__compact__(headers) for host, headers in compiled.items()}
+
+    def __compact__(self, headers: CompiledHeaders) -> Tenant:
+        """
+        Split the compiled headers of a tenant into the shared common headers and its own headers.
+
+        Parameters:
+            headers (CompiledHeaders): The compiled HTTP and websocket headers of the tenant.
+
+        Returns:
+            Tenant: The shared prefix, the tenant headers and the websocket headers.
+        """
+        http, websocket = headers
+        if self.commonset.issubset(http):
+            return (self.common, intern_headers(tuple(header for header in http if header not in self.commonset)), websocket)
+        return ((), http, websocket)
+
+    def __tenant__(self, scope: Scope) -> Tenant:
+        """
+        Find the tenant of the request, loading and compiling it on the first hit when a Loader is set.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+
+        Returns:
+            Tenant: The compiled headers of the tenant or of the default.
+        """
+        host = __host__(scope)
+        tenant = self.tenants.get(host)
+        if tenant is not None:
+            return tenant
+
+        if self.Loader is None or not host:
+            return self.default
+
+        # The Host header is chosen by the client, remember the hosts the Loader does not know so they do not reach it on every request
+        with self.lock:
+            expiry = self.misses.get(host)
+            if expiry is not None:
+                if expiry > monotonic():
+                    self.misses.move_to_end(host)
+                    return self.default
+                del self.misses[host]
+
+        Option = self.Loader(host.decode('latin-1'))
+        if Option is None:
+            with self.lock:
+                if self.MaxMisses:
+                    self.misses[host] = monotonic() + self.MissTTL
+                    while len(self.misses) > self.MaxMisses:
+                        self.misses.popitem(last=False)
+            return self.default
+
+        tenant = self.__compact__(compile_many({'': Option})[''])
+        with self.lock:
+            return self.tenants.setdefault(host, tenant)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Asynchronously handles HTTP and Websocket requests by setting the headers of the tenant on the response.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+            receive (Receive): A function that returns a coroutine that reads messages from the server.
+            send (Send): A function that sends messages to the server.
+
+        Returns:
+            None
+        """
+        if scope["type"] == "http":
+            prefix, own, _ = self.__tenant__(scope)
+            prefix = unapplied_headers(scope, prefix)
+            own = unapplied_headers(scope, own)
+            if not prefix and not own:
+                return await self.app(scope, receive, send)
+
+            async def set_Tenant_Headers(message: Message):
+                """
+                Appends the headers of the tenant to the HTTP response.
+
+                Args:
+                    message (Message): The message sent by the application.
+
+                Returns:
+                    None
+                """
+                if message["type"] == "http.response.start":
+                    message["headers"] = [*message.get("headers", ()), *prefix, *own]
+
+                await send(message)
+
+            return await self.app(scope, receive, set_Tenant_Headers)
+
+        if scope["type"] == "websocket":
+            websocket = unapplied_headers(scope, self.__tenant__(scope)[2])
+            if not websocket:
+                return await self.app(scope, receive, send)
+
+            async def set_Tenant_Websocket_Headers(message: Message):
+                """
+                Appends the websocket headers of the tenant to the websocket accept message.
+
+                Args:
+                    message (Message): The message sent by the application.
+
+                Returns:
+                    None
+                """
+                if message["type"] == "websocket.accept":
+                    message["headers"] = [*message.get("headers", ()), *websocket]
+
+                await send(message)
+
+            return await self.app(scope, receive, set_Tenant_Websocket_Headers)
+
+        await self.app(scope, receive, send)
@@ -0,0 +1 @@
+from .MultiTenantMiddleware import MultiTenant as MultiTenant
\ No newline at end of file
@@ -0,0 +1,190 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from json import dumps
+from typing import Mapping, Optional, TypedDict
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..compiler import intern_headers
+from ..dedupe import unapplied_headers
+from ..policy import Policy
+from .ReportCollector import ReportCollector
+
+NetworkErrorLoggingOptions = TypedDict(
+    'NetworkErrorLoggingOptions',
+    {
+        'report_to': str,
+        'max_age': int,
+        'include_subdomains': bool,
+        'success_fraction': float,
+        'failure_fraction': float
+    },
+    total=False
+)
+
+NETWORK_TYPES = frozenset([b'slow-2g', b'2g', b'3g', b'4g'])
+MAX_REPORT_BODY = 65536
+
+
+class NetworkErrorLogging:
+    ''' NetworkErrorLogging class sets the Reporting-Endpoints and NEL headers and can ingest the reports into a ReportCollector.
+
+    The headers are compiled once at startup. With a ReportPath the middleware answers the report uploads on that path itself and feeds them
+    to the Collector, the network type of the client is read from the ECT client hint of the upload.
+
+    Example:
+        app.add_middleware(NetworkErrorLogging, Endpoints={'default': 'https://example.com/reports'}, Option={'report_to': 'default', 'max_age': 86400, 'success_fraction': 0.01, 'failure_fraction': 1.0}, ReportTo=True, ReportPath='/reports', Collector=ReportCollector(Routes=['/']))
+
+    Parameters:
+        Endpoints (dict[str, str]): The reporting endpoints keyed by name, they can also be used by the 'report-to' directive of CSP.
+        Option (NetworkErrorLoggingOptions, optional):
+            - 'report_to': The endpoint name of the network error reports. (Default: the first endpoint)
+            - 'max_age': The lifetime of the policy in seconds. (Default: 86400)
+            - 'include_subdomains': Applies the policy to the subdomains. (Default: False)
+            - 'success_fraction': The fraction between 0 and 1 of the successful requests that are reported. (Default: 0.0)
+            - 'failure_fraction': The fraction between 0 and 1 of the failed requests that are reported. (Default: 1.0)
+        ReportTo (bool, optional): Also sets the legacy Report-To header the Chromium NEL implementation reads the endpoint from. Defaults to True.
+        ReportPath (str, optional): The path whose POST requests are ingested into the Collector. Defaults to None.
+        Collector (ReportCollector, optional): The collector of the reports, a new one is created when ReportPath is set. Defaults to None.
+
+    '''
+    def __init__(self, app: ASGIApp, Endpoints: Mapping[str, str] = Policy({}), Option: NetworkErrorLoggingOptions = Policy({}), ReportTo: bool = True, ReportPath: Optional[str] = None, Collector: Optional[ReportCollector] = None):
+        """
+        Initializes the class and precompiles the headers.
+
+        Args:
+            app (ASGIApp): The application object.
+            Endpoints (dict[str, str]): The reporting endpoints keyed by name, they can also be used by the 'report-to' directive of CSP.
+            Option (NetworkErrorLoggingOptions, optional):
+                - 'report_to': The endpoint name of the network error reports. (Default: the first endpoint)
+                - 'max_age': The lifetime of the policy in seconds. (Default: 86400)
+                - 'include_subdomains': Applies the policy to the subdomains. (Default: False)
+                - 'success_fraction': The fraction between 0 and 1 of the successful requests that are reported. (Default: 0.0)
+                - 'failure_fraction': The fraction between 0 and 1 of the failed requests that are reported. (Default: 1.0)
+            ReportTo (bool, optional): Also sets the legacy Report-To header the Chromium NEL implementation reads the endpoint from. Defaults to True.
+            ReportPath (str, optional): The path whose POST requests are ingested into the Collector. Defaults to None.
+            Collector (ReportCollector, optional): The collector of the reports, a new one is created when ReportPath is set. Defaults to None.
+
+        Raises:
+            SyntaxError: If the endpoints or the options are not valid.
+
+        Returns:
+            None
+        """
+        self.app = app
+        if Endpoints.__len__() == 0:
+            raise SyntaxError('Cannot set Reporting-Endpoints header if the endpoints are empty')
+
+        if set(Option.keys()) - {'report_to', 'max_age', 'include_subdomains', 'success_fraction', 'failure_fraction'}:
+            raise SyntaxError('NEL has 5 options 1> "report_to" 2> "max_age" 3> "include_subdomains" 4> "success_fraction" 5> "failure_fraction"')
+
+        for name, url in Endpoints.items():
+            if not name.replace('-', '').replace('_', '').isalnum() or not name[0].isalpha() or not name.islower():
+                raise SyntaxError(f'The endpoint name {name} needs to be a lower-case token')
+            if not url.startswith(('https://', '/')) or '"' in url:
+                raise SyntaxError(f'The endpoint {name} needs to be an https URL or a path')
+
+        report_to = Option.get('report_to', next(iter(Endpoints)))
+        if report_to not in Endpoints:
+            raise SyntaxError(f'The endpoint {report_to} is not in Endpoints')
+
+        nel: dict[str, object] = {'report_to': report_to, 'max_age': Option.get('max_age', 86400)}
+        if not isinstance(nel['max_age'], int) or nel['max_age'] < 0:
+            raise SyntaxError('max_age needs to be a positive number of seconds')
+        if Option.get('include_subdomains', False):
+            nel['include_subdomains'] = True
+        for fraction, default in (('success_fraction', 0.0), ('failure_fraction', 1.0)):
+            value = Option.get(fraction, default)
+            if not isinstance(value, (int, float)) or not 0 <= value <= 1:
+                raise SyntaxError(f'{fraction} needs to be between 0 and 1')
+            nel[fraction] = value
+
+        headers = [
+            (b'reporting-endpoints', ', '.join(f'{name}="{url}"' for name, url in Endpoints.items()).encode('latin-1')),
+            (b'nel', dumps(nel, separators=(',', ':')).encode('latin-1')),
+        ]
+        if ReportTo:
+            group = {'group': report_to, 'max_age': nel['max_age'], 'endpoints': [{'url': Endpoints[report_to]}]}
+            headers.append((b'report-to', dumps(group, separators=(',', ':')).encode('latin-1')))
+        self.headers = intern_headers(tuple(headers))
+
+        self.ReportPath = ReportPath
+        self.Collector = Collector if Collector is not None or ReportPath is None else ReportCollector()
+
+    async def __ingest__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Reads a report upload into the Collector and answers it with 204, or 413 when the body is too large.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+            receive (Receive): A function that returns a coroutine that reads messages from the server.
+            send (Send): A function that sends messages to the server.
+
+        Returns:
+            None
+        """
+        network = 'unknown'
+        for name, value in scope["headers"]:
+            if name == b'ect' and value in NETWORK_TYPES:
+                network = value.decode('latin-1')
+                break
+
+        body = b''
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                return
+            body += message.get("body", b'')
+            more_body = message.get("more_body", False)
+            if len(body) > MAX_REPORT_BODY:
+                await send({"type": "http.response.start", "status": 413, "headers": [(b'content-length', b'0')]})
+                await send({"type": "http.response.body", "body": b''})
+                return
+
+        if self.Collector is not None:
+            self.Collector.ingest(body, network)
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b''})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Asynchronously handles HTTP requests by ingesting the report uploads and setting the reporting headers on the other responses.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+            receive (Receive): A function that returns a coroutine that reads messages from the server.
+            send (Send): A function that sends messages to the server.
+
+        Returns:
+            None
+        """
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        if self.ReportPath is not None and scope["path"] == self.ReportPath and scope["method"] == "POST":
+            return await self.__ingest__(scope, receive, send)
+
+        headers = unapplied_headers(scope, self.headers)
+        if not headers:
+            return await self.app(scope, receive, send)
+
+        async def set_Reporting_Headers(message: Message):
+            """
+            Appends the reporting headers to the HTTP response.
+
+            Args:
+                message (Message): The message sent by the application.
+
+            Returns:
+                None
+            """
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *headers]
+
+            await send(message)
+
+        await self.app(scope, receive, set_Reporting_Headers)
@@ -0,0 +1,228 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from bisect import bisect_left
+from collections import Counter
+from json import loads
+from threading import Lock
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from ..routes import RouteMatcher
+
+LATENCY_BOUNDS: tuple[float, ...] = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+ERROR_TYPES = frozenset([
+    'ok', 'abandoned', 'unknown',
+    'dns.unreachable', 'dns.name_not_resolved', 'dns.failed', 'dns.address_changed',
+    'tcp.timed_out', 'tcp.closed', 'tcp.reset', 'tcp.refused', 'tcp.aborted', 'tcp.address_invalid', 'tcp.address_unreachable', 'tcp.failed',
+    'tls.version_or_cipher_mismatch', 'tls.bad_client_auth_cert', 'tls.cert.name_invalid', 'tls.cert.date_invalid', 'tls.cert.authority_invalid',
+    'tls.cert.invalid', 'tls.cert.revoked', 'tls.cert.pinned_key_not_in_cert_chain', 'tls.protocol.error', 'tls.failed',
+    'http.error', 'http.protocol.error', 'http.response.invalid', 'http.response.invalid.empty', 'http.response.invalid.content_length_mismatch',
+    'http.response.invalid.multiple_content_length', 'http.response.invalid.multiple_content_disposition', 'http.response.invalid.multiple_location',
+    'http.response.redirect_loop', 'http.failed',
+    'h2.ping_failed', 'h2.protocol.error', 'h3.protocol.error', 'quic.protocol.error',
+])
+NETWORK_TYPES = frozenset(['slow-2g', '2g', '3g', '4g', 'unknown'])
+MAX_DEPRECATIONS = 256
+
+
+class Histogram:
+    ''' Histogram class is a streaming histogram with fixed bucket bounds in milliseconds.
+
+    Example :
+        Histogram().add(42.0)
+
+    Parameter :
+        Bounds (tuple[float, ...], optional): The upper bounds of the buckets, a last bucket catches larger values. Defaults to LATENCY_BOUNDS.
+
+    '''
+    __slots__ = ('Bounds', 'buckets', 'count', 'total')
+
+    def __init__(self, Bounds: tuple[float, ...] = LATENCY_BOUNDS):
+        self.Bounds = Bounds
+        self.buckets = [0] * (len(Bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float) -> None:
+        """
+        Adds a value to the histogram.
+
+        Args:
+            value (float): The value in milliseconds.
+
+        Returns:
+            None
+        """
+        self.buckets[bisect_left(self.Bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimates a quantile as the upper bound of the bucket holding it.
+
+        Args:
+            q (float): The quantile between 0 and 1.
+
+        Returns:
+            Optional[float]: The upper bound in milliseconds, inf for the last bucket or None when the histogram is empty.
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return self.Bounds[i] if i < len(self.Bounds) else float('inf')
+        return float('inf')
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the histogram as a plain dictionary.
+
+        Returns:
+            dict[str, Any]: The bucket bounds and counts, the count, the mean, the median and the 95th percentile.
+        """
+        return {
+            'bounds': list(self.Bounds),
+            'buckets': list(self.buckets),
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+        }
+
+
+class ReportCollector:
+    ''' ReportCollector class parses Reporting API uploads into streaming latency and error histograms per route and per client network type.
+
+    Network error reports add their elapsed time to the histogram of their route and network type and count their error type, deprecation
+    reports are counted by id. The route is the first matching template of Routes, the network type is one of the ECT values and the error type
+    one of the NEL types, other paths, network types and error types and the deprecation ids past the first 256 are kept under 'other'. The
+    uploads are not authenticated, so every dimension is bounded by the configuration and not by what the clients send. The uploads are parsed
+    outside a lock and the histograms and counters are only updated and read under it.
+
+    Example :
+        collector = ReportCollector(Routes=['/', '/products/{id:int}'])
+
+    Parameter :
+        Routes (list, optional): The route templates the report URLs are grouped by. Defaults to [].
+
+    '''
+    def __init__(self, Routes: list[str] = []):
+        """
+        Initializes the class.
+
+        Args:
+            Routes (list, optional): The route templates the report URLs are grouped by. Defaults to [].
+
+        Returns:
+            None
+        """
+        self.routes = [(route, RouteMatcher([route])) for route in Routes]
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.errors: Counter[tuple[str, str]] = Counter()
+        self.deprecations: Counter[str] = Counter()
+        self.reports = 0
+        self.rejected = 0
+        self.lock = Lock()
+
+    def __route__(self, url: str) -> str:
+        """
+        Groups the URL of a report by route template.
+
+        Args:
+            url (str): The URL of the report.
+
+        Returns:
+            str: The matching route template or 'other'.
+        """
+        path = urlsplit(url).path or '/'
+        for route, matcher in self.routes:
+            if matcher.match(path):
+                return route
+        return 'other'
+
+    def ingest(self, body: bytes, network: str = 'unknown') -> int:
+        """
+        Parses an upload of the Reporting API, either a list of reports or a single report.
+
+        Args:
+            body (bytes): The request body of the upload.
+            network (str, optional): The network type of the client eg. the ECT client hint, values outside NETWORK_TYPES are kept under 'other'. Defaults to 'unknown'.
+
+        Returns:
+            int: The number of reports that were used.
+        """
+        try:
+            reports = loads(body)
+        except ValueError:
+            reports = None
+        if isinstance(reports, dict):
+            reports = [reports]
+        if network not in NETWORK_TYPES:
+            network = 'other'
+
+        with self.lock:
+            if not isinstance(reports, list):
+                self.rejected += 1
+                return 0
+            return self.__ingest__(reports, network)
+
+    def __ingest__(self, reports: list[Any], network: str) -> int:
+        """
+        Adds the parsed reports to the histograms and counters, called by ingest with the lock held.
+
+        Args:
+            reports (list): The parsed reports.
+            network (str): The network type of the client.
+
+        Returns:
+            int: The number of reports that were used.
+        """
+        used = 0
+        for report in reports:
+            if not isinstance(report, dict) or not isinstance(report.get('body'), dict):
+                self.rejected += 1
+                continue
+            kind, payload = report.get('type'), report['body']
+            if kind == 'network-error':
+                route = self.__route__(str(report.get('url', '')))
+                elapsed = payload.get('elapsed_time')
+                histogram = self.latency.get((route, network))
+                if histogram is None:
+                    histogram = self.latency[route, network] = Histogram()
+                if isinstance(elapsed, (int, float)):
+                    histogram.add(float(elapsed))
+                error = str(payload.get('type', 'unknown'))
+                self.errors[route, error if error in ERROR_TYPES else 'other'] += 1
+            elif kind == 'deprecation':
+                deprecation = str(payload.get('id', 'unknown'))
+                self.deprecations[deprecation if deprecation in self.deprecations or len(self.deprecations) < MAX_DEPRECATIONS else 'other'] += 1
+            else:
+                self.rejected += 1
+                continue
+            used += 1
+        self.reports += used
+        return used
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the collected histograms and counters as plain dictionaries.
+
+        Returns:
+            dict[str, Any]: The latency histograms keyed by 'route network', the error counts keyed by 'route type', the deprecation counts and the totals.
+        """
+        with self.lock:
+            return {
+                'latency': {f'{route} {network}': histogram.snapshot() for (route, network), histogram in self.latency.items()},
+                'errors': {f'{route} {kind}': count for (route, kind), count in self.errors.items()},
+                'deprecations': dict(self.deprecations),
+                'reports': self.reports,
+                'rejected': self.rejected,
+            }
@@ -0,0 +1,2 @@
+from .NetworkErrorLoggingMiddleware import NetworkErrorLogging as NetworkErrorLogging
+from .ReportCollector import ReportCollector as ReportCollector
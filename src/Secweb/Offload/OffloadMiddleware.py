@@ -0,0 +1,226 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from email.message import Message as HTTPMessage
+from secrets import token_hex
+from threading import Lock, Thread
+from time import monotonic, sleep
+from typing import Optional, TypedDict
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+from warnings import warn
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..compiler import HeaderTuple
+from ..dedupe import unapplied_headers
+from ..offload import encode_headers
+
+PROBE_HEADER = b'x-secweb-offload-probe'
+PROBE_TOKEN = token_hex(16).encode('latin-1')
+"""A random token of this process, the probe request carries it so this middleware leaves the probe response to the server or the proxy."""
+
+OffloadOptions = TypedDict(
+    'OffloadOptions',
+    {
+        'keys': list[str],
+        'probe': str,
+        'timeout': float
+    },
+    total=False
+)
+
+
+class Offload:
+    ''' Offload class verifies that the server or the proxy sets the offloaded constant headers and sets the missing ones itself.
+
+    SecWeb skips the middlewares of the offloaded headers when the 'offload' option is set and adds this middleware. Once the application has
+    started, the probe URL is requested through the server or the proxy from a background thread. The probe request carries a random token of
+    the process and this middleware does not add any header to it, so the probe only sees the headers of the server or the proxy. Until the probe has seen the headers this
+    middleware sets all of them itself, after it only sets the ones the server or the proxy is missing and raises a RuntimeWarning for each,
+    so a wrong proxy configuration never serves responses without the headers. Responses sent before the probe answers may carry a header twice.
+
+    Example:
+        app.add_middleware(Offload, Option={'probe': 'http://127.0.0.1:8080/healthz', 'timeout': 10.0}, Headers=offload_headers(Option))
+
+    Parameters:
+        Option (OffloadOptions, optional):
+            - 'keys': The SecWeb keys that are offloaded, used by SecWeb to select the headers. (Default: every constant header except 'cacheControl')
+            - 'probe': The URL, as seen through the server or the proxy, that is requested to verify the headers. (Required)
+            - 'timeout': The seconds the probe keeps retrying until the server answers. (Default: 10.0)
+        Headers (list[tuple[str, str]]): The offloaded header names and values, eg. from offload_headers.
+
+    '''
+    def __init__(self, app: ASGIApp, Option: OffloadOptions = {}, Headers: list[tuple[str, str]] = []):
+        """
+        Initializes the class.
+
+        Args:
+            app (ASGIApp): The application object.
+            Option (OffloadOptions, optional):
+                - 'keys': The SecWeb keys that are offloaded, used by SecWeb to select the headers. (Default: every constant header except 'cacheControl')
+                - 'probe': The URL, as seen through the server or the proxy, that is requested to verify the headers. (Required)
+                - 'timeout': The seconds the probe keeps retrying until the server answers. (Default: 10.0)
+            Headers (list[tuple[str, str]]): The offloaded header names and values, eg. from offload_headers.
+
+        Raises:
+            SyntaxError: If the options are not valid, the probe is missing or the headers are empty.
+
+        Returns:
+            None
+        """
+        self.app = app
+        if set(Option.keys()) - {'keys', 'probe', 'timeout'}:
+            raise SyntaxError('Offload has 3 options 1> "keys" 2> "probe" 3> "timeout"')
+        if Headers.__len__() == 0:
+            raise SyntaxError('Cannot offload if the headers are empty')
+
+        self.probe: str = Option.get('probe', '')
+        if not self.probe:
+            raise SyntaxError('Offload needs a "probe" URL to verify that the server or the proxy sets the offloaded headers')
+        if not self.probe.startswith(('http://', 'https://')):
+            raise SyntaxError(f'The offload probe {self.probe} needs to be an http:// or https:// URL')
+        self.timeout = float(Option.get('timeout', 10.0))
+
+        self.expected = encode_headers(Headers)
+        self.fallback: HeaderTuple = self.expected
+        self.started = False
+        self.verified = False
+        self.lock = Lock()
+
+    def __start__(self) -> None:
+        """
+        Starts the probe thread once.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            if self.started:
+                return
+            self.started = True
+        Thread(target=self.verify, name='secweb-offload-probe', daemon=True).start()
+
+    def __fetch__(self) -> Optional[HTTPMessage]:
+        """
+        Requests the probe URL until it answers or the timeout passes.
+
+        Returns:
+            Optional[HTTPMessage]: The response headers or None if the probe never answered.
+        """
+        deadline = monotonic() + self.timeout
+        while True:
+            try:
+                with urlopen(Request(self.probe, headers={'User-Agent': 'Secweb offload probe', PROBE_HEADER.decode('latin-1'): PROBE_TOKEN.decode('latin-1')}), timeout=max(0.1, min(5.0, deadline - monotonic()))) as response:
+                    return response.headers
+            except HTTPError as error:
+                return error.headers
+            except (URLError, OSError):
+                if monotonic() >= deadline:
+                    return None
+                sleep(0.25)
+
+    def verify(self) -> HeaderTuple:
+        """
+        Requests the probe URL and compares its headers with the offloaded headers, only the missing headers are set by this middleware from then on.
+
+        Returns:
+            HeaderTuple: The missing headers.
+        """
+        received = self.__fetch__()
+        if received is None:
+            warn(f'The offload probe {self.probe} did not answer in {self.timeout} seconds, Secweb keeps setting the offloaded headers itself', RuntimeWarning, 2)
+            self.verified = True
+            return self.fallback
+
+        missing = []
+        for name, value in self.expected:
+            values = [item.strip() for item in received.get_all(name.decode('latin-1'), [])]
+            if not values:
+                missing.append((name, value))
+            elif value.decode('latin-1') not in values:
+                warn(f'The server or the proxy sets {name.decode("latin-1")} to {values[0]!r} instead of {value.decode("latin-1")!r}', RuntimeWarning, 2)
+
+        if missing:
+            warn(f'The server or the proxy does not set {[name.decode("latin-1") for name, _ in missing]}, Secweb sets them itself', RuntimeWarning, 2)
+        self.fallback = tuple(missing)
+        self.verified = True
+        return self.fallback
+
+    def __is_probe__(self, scope: Scope) -> bool:
+        """
+        Checks if the request is the probe of this process.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+
+        Returns:
+            bool: True if the request carries the probe token.
+        """
+        for name, value in scope["headers"]:
+            if name == PROBE_HEADER:
+                return value == PROBE_TOKEN
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Asynchronously handles the requests, starts the probe after the lifespan startup or on the first request and sets the missing headers.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+            receive (Receive): A function that returns a coroutine that reads messages from the server.
+            send (Send): A function that sends messages to the server.
+
+        Returns:
+            None
+        """
+        if scope["type"] == "lifespan" and not self.started:
+            async def started(message: Message):
+                """
+                Starts the probe once the application reports that it has started.
+
+                Args:
+                    message (Message): The message sent by the application.
+
+                Returns:
+                    None
+                """
+                await send(message)
+                if message["type"] == "lifespan.startup.complete":
+                    self.__start__()
+
+            return await self.app(scope, receive, started)
+
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        if not self.started:
+            self.__start__()
+
+        # Only checked until the probe has answered, the probe response has to show what the server or the proxy sets
+        if not self.verified and self.__is_probe__(scope):
+            return await self.app(scope, receive, send)
+
+        fallback = self.fallback
+        headers = unapplied_headers(scope, fallback) if fallback else ()
+        if not headers:
+            return await self.app(scope, receive, send)
+
+        async def set_Missing_Headers(message: Message):
+            """
+            Appends the offloaded headers the server or the proxy does not set to the HTTP response.
+
+            Args:
+                message (Message): The message sent by the application.
+
+            Returns:
+                None
+            """
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *headers]
+
+            await send(message)
+
+        await self.app(scope, receive, set_Missing_Headers)
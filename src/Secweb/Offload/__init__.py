@@ -0,0 +1 @@
+from .OffloadMiddleware import Offload as Offload
\ No newline at end of file
@@ -6,8 +6,10 @@
 
 from typing import List, Literal, Union
 from warnings import warn
-from starlette.datastructures import MutableHeaders
-from starlette.types import Send, Receive, Scope, Message, ASGIApp
+from ..datastructures import MutableHeaders
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..dedupe import already_applied
 
 ReferrerPolicyLiteral = List[Literal['no-referrer', 'no-referrer-when-downgrade', 'origin', 'origin-when-cross-origin', 'same-origin', 'strict-origin', 'strict-origin-when-cross-origin', 'unsafe-url']]
 
@@ -40,7 +42,7 @@ class ReferrerPolicy:
         self.app = app
         Policies: ReferrerPolicyLiteral = ['no-referrer', 'no-referrer-when-downgrade', 'origin', 'origin-when-cross-origin', 'same-origin', 'strict-origin', 'strict-origin-when-cross-origin', 'unsafe-url']
         self.policystring = ''
-        if not isinstance(Option, list):
+        if not isinstance(Option, (list, tuple)):
             warn('ReferrerPolicy middleware will now accept list of string(s) rather than dictonary eg. Option={"Referrer-Policy": "strict-origin-when-cross-origin"} will be Option=["strict-origin-when-cross-origin"]', SyntaxWarning, 2)
             if isinstance(Option['Referrer-Policy'], str) and Option['Referrer-Policy'] in Policies:
                 self.policystring = Option['Referrer-Policy']
@@ -69,7 +71,7 @@ class ReferrerPolicy:
         Returns:
             None
         """
-        if scope["type"] != "http":
+        if scope["type"] != "http" or already_applied(scope, b'referrer-policy'):
             return await self.app(scope, receive, send)
 
         async def set_Referrer_Policy(message: Message):
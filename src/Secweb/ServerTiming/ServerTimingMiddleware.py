@@ -0,0 +1,210 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from random import random
+from time import perf_counter_ns
+from typing import Callable, Optional, TypedDict
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..dedupe import already_applied
+
+TIMING = "secweb.timing"
+
+ServerTimingOptions = TypedDict(
+    'ServerTimingOptions',
+    {
+        'SampleRate': float,
+        'Trusted': Callable[[Scope], bool],
+        'App': bool,
+        'TimingAllowOrigin': list[str]
+    },
+    total=False
+)
+
+
+class TimingProbe:
+    ''' TimingProbe class records when a request reaches the application below the Secweb middlewares and when the application starts its response.
+
+    Example :
+        TimingProbe(app)
+
+    '''
+    __slots__ = ('app',)
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Records the timestamps of the request in the scope when ServerTiming measures it.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+            receive (Receive): A function that returns a coroutine that reads messages from the server.
+            send (Send): A function that sends messages to the server.
+
+        Returns:
+            None
+        """
+        timing = scope.get(TIMING)
+        if timing is None:
+            return await self.app(scope, receive, send)
+
+        timing[1] = perf_counter_ns()
+
+        async def probe_Response_Start(message: Message):
+            """
+            Records when the application starts its response.
+
+            Args:
+                message (Message): The message sent by the application.
+
+            Returns:
+                None
+            """
+            if message["type"] == "http.response.start":
+                timing[2] = perf_counter_ns()
+
+            await send(message)
+
+        await self.app(scope, receive, probe_Response_Start)
+
+
+class ServerTiming:
+    ''' ServerTiming class sets the Server-Timing header with the processing time of the Secweb middlewares and the Timing-Allow-Origin header.
+
+    The time spent in the Secweb middlewares before the request reaches the application and after the application starts its response is
+    reported as 'secweb', the time of the application until its response starts is reported as 'app'. Add it after every other Secweb
+    middleware so it is the outermost layer, or use the SecWeb 'serverTiming' option. The TimingProbe is placed below the Secweb middlewares
+    when the middleware is built, SecWeb adds it as its innermost layer.
+
+    Nothing is exposed by default, backend timings help an attacker, so a SampleRate above 0 or a Trusted check is needed for the
+    Server-Timing header.
+
+    Example:
+        app.add_middleware(ServerTiming, SampleRate=0.01, Trusted=None, App=True, TimingAllowOrigin=['https://rum.example.com'])
+
+    Parameters:
+        SampleRate (float, optional): The fraction between 0 and 1 of the requests that get the Server-Timing header. Defaults to 0.0.
+        Trusted (Callable[[Scope], bool], optional): Returns True for the clients that always get the Server-Timing header. Defaults to None.
+        App (bool, optional): Also reports the time of the application. Defaults to True.
+        TimingAllowOrigin (list, optional): The origins allowed to read the Resource Timing data of the responses, eg. first-party RUM scripts. Defaults to [].
+
+    '''
+    def __init__(self, app: ASGIApp, SampleRate: float = 0.0, Trusted: Optional[Callable[[Scope], bool]] = None, App: bool = True, TimingAllowOrigin: list[str] = []):
+        """
+        Initializes the class.
+
+        Args:
+            app (ASGIApp): The application object.
+            SampleRate (float, optional): The fraction between 0 and 1 of the requests that get the Server-Timing header. Defaults to 0.0.
+            Trusted (Callable[[Scope], bool], optional): Returns True for the clients that always get the Server-Timing header. Defaults to None.
+            App (bool, optional): Also reports the time of the application. Defaults to True.
+            TimingAllowOrigin (list, optional): The origins allowed to read the Resource Timing data of the responses, eg. first-party RUM scripts. Defaults to [].
+
+        Raises:
+            SyntaxError: If the SampleRate is not between 0 and 1, an origin is not valid or nothing would be sent.
+
+        Returns:
+            None
+        """
+        self.app = app
+        if not 0 <= SampleRate <= 1:
+            raise SyntaxError('SampleRate needs to be between 0 and 1')
+        if SampleRate == 0 and Trusted is None and not TimingAllowOrigin:
+            raise SyntaxError('ServerTiming needs a SampleRate above 0, a Trusted check or TimingAllowOrigin origins')
+
+        for origin in TimingAllowOrigin:
+            if origin != '*' and (not origin.startswith(('https://', 'http://')) or origin.count('/') != 2):
+                raise SyntaxError(f'Timing-Allow-Origin needs "*" or origins like "https://example.com", {origin} is not valid')
+
+        self.SampleRate = SampleRate
+        self.Trusted = Trusted
+        self.App = App
+        self.TimingAllowOrigin = ', '.join(TimingAllowOrigin).encode('latin-1') if TimingAllowOrigin else None
+        if self.Trusted is not None or self.SampleRate > 0:
+            self.__probe__()
+
+    def __probe__(self) -> None:
+        """
+        Places a TimingProbe between the last Secweb middleware below this middleware and the application, unless SecWeb already added one.
+
+        It runs once while the middleware stack is built, before any request.
+
+        Returns:
+            None
+        """
+        layer: ASGIApp = self
+        while not isinstance(layer.app, TimingProbe) and type(layer.app).__module__.startswith('Secweb.') and hasattr(layer.app, 'app'):
+            layer = layer.app
+        if not isinstance(layer.app, TimingProbe):
+            layer.app = TimingProbe(layer.app)
+
+    def __measured__(self, scope: Scope) -> bool:
+        """
+        Decide if the request gets the Server-Timing header.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+
+        Returns:
+            bool: True for trusted clients and the sampled requests.
+        """
+        if self.Trusted is not None and self.Trusted(scope):
+            return True
+        return self.SampleRate >= 1 or (self.SampleRate > 0 and random() < self.SampleRate)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Asynchronously handles HTTP requests by measuring them and setting the Server-Timing and Timing-Allow-Origin headers.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+            receive (Receive): A function that returns a coroutine that reads messages from the server.
+            send (Send): A function that sends messages to the server.
+
+        Returns:
+            None
+        """
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        allow = self.TimingAllowOrigin if self.TimingAllowOrigin is not None and not already_applied(scope, b'timing-allow-origin') else None
+        if not self.__measured__(scope):
+            if allow is None:
+                return await self.app(scope, receive, send)
+            timing = None
+        else:
+            timing = scope[TIMING] = [perf_counter_ns(), None, None]
+
+        async def set_Server_Timing(message: Message):
+            """
+            Appends the Server-Timing and Timing-Allow-Origin headers to the HTTP response.
+
+            Args:
+                message (Message): The message sent by the application.
+
+            Returns:
+                None
+            """
+            if message["type"] == "http.response.start":
+                headers = [*message.get("headers", ())]
+                if timing is not None:
+                    end = perf_counter_ns()
+                    if timing[1] is not None and timing[2] is not None:
+                        value = f'secweb;dur={(timing[1] - timing[0] + end - timing[2]) / 1e6:.3f}'
+                        if self.App:
+                            value += f', app;dur={(timing[2] - timing[1]) / 1e6:.3f}'
+                    else:
+                        value = f'secweb;dur={(end - timing[0]) / 1e6:.3f}'
+                    headers.append((b'server-timing', value.encode('latin-1')))
+                if allow is not None:
+                    headers.append((b'timing-allow-origin', allow))
+                message["headers"] = headers
+
+            await send(message)
+
+        await self.app(scope, receive, set_Server_Timing)
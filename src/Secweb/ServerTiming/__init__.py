@@ -0,0 +1,3 @@
+from .ServerTimingMiddleware import ServerTiming as ServerTiming
+from .ServerTimingMiddleware import ServerTimingOptions as ServerTimingOptions
+from .ServerTimingMiddleware import TimingProbe as TimingProbe
\ No newline at end of file
@@ -0,0 +1,194 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from hashlib import sha256
+from json import dumps
+from typing import Any, Literal, Mapping, TypedDict
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..ClearSiteData.ClearSiteDataMiddleware import ClearSiteData
+from ..dedupe import already_applied
+from ..policy import Policy
+from ..routes import RouteMatcher
+
+SpeculationRuleGroup = TypedDict(
+    'SpeculationRuleGroup',
+    {
+        'href_matches': list[str],
+        'eagerness': Literal['immediate', 'eager', 'moderate', 'conservative']
+    },
+    total=False
+)
+
+SpeculationRulesOptions = TypedDict(
+    'SpeculationRulesOptions',
+    {
+        'prefetch': list[SpeculationRuleGroup],
+        'prerender': list[SpeculationRuleGroup]
+    },
+    total=False
+)
+
+
+class SpeculationRules:
+    ''' SpeculationRules class sets the Speculation-Rules header pointing at a rules document generated from the route groups and serves that document.
+
+    The rules document is built once at startup and served with a versioned URL and a year long immutable cache, so browsers fetch it once per
+    deploy. The Exclude patterns are never speculated and the ClearOn routes, eg. logout, get Clear-Site-Data: "prefetchCache", "prerenderCache".
+
+    Example:
+        app.add_middleware(SpeculationRules, Option={'prefetch': [{'href_matches': ['/docs/*'], 'eagerness': 'moderate'}]}, Routes=['/docs/{page:path}'], Exclude=['/logout'], ClearOn=['/logout'], RulesPath='/speculation-rules.json')
+
+    Parameters:
+        Option (SpeculationRulesOptions):
+            - 'prefetch': The list of route groups to prefetch, every group has 'href_matches' URL patterns and an optional 'eagerness'.
+            - 'prerender': The list of route groups to prerender, every group has 'href_matches' URL patterns and an optional 'eagerness'.
+        Routes (list): The list of document routes that get the Speculation-Rules header.
+        Exclude (list, optional): The URL patterns that are never speculated. Defaults to [].
+        ClearOn (list, optional): The routes that clear the prefetch and prerender caches of the browser. Defaults to [].
+        RulesPath (str, optional): The path the rules document is served from. Defaults to '/speculation-rules.json'.
+
+    '''
+    def __init__(self, app: ASGIApp, Option: SpeculationRulesOptions = Policy({}), Routes: list[str] = [], Exclude: list[str] = [], ClearOn: list[str] = [], RulesPath: str = '/speculation-rules.json'):
+        """
+        Initializes the class and generates the rules document.
+
+        Args:
+            app (ASGIApp): The application object.
+            Option (SpeculationRulesOptions):
+                - 'prefetch': The list of route groups to prefetch, every group has 'href_matches' URL patterns and an optional 'eagerness'.
+                - 'prerender': The list of route groups to prerender, every group has 'href_matches' URL patterns and an optional 'eagerness'.
+            Routes (list): The list of document routes that get the Speculation-Rules header.
+            Exclude (list, optional): The URL patterns that are never speculated. Defaults to [].
+            ClearOn (list, optional): The routes that clear the prefetch and prerender caches of the browser. Defaults to [].
+            RulesPath (str, optional): The path the rules document is served from. Defaults to '/speculation-rules.json'.
+
+        Raises:
+            SyntaxError: If the options or the routes are not valid.
+
+        Returns:
+            None
+        """
+        self.app = app
+        if Routes.__len__() == 0:
+            raise SyntaxError('Cannot set Speculation-Rules header if the routes are empty')
+
+        if not RulesPath.startswith('/') or '{' in RulesPath:
+            raise SyntaxError('RulesPath must be a static path starting with "/"')
+
+        if set(Option.keys()) - {'prefetch', 'prerender'} or not Option:
+            raise SyntaxError('Speculation-Rules has 2 options 1> "prefetch" 2> "prerender"')
+
+        rules: dict[str, list[dict[str, Any]]] = {}
+        for action, groups in Option.items():
+            rules[action] = [self.__rule__(group, Exclude) for group in groups]
+
+        self.document = dumps(rules, separators=(',', ':')).encode('utf-8')
+        version = sha256(self.document).hexdigest()[:16]
+        self.RulesPath = RulesPath
+        self.etag = f'"{version}"'.encode('latin-1')
+        self.header = (b'speculation-rules', f'"{RulesPath}?v={version}"'.encode('latin-1'))
+        self.documentHeaders = [
+            (b'content-type', b'application/speculationrules+json'),
+            (b'content-length', str(len(self.document)).encode('latin-1')),
+            (b'cache-control', b'public, max-age=31536000, immutable'),
+            (b'etag', self.etag),
+        ]
+
+        self.routes = RouteMatcher(Routes)
+        self.clear = RouteMatcher(ClearOn)
+        self.clearHeader = (b'clear-site-data', ClearSiteData(None, Option={'prefetchCache': True, 'prerenderCache': True}, Routes=ClearOn).policyString.encode('latin-1')) if ClearOn else None
+
+    def __rule__(self, group: SpeculationRuleGroup, Exclude: list[str]) -> dict[str, Any]:
+        """
+        Builds a document rule for a route group.
+
+        Parameters:
+            group (SpeculationRuleGroup): The route group.
+            Exclude (list[str]): The URL patterns that are never speculated.
+
+        Raises:
+            SyntaxError: If the route group is not valid.
+
+        Returns:
+            dict[str, Any]: The document rule.
+        """
+        if set(group.keys()) - {'href_matches', 'eagerness'} or not group.get('href_matches'):
+            raise SyntaxError('A speculation rule group needs "href_matches" and an optional "eagerness"')
+
+        where: dict[str, Any] = {'href_matches': list(group['href_matches'])}
+        if Exclude:
+            where = {'and': [where, {'not': {'href_matches': list(Exclude)}}]}
+
+        rule: dict[str, Any] = {'source': 'document', 'where': where}
+        if 'eagerness' in group:
+            if group['eagerness'] not in ('immediate', 'eager', 'moderate', 'conservative'):
+                raise SyntaxError('eagerness has 4 options 1> "immediate" 2> "eager" 3> "moderate" 4> "conservative"')
+            rule['eagerness'] = group['eagerness']
+        return rule
+
+    async def __rules_document__(self, scope: Scope, send: Send):
+        """
+        Sends the rules document, or 304 when the browser already has this version.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+            send (Send): A function that sends messages to the server.
+
+        Returns:
+            None
+        """
+        for name, value in scope["headers"]:
+            if name == b'if-none-match' and value == self.etag:
+                await send({"type": "http.response.start", "status": 304, "headers": self.documentHeaders[2:]})
+                await send({"type": "http.response.body", "body": b''})
+                return
+
+        await send({"type": "http.response.start", "status": 200, "headers": self.documentHeaders})
+        await send({"type": "http.response.body", "body": self.document if scope["method"] == "GET" else b''})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Asynchronously handles HTTP requests by serving the rules document and setting the Speculation-Rules and Clear-Site-Data headers on the routes.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+            receive (Receive): A function that returns a coroutine that reads messages from the server.
+            send (Send): A function that sends messages to the server.
+
+        Returns:
+            None
+        """
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        path = scope["path"]
+        if path == self.RulesPath and scope["method"] in ("GET", "HEAD"):
+            return await self.__rules_document__(scope, send)
+
+        if self.clearHeader is not None and self.clear.match(path):
+            header = self.clearHeader
+        elif self.routes.match(path) and not already_applied(scope, b'speculation-rules'):
+            header = self.header
+        else:
+            return await self.app(scope, receive, send)
+
+        async def set_Speculation_Rules(message: Message):
+            """
+            Appends the Speculation-Rules or Clear-Site-Data header to the HTTP response.
+
+            Args:
+                message (Message): The message sent by the application.
+
+            Returns:
+                None
+            """
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), header]
+
+            await send(message)
+
+        await self.app(scope, receive, set_Speculation_Rules)
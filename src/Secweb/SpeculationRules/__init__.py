@@ -0,0 +1 @@
+from .SpeculationRulesMiddleware import SpeculationRules as SpeculationRules
\ No newline at end of file
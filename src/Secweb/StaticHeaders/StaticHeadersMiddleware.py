@@ -0,0 +1,86 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from typing import TYPE_CHECKING
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..compiler import compile_headers, compile_providers
+from ..dedupe import already_applied, unapplied_headers
+from ..providers import apply_providers
+
+if TYPE_CHECKING:
+    from ..index import SecWebOptions
+
+
+class StaticHeaders:
+    ''' StaticHeaders class sets the precompiled built-in headers and the headers of the registered providers on HTTP responses in a single pass.
+
+    The built-in headers and the static provider values with the 'append' conflict policy are compiled into one tuple by compile_headers,
+    only the providers with a value function or a 'keep' or 'replace' conflict policy are applied when the response starts. SecWeb uses this
+    middleware for every constant header instead of one layer per header.
+
+    Example :
+        app.add_middleware(StaticHeaders, Option={'hsts': {'max-age': 31536000}, 'csp': False})
+
+    Parameter :
+        Option (SecWebOptions, optional): The SecWeb options, missing keys use the middleware defaults and 'providers': False leaves the providers out. Defaults to {}.
+
+    '''
+    def __init__(self, app: ASGIApp, Option: 'SecWebOptions' = {}):
+        """
+        Initializes the class and compiles the headers.
+
+        Args:
+            app (ASGIApp): The application object.
+            Option (SecWebOptions, optional): The SecWeb options, missing keys use the middleware defaults and 'providers': False leaves the providers out. Defaults to {}.
+
+        Raises:
+            SyntaxError: If the options are not valid.
+
+        Returns:
+            None
+        """
+        self.app = app
+        self.headers = compile_headers(Option)[0]
+        self.providers = compile_providers('http')[1] if Option.get('providers') is not False else ()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Asynchronously handles HTTP requests by appending the precompiled headers and applying the providers in a single pass.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+            receive (Receive): A function that returns a coroutine that reads messages from the server.
+            send (Send): A function that sends messages to the server.
+
+        Returns:
+            None
+        """
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = unapplied_headers(scope, self.headers)
+        providers = tuple(provider for provider in self.providers if not already_applied(scope, provider.name)) if self.providers else ()
+        if not headers and not providers:
+            return await self.app(scope, receive, send)
+
+        async def set_Static_Headers(message: Message):
+            """
+            Appends the precompiled headers and applies the providers to the HTTP response.
+
+            Args:
+                message (Message): The message sent by the application.
+
+            Returns:
+                None
+            """
+            if message["type"] == "http.response.start":
+                raw = [*message.get("headers", ()), *headers]
+                message["headers"] = apply_providers(raw, scope, providers) if providers else raw
+
+            await send(message)
+
+        await self.app(scope, receive, set_Static_Headers)
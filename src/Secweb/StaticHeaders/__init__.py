@@ -0,0 +1 @@
+from .StaticHeadersMiddleware import StaticHeaders as StaticHeaders
\ No newline at end of file
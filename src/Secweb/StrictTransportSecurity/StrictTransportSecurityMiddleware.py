@@ -5,8 +5,11 @@
   Copyright 2021-2026, Motagamwala Taha Arif Ali '''
 
 from typing import TypedDict
-from starlette.datastructures import MutableHeaders
-from starlette.types import Send, Receive, Scope, Message, ASGIApp
+from ..datastructures import MutableHeaders
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..policy import Policy
+from ..dedupe import already_applied
 
 HSTSOptions = TypedDict(
     'HSTSOptions',
@@ -31,7 +34,7 @@ class HSTS:
             - preload (bool): Whether to preload the Strict-Transport-Security header. (Default: False)
 
     '''
-    def __init__(self, app: ASGIApp, Option: HSTSOptions = {'max-age': 31536000, 'includeSubDomains': True, 'preload': False}):
+    def __init__(self, app: ASGIApp, Option: HSTSOptions = Policy({'max-age': 31536000, 'includeSubDomains': True, 'preload': False})):
         """
         Initializes an instance of the class.
 
@@ -77,7 +80,7 @@ class HSTS:
         Returns:
             None
         """
-        if scope["type"] != "http":
+        if scope["type"] != "http" or already_applied(scope, b'strict-transport-security'):
             return await self.app(scope, receive, send)
 
         async def set_Strict_Transport_Security(message: Message):
@@ -0,0 +1,256 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from base64 import b64encode
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import new
+from json import dump, load
+from mmap import ACCESS_READ, mmap
+from os import path as ospath, replace, stat
+from threading import Event, Lock, Thread
+from typing import Iterable, Literal, Optional
+
+from ..scanner import MMAP_THRESHOLD, walk
+
+SRIAlgorithm = Literal['sha256', 'sha384', 'sha512']
+
+SRI_EXTENSIONS = frozenset(['.js', '.mjs', '.cjs', '.css'])
+CHUNK_SIZE = 1 << 20
+CACHE_VERSION = 1
+
+
+def sri_digest(path: str, Algorithm: SRIAlgorithm = 'sha384') -> str:
+    """
+    Compute the Subresource Integrity digest of a file.
+
+    Files larger than MMAP_THRESHOLD are memory mapped and hashed in CHUNK_SIZE slices, hashlib releases the GIL while it hashes
+    so many files can be hashed in parallel by threads.
+
+    Args:
+        path (str): The path of the file.
+        Algorithm (SRIAlgorithm, optional): 'sha256', 'sha384' or 'sha512'. Defaults to 'sha384'.
+
+    Returns:
+        str: The integrity value, eg. 'sha384-oqVuAfXRKap7fdgcCY5uykM6+R9GqQ8K/uxy9rx7HNQlGYl1kPzQho1wx4JwY8wC'.
+    """
+    digest = new(Algorithm)
+    with open(path, 'rb') as file:
+        if stat(file.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap(file.fileno(), 0, access=ACCESS_READ) as buffer, memoryview(buffer) as view:
+                for start in range(0, len(view), CHUNK_SIZE):
+                    digest.update(view[start:start + CHUNK_SIZE])
+        else:
+            digest.update(file.read())
+    return f'{Algorithm}-{b64encode(digest.digest()).decode("ascii")}'
+
+
+class IntegrityDigests:
+    ''' IntegrityDigests class computes and caches the Subresource Integrity digests of the static scripts and stylesheets.
+
+    The digests are computed in a thread pool when the class is created and cached by (path, mtime, size), the cache can be stored on disk so
+    unchanged files are not hashed again on the next start. The integrity method is the template helper, it never hashes: it checks the cached
+    (mtime, size) of the file with one stat and returns an empty string, so the page renders without an integrity check for that file, and
+    schedules a background refresh when the file is new or changed. Set Interval to also poll the directory.
+
+    Example :
+        digests = IntegrityDigests('static', Prefix='/static', Algorithm='sha384', Cache='.secweb-sri.json', Workers=None, Interval=None)
+        templates.env.globals['integrity'] = digests.integrity
+
+    Parameters :
+        Directory (str): The directory of the static files.
+        Prefix (str, optional): The URL path the directory is served at. Defaults to '/static'.
+        Algorithm (SRIAlgorithm, optional): 'sha256', 'sha384' or 'sha512'. Defaults to 'sha384'.
+        Cache (str, optional): The path of the file the digests are stored in between runs. Defaults to None.
+        Workers (int, optional): The number of threads used to hash the files, 0 hashes in this thread and None uses the executor default. Defaults to None.
+        Extensions (Iterable[str], optional): The file extensions that are hashed. Defaults to SRI_EXTENSIONS.
+
+    '''
+    def __init__(self, Directory: str, Prefix: str = '/static', Algorithm: SRIAlgorithm = 'sha384', Cache: Optional[str] = None, Workers: Optional[int] = None, Extensions: Iterable[str] = SRI_EXTENSIONS, Interval: Optional[float] = None):
+        """
+        Initializes the class and precomputes the digests of every file in the directory.
+
+        Args:
+            Directory (str): The directory of the static files.
+            Prefix (str, optional): The URL path the directory is served at. Defaults to '/static'.
+            Algorithm (SRIAlgorithm, optional): 'sha256', 'sha384' or 'sha512'. Defaults to 'sha384'.
+            Cache (str, optional): The path of the file the digests are stored in between runs. Defaults to None.
+            Workers (int, optional): The number of threads used to hash the files, 0 hashes in this thread and None uses the executor default. Defaults to None.
+            Extensions (Iterable[str], optional): The file extensions that are hashed. Defaults to SRI_EXTENSIONS.
+
+        Raises:
+            SyntaxError: If the algorithm is not valid, the directory does not exist, the prefix does not start with '/' or the interval is not positive.
+
+        Returns:
+            None
+        """
+        if Algorithm not in ('sha256', 'sha384', 'sha512'):
+            raise SyntaxError('Subresource Integrity has 3 algorithms 1> "sha256" 2> "sha384" 3> "sha512"')
+        if not ospath.isdir(Directory):
+            raise SyntaxError(f'The static directory {Directory} does not exist')
+        if not Prefix.startswith('/'):
+            raise SyntaxError(f'The prefix {Prefix} needs to start with "/"')
+        if Interval is not None and Interval <= 0:
+            raise SyntaxError('The refresh interval needs to be a positive number of seconds')
+
+        self.Directory = ospath.realpath(Directory)
+        self.Prefix = Prefix.rstrip('/')
+        self.Algorithm = Algorithm
+        self.Cache = Cache
+        self.Workers = Workers
+        self.Extensions = frozenset(extension.lower() for extension in Extensions)
+        self.files: dict[str, tuple[int, int, str]] = {}
+        self.digests: dict[str, tuple[str, int, int, str]] = {}
+        self.lock = Lock()
+        self.refreshing = Lock()
+        self.stopped = Event()
+        self.refresh()
+        if Interval is not None:
+            Thread(target=self.__poll__, args=(Interval,), name='secweb-sri-refresh', daemon=True).start()
+
+    def __url__(self, path: str) -> str:
+        """
+        Convert the path of a file in the directory to its URL path.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            str: The URL path, eg. '/static/js/app.js'.
+        """
+        return f'{self.Prefix}/{ospath.relpath(path, self.Directory).replace(ospath.sep, "/")}'
+
+    def __load__(self) -> dict[str, tuple[int, int, str]]:
+        """
+        Read the digests stored by the last run.
+
+        Returns:
+            dict[str, tuple[int, int, str]]: The modification time, size and digest of every file, empty if the cache is missing or from another algorithm.
+        """
+        if self.Cache is None:
+            return {}
+        try:
+            with open(self.Cache) as file:
+                cache = load(file)
+        except (OSError, ValueError):
+            return {}
+        if cache.get('version') != CACHE_VERSION or cache.get('algorithm') != self.Algorithm:
+            return {}
+        return {path: (entry[0], entry[1], entry[2]) for path, entry in cache.get('files', {}).items()}
+
+    def __poll__(self, Interval: float) -> None:
+        """
+        Refreshes the digests every Interval seconds until close is called, runs in a daemon thread.
+
+        Args:
+            Interval (float): The seconds between the refreshes.
+
+        Returns:
+            None
+        """
+        while not self.stopped.wait(Interval):
+            self.refresh()
+
+    def __schedule__(self) -> None:
+        """
+        Starts a background refresh unless one is already running.
+
+        Returns:
+            None
+        """
+        if not self.refreshing.locked():
+            Thread(target=self.refresh, name='secweb-sri-refresh', daemon=True).start()
+
+    def close(self) -> None:
+        """
+        Stops the background refreshes started by Interval.
+
+        Returns:
+            None
+        """
+        self.stopped.set()
+
+    def refresh(self) -> int:
+        """
+        Walk the directory and hash the files that are new or changed since they were last hashed, run it at startup or from a file watcher.
+
+        Returns:
+            int: The number of files hashed.
+        """
+        with self.refreshing:
+            return self.__refresh__()
+
+    def __refresh__(self) -> int:
+        """
+        Hashes the new and changed files, called by refresh with the refreshing lock held.
+
+        Returns:
+            int: The number of files hashed.
+        """
+        known = self.files or self.__load__()
+        files: dict[str, tuple[int, int, str]] = {}
+        pending: list[tuple[str, int, int]] = []
+        for path, mtime, size in walk([self.Directory], self.Extensions):
+            entry = known.get(path)
+            if entry is not None and entry[0] == mtime and entry[1] == size:
+                files[path] = entry
+            else:
+                pending.append((path, mtime, size))
+
+        if self.Workers == 0 or len(pending) < 2:
+            hashed = [sri_digest(path, self.Algorithm) for path, _, _ in pending]
+        else:
+            with ThreadPoolExecutor(self.Workers) as executor:
+                hashed = list(executor.map(sri_digest, [path for path, _, _ in pending], [self.Algorithm] * len(pending)))
+        for (path, mtime, size), digest in zip(pending, hashed):
+            files[path] = (mtime, size, digest)
+
+        with self.lock:
+            self.files = files
+            self.digests = {self.__url__(path): (path, mtime, size, digest) for path, (mtime, size, digest) in files.items()}
+
+        if self.Cache is not None and (pending or len(files) != len(known)):
+            temporary = f'{self.Cache}.tmp'
+            with open(temporary, 'w') as file:
+                dump({'version': CACHE_VERSION, 'algorithm': self.Algorithm, 'files': files}, file)
+            replace(temporary, self.Cache)
+
+        return len(pending)
+
+    def integrity(self, url: str) -> str:
+        """
+        Return the integrity value of a static file, this is the template helper and it only reads the cache and stats the file.
+
+        A file that is not in the cache or whose mtime or size changed since it was hashed gets no digest and a background refresh is
+        scheduled, the template then renders an empty integrity attribute instead of failing or sending a digest the browser rejects.
+
+        Args:
+            url (str): The URL path of the file, eg. '/static/app.js', or its path relative to the prefix, eg. 'app.js'.
+
+        Returns:
+            str: The integrity value or an empty string if the file is not hashed yet.
+        """
+        if not url.startswith(self.Prefix + '/'):
+            url = f'{self.Prefix}/{url.lstrip("/")}'
+        entry = self.digests.get(url)
+        if entry is not None:
+            path, mtime, size, digest = entry
+            try:
+                info = stat(path)
+            except OSError:
+                self.__schedule__()
+                return ''
+            if info.st_mtime_ns == mtime and info.st_size == size:
+                return digest
+            self.__schedule__()
+            return ''
+
+        path = ospath.realpath(ospath.join(self.Directory, *url[len(self.Prefix) + 1:].split('/')))
+        if path.startswith(self.Directory + ospath.sep) and path[path.rfind('.'):].lower() in self.Extensions and ospath.isfile(path):
+            self.__schedule__()
+        return ''
+
+    def __len__(self) -> int:
+        return len(self.digests)
@@ -0,0 +1,118 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from re import compile
+from typing import Literal, TypedDict
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..dedupe import unapplied_headers
+from ..policy import Policy
+
+IntegrityPolicyOptions = TypedDict(
+    'IntegrityPolicyOptions',
+    {
+        'blocked-destinations': list[Literal['script', 'style']],
+        'sources': list[Literal['inline']],
+        'endpoints': list[str]
+    },
+    total=False
+)
+
+TOKEN_RE = compile(r'^[a-z*][a-z0-9_\-.*]*$')
+
+
+class IntegrityPolicy:
+    ''' IntegrityPolicy class sets the Integrity-Policy header so the browser blocks scripts and stylesheets loaded without a valid integrity attribute.
+
+    It replaces the removed require-sri-for CSP directive, use IntegrityDigests to compute the integrity attributes of the static files.
+
+    Example:
+        app.add_middleware(IntegrityPolicy, Option={'blocked-destinations': ['script', 'style'], 'sources': ['inline'], 'endpoints': ['integrity']}, report_only=False)
+
+    Parameters:
+        Option (IntegrityPolicyOptions, optional):
+            - 'blocked-destinations': The request destinations that need integrity metadata, 'script' and 'style'. (Default: ['script'])
+            - 'sources': The integrity sources, only 'inline' exists. (Default: ['inline'])
+            - 'endpoints': The Reporting-Endpoints names the violations are reported to. (Default: [])
+        report_only (bool, optional): Sets the Integrity-Policy-Report-Only header, the violations are reported and nothing is blocked. Defaults to False.
+
+    '''
+    def __init__(self, app: ASGIApp, Option: IntegrityPolicyOptions = Policy({'blocked-destinations': ['script']}), report_only: bool = False):
+        """
+        Initializes the class and precompiles the header.
+
+        Args:
+            app (ASGIApp): The application object.
+            Option (IntegrityPolicyOptions, optional):
+                - 'blocked-destinations': The request destinations that need integrity metadata, 'script' and 'style'. (Default: ['script'])
+                - 'sources': The integrity sources, only 'inline' exists. (Default: ['inline'])
+                - 'endpoints': The Reporting-Endpoints names the violations are reported to. (Default: [])
+            report_only (bool, optional): Sets the Integrity-Policy-Report-Only header, the violations are reported and nothing is blocked. Defaults to False.
+
+        Raises:
+            SyntaxError: If the options are not valid.
+
+        Returns:
+            None
+        """
+        self.app = app
+        if set(Option.keys()) - {'blocked-destinations', 'sources', 'endpoints'}:
+            raise SyntaxError('IntegrityPolicy has 3 options 1> "blocked-destinations" 2> "sources" 3> "endpoints"')
+
+        destinations = list(Option.get('blocked-destinations', ['script']))
+        sources = list(Option.get('sources', ['inline']))
+        endpoints = list(Option.get('endpoints', []))
+        if destinations.__len__() == 0 or set(destinations) - {'script', 'style'}:
+            raise SyntaxError('Integrity-Policy blocked-destinations needs one or both of 1> "script" 2> "style"')
+        if set(sources) - {'inline'}:
+            raise SyntaxError('Integrity-Policy sources has 1 option 1> "inline"')
+        for endpoint in endpoints:
+            if not TOKEN_RE.match(endpoint):
+                raise SyntaxError(f'The endpoint {endpoint} needs to be a lower-case Reporting-Endpoints name')
+        if report_only and endpoints.__len__() == 0:
+            raise SyntaxError('Integrity-Policy-Report-Only needs at least one reporting endpoint')
+
+        value = f'blocked-destinations=({" ".join(dict.fromkeys(destinations))}), sources=({" ".join(dict.fromkeys(sources))})'
+        if endpoints:
+            value += f', endpoints=({" ".join(dict.fromkeys(endpoints))})'
+        self.PolicyString = value
+        self.headers = ((b'integrity-policy-report-only' if report_only else b'integrity-policy', value.encode('latin-1')),)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Asynchronously handles HTTP requests by setting the precompiled Integrity-Policy header on the response.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+            receive (Receive): A function that returns a coroutine that reads messages from the server.
+            send (Send): A function that sends messages to the server.
+
+        Returns:
+            None
+        """
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = unapplied_headers(scope, self.headers)
+        if not headers:
+            return await self.app(scope, receive, send)
+
+        async def set_Integrity_Policy(message: Message):
+            """
+            Appends the Integrity-Policy header to the HTTP response.
+
+            Args:
+                message (Message): The message sent by the application.
+
+            Returns:
+                None
+            """
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *headers]
+
+            await send(message)
+
+        await self.app(scope, receive, set_Integrity_Policy)
@@ -0,0 +1,3 @@
+from .SubresourceIntegrityMiddleware import IntegrityPolicy as IntegrityPolicy
+from .SubresourceIntegrityDigests import IntegrityDigests as IntegrityDigests
+from .SubresourceIntegrityDigests import sri_digest as sri_digest
\ No newline at end of file
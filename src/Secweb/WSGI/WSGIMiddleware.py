@@ -0,0 +1,147 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
+
+from ..ClientHints.ClientHintsMiddleware import ClientHints
+from ..SubresourceIntegrity.SubresourceIntegrityMiddleware import IntegrityPolicy
+from ..compiler import HEADER_SOURCES, compile_headers, compile_providers
+from ..routes import PathTrie
+
+if TYPE_CHECKING:
+    from ..index import SecWebOptions
+
+WSGIHeaders = list[tuple[str, str]]
+StartResponse = Callable[..., Callable[[bytes], Any]]
+WSGIApp = Callable[[dict[str, Any], StartResponse], Iterable[bytes]]
+
+WSGI_KEYS = frozenset([*HEADER_SOURCES, 'integrityPolicy', 'clientHints', 'providers', 'bypass'])
+ASGI_ONLY_KEYS = frozenset(['clearSiteData', 'offload', 'serverTiming'])
+
+
+class SecWebWSGI:
+    ''' SecWebWSGI class sets the Secweb security headers on the responses of a WSGI application like Flask or Django.
+
+    The headers are compiled once from the same SecWeb options and validation as the ASGI middlewares and decoded to the native
+    strings of WSGI, every response only gets the precompiled list appended in its start_response call. The constant headers,
+    'integrityPolicy', the static part of 'clientHints' and the static values of the registered providers are emitted, 'wshsts'
+    only applies to websockets and is ignored. The options that depend on the request or on an ASGI layer, 'clearSiteData',
+    'offload', 'serverTiming', the Save-Data Cache-Control of 'clientHints' and providers with a value function, raise a
+    SyntaxError instead of being dropped, as do unknown keys. Nonce based CSP is not supported.
+
+    Example :
+        app.wsgi_app = SecWebWSGI(app.wsgi_app, Option={'hsts': {'max-age': 63072000, 'preload': True}, 'bypass': {'paths': ['/healthz']}})
+
+    Parameter :
+        Option (SecWebOptions, optional): The SecWeb options, missing keys use the middleware defaults, False turns a header off and
+            'bypass' excludes paths and path prefixes from the headers. Defaults to {}.
+
+    '''
+    def __init__(self, app: WSGIApp, Option: 'SecWebOptions' = {}):
+        """
+        Initializes the class and compiles the headers.
+
+        Args:
+            app (WSGIApp): The WSGI application object.
+            Option (SecWebOptions, optional): The SecWeb options, missing keys use the middleware defaults, False turns a header off and
+                'bypass' excludes paths and path prefixes from the headers. Defaults to {}.
+
+        Raises:
+            SyntaxError: If the options are not valid, are unknown or cannot be honoured on WSGI.
+
+        Returns:
+            None
+        """
+        self.app = app
+        unknown = set(Option.keys()) - WSGI_KEYS - ASGI_ONLY_KEYS
+        if unknown:
+            raise SyntaxError(f'{sorted(unknown)} are not SecWeb options')
+        unsupported = sorted(key for key in ASGI_ONLY_KEYS if Option.get(key) not in (None, False))
+        if unsupported:
+            raise SyntaxError(f'{unsupported} need the ASGI middlewares and cannot be used with SecWebWSGI')
+
+        headers = list(compile_headers(Option)[0])
+        integrity = Option.get('integrityPolicy')
+        if integrity is not None and integrity is not False:
+            headers.extend(IntegrityPolicy(None, integrity).headers)
+        hints = Option.get('clientHints')
+        if hints is not None and hints is not False:
+            if hints.get('saveDataCacheControl') is not None:
+                raise SyntaxError('The Save-Data Cache-Control of clientHints depends on the request and cannot be used with SecWebWSGI')
+            client_hints = ClientHints(None, hints)
+            headers.extend(client_hints.headers)
+            if client_hints.vary is not None:
+                headers.append((b'vary', client_hints.vary.encode('latin-1')))
+        self.headers: WSGIHeaders = [(name.decode('latin-1'), value.decode('latin-1')) for name, value in headers]
+
+        providers = compile_providers('http')[1] if Option.get('providers') is not False else ()
+        if any(provider.function is not None for provider in providers):
+            raise SyntaxError('Header providers with a value function need the ASGI scope, set "providers": False to use SecWebWSGI')
+        self.providers = [(provider.name.decode('latin-1'), provider.value.decode('latin-1'), provider.conflict) for provider in providers if provider.value is not None]
+
+        bypass = Option.get('bypass') or {}
+        if set(bypass.keys()) - {'paths', 'prefixes'}:
+            raise SyntaxError('Bypass has 2 options 1> "paths" 2> "prefixes"')
+        for path in [*bypass.get('paths', []), *bypass.get('prefixes', [])]:
+            if not path.startswith('/'):
+                raise SyntaxError(f'The path {path} needs to start with "/"')
+        self.paths = frozenset(bypass.get('paths', []))
+        self.prefixes = PathTrie(list(bypass.get('prefixes', [])))
+
+    def __headers__(self, headers: WSGIHeaders) -> WSGIHeaders:
+        """
+        Appends the precompiled headers and applies the static providers with a 'keep' or 'replace' conflict policy.
+
+        Args:
+            headers (WSGIHeaders): The response headers set by the application.
+
+        Returns:
+            WSGIHeaders: The headers of the response.
+        """
+        headers = [*headers, *self.headers]
+        if not self.providers:
+            return headers
+
+        present = {name.lower() for name, _ in headers}
+        for name, value, conflict in self.providers:
+            if conflict == 'keep' and name in present:
+                continue
+            if conflict == 'replace' and name in present:
+                headers = [header for header in headers if header[0].lower() != name]
+            headers.append((name, value))
+            present.add(name)
+        return headers
+
+    def __call__(self, environ: dict[str, Any], start_response: StartResponse) -> Iterable[bytes]:
+        """
+        Handles WSGI requests by appending the precompiled headers in start_response.
+
+        Parameters:
+            environ (dict): The WSGI environment of the request.
+            start_response (StartResponse): The start_response callable of the server.
+
+        Returns:
+            Iterable[bytes]: The response body of the application.
+        """
+        path = environ.get('PATH_INFO') or '/'
+        if path in self.paths or (self.prefixes and self.prefixes.match(path)):
+            return self.app(environ, start_response)
+
+        def set_Security_Headers(status: str, headers: WSGIHeaders, exc_info: Optional[Any] = None) -> Callable[[bytes], Any]:
+            """
+            Appends the precompiled headers and the providers to the headers of the application.
+
+            Args:
+                status (str): The status line of the response.
+                headers (WSGIHeaders): The response headers set by the application.
+                exc_info (optional): The exception information when the application reports an error. Defaults to None.
+
+            Returns:
+                Callable: The write callable of the server.
+            """
+            return start_response(status, self.__headers__(headers), exc_info)
+
+        return self.app(environ, set_Security_Headers)
@@ -0,0 +1 @@
+from .WSGIMiddleware import SecWebWSGI as SecWebWSGI
\ No newline at end of file
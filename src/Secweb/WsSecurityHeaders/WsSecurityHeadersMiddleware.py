@@ -0,0 +1,105 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from typing import TYPE_CHECKING, Optional
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..ClearSiteData.ClearSiteDataMiddleware import ClearSiteData
+from ..ClientHints.ClientHintsMiddleware import ClientHints
+from ..SubresourceIntegrity.SubresourceIntegrityMiddleware import IntegrityPolicy
+from ..StaticHeaders.StaticHeadersMiddleware import StaticHeaders
+from ..compiler import HEADER_SOURCES, compile_providers, compile_websocket_headers
+from ..dedupe import already_applied, unapplied_headers
+from ..providers import apply_providers
+
+if TYPE_CHECKING:
+    from ..index import SecWebOptions
+
+HTTP_ONLY_MIDDLEWARES = frozenset([cls for key, (_, cls, _) in HEADER_SOURCES.items() if key != 'wshsts'] + [ClearSiteData, ClientHints, IntegrityPolicy, StaticHeaders])
+
+
+class WsSecurityHeaders:
+    ''' WsSecurityHeaders class sets the precompiled security headers and the registered websocket providers on the websocket handshake.
+
+    Websocket requests skip every HTTP only Secweb middleware placed directly below this middleware and go straight to the application.
+
+    Example :
+        app.add_middleware(WsSecurityHeaders, Option={})
+
+    Parameter :
+        Option (SecWebOptions, optional): The SecWeb options, only 'wshsts', 'csp', 'corp', 'xcto' and 'providers' are used for the websocket handshake and missing keys use the middleware defaults. Defaults to {}.
+
+    '''
+    def __init__(self, app: ASGIApp, Option: 'SecWebOptions' = {}):
+        """
+        Initializes an instance of the class.
+
+        Args:
+            app (ASGIApp): The application object.
+            Option (SecWebOptions, optional): The SecWeb options, only 'wshsts', 'csp', 'corp', 'xcto' and 'providers' are used for the websocket handshake and missing keys use the middleware defaults. Defaults to {}.
+
+        Raises:
+            SyntaxError: If the options are not valid.
+
+        Returns:
+            None
+        """
+        self.app = app
+        self.headers = compile_websocket_headers(Option)
+        self.providers = compile_providers('websocket')[1] if Option.get('providers') is not False else ()
+        self.websocket_app: Optional[ASGIApp] = None
+
+    def __websocket_app__(self) -> ASGIApp:
+        """
+        Finds the first application below this middleware that is not an HTTP only Secweb middleware.
+
+        Returns:
+            ASGIApp: The application that receives the websocket requests.
+        """
+        app = self.app
+        while type(app) in HTTP_ONLY_MIDDLEWARES:
+            app = app.app
+        self.websocket_app = app
+        return app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Asynchronously handles Websocket requests by sending them past the HTTP only middlewares with the precompiled headers.
+
+        Parameters:
+            scope (Scope): The scope of the request.
+            receive (Receive): A function that returns a coroutine that reads messages from the server.
+            send (Send): A function that sends messages to the server.
+
+        Returns:
+            None
+        """
+        if scope["type"] != "websocket":
+            return await self.app(scope, receive, send)
+
+        app = self.websocket_app or self.__websocket_app__()
+        headers = unapplied_headers(scope, self.headers)
+        providers = tuple(provider for provider in self.providers if not already_applied(scope, provider.name)) if self.providers else ()
+        if not headers and not providers:
+            return await app(scope, receive, send)
+
+        async def set_Websocket_Headers(message: Message):
+            """
+            Appends the precompiled headers and applies the providers to the websocket accept message.
+
+            Args:
+                message (Message): The message sent by the application.
+
+            Returns:
+                None
+            """
+            if message["type"] == "websocket.accept":
+                raw = [*message.get("headers", ()), *headers]
+                message["headers"] = apply_providers(raw, scope, providers) if providers else raw
+
+            await send(message)
+
+        await app(scope, receive, set_Websocket_Headers)
@@ -0,0 +1 @@
+from .WsSecurityHeadersMiddleware import WsSecurityHeaders as WsSecurityHeaders
\ No newline at end of file
@@ -5,8 +5,11 @@
   Copyright 2021-2026, Motagamwala Taha Arif Ali '''
 
 from typing import TypedDict
-from starlette.datastructures import MutableHeaders
-from starlette.types import Send, Receive, Scope, Message, ASGIApp
+from ..datastructures import MutableHeaders
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..policy import Policy
+from ..dedupe import already_applied
 
 WsHSTSOptions = TypedDict(
     'WsHSTSOptions',
@@ -31,7 +34,7 @@ class WsHSTS:
             - preload (bool): Whether to preload the Strict-Transport-Security header. (Default: False)
     
     '''
-    def __init__(self, app: ASGIApp, Option: WsHSTSOptions = {'max-age': 31536000, 'includeSubDomains': True, 'preload': False}):
+    def __init__(self, app: ASGIApp, Option: WsHSTSOptions = Policy({'max-age': 31536000, 'includeSubDomains': True, 'preload': False})):
         """
         Initializes an instance of the class.
 
@@ -75,7 +78,7 @@ class WsHSTS:
             receive (Receive): A function that returns a coroutine that reads messages from the server.
             send (Send): A function that sends messages to the server.
         """
-        if scope["type"] != "websocket":
+        if scope["type"] != "websocket" or already_applied(scope, b'strict-transport-security'):
             return await self.app(scope, receive, send)
 
         async def set_Strict_Transport_Security(message: Message):  
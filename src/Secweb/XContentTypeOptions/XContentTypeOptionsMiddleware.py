@@ -4,8 +4,10 @@
 
   Copyright 2021-2026, Motagamwala Taha Arif Ali '''
 
-from starlette.datastructures import MutableHeaders
-from starlette.types import Send, Receive, Scope, Message, ASGIApp
+from ..datastructures import MutableHeaders
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..dedupe import already_applied
 
 
 class XContentTypeOptions:
@@ -39,7 +41,7 @@ class XContentTypeOptions:
         Returns:
             None
         """
-        if scope["type"] != "http":
+        if scope["type"] != "http" or already_applied(scope, b'x-content-type-options'):
             return await self.app(scope, receive, send)
 
         async def set_x_Content_Type_Options(message: Message):
@@ -4,28 +4,57 @@
 
   Copyright 2021-2026, Motagamwala Taha Arif Ali '''
 
-from typing import Literal, Union
+from typing import Literal, Mapping, TypedDict, Union
 from warnings import warn
-from starlette.datastructures import MutableHeaders
-from starlette.types import Send, Receive, Scope, Message, ASGIApp
+from ..datastructures import MutableHeaders
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..dedupe import already_applied
+from ..routes import RouteMatcher
 
 XDNSPrefetchControlLiteral = Literal['on', 'off']
 
-XDNSPrefetchControlOptions = Union[dict[Literal['X-DNS-Prefetch-Control'], XDNSPrefetchControlLiteral], XDNSPrefetchControlLiteral]
+XDNSPrefetchControlRoutes = Mapping[XDNSPrefetchControlLiteral, list[str]]
+
+XDNSPrefetchControlRouteOptions = TypedDict(
+    'XDNSPrefetchControlRouteOptions',
+    {
+        'X-DNS-Prefetch-Control': XDNSPrefetchControlLiteral,
+        'routes': XDNSPrefetchControlRoutes
+    },
+    total=False
+)
+
+XDNSPrefetchControlOptions = Union[dict[Literal['X-DNS-Prefetch-Control'], XDNSPrefetchControlLiteral], XDNSPrefetchControlLiteral, XDNSPrefetchControlRouteOptions]
+
+
+def has_routes(Option: object) -> bool:
+    """
+    Check if an xdns option sets the header per route, it then cannot be compiled to a static header.
+
+    Args:
+        Option (object): The xdns option.
+
+    Returns:
+        bool: True if the option has a 'routes' key.
+    """
+    return isinstance(Option, Mapping) and 'routes' in Option
 
 class XDNSPrefetchControl:
     ''' XDNSPrefetchControl class sets X-DNS-Prefetch-Control header.
 
     Example:
-        app.add_middleware(XDNSPrefetchControl, Option='')
+        app.add_middleware(XDNSPrefetchControl, Option='off', Routes={'on': ['/docs/{page:path}'], 'off': ['/account/{page:path}']})
 
     Parameter:
         Option (XDNSPrefetchControlOptions, Optional):
             - 'on': Sets the value of the `X-DNS-Prefetch-Control` header to 'on'.
             - 'off': Sets the value of the `X-DNS-Prefetch-Control` header to 'off'. (Default)
+            - {'X-DNS-Prefetch-Control': 'off', 'routes': {'on': [...]}}: The value and the Routes in one option, the form used by the SecWeb 'xdns' option.
+        Routes (dict, Optional): The routes that override the Option, 'on' for navigation heavy pages and 'off' for sensitive pages. Defaults to {}.
     
     '''
-    def __init__(self, app: ASGIApp, Option: XDNSPrefetchControlOptions = 'off'):
+    def __init__(self, app: ASGIApp, Option: XDNSPrefetchControlOptions = 'off', Routes: Mapping[XDNSPrefetchControlLiteral, list[str]] = {}):
         """
         Initializes the class object.
 
@@ -34,12 +63,27 @@ class XDNSPrefetchControl:
             Option (XDNSPrefetchControlOptions, Optional):
                 - 'on': Sets the value of the `X-DNS-Prefetch-Control` header to 'on'.
                 - 'off': Sets the value of the `X-DNS-Prefetch-Control` header to 'off'. (Default)
+                - {'X-DNS-Prefetch-Control': 'off', 'routes': {'on': [...]}}: The value and the Routes in one option, the form used by the SecWeb 'xdns' option.
+            Routes (dict, Optional): The routes that override the Option, 'on' for navigation heavy pages and 'off' for sensitive pages. Defaults to {}.
 
         Raises:
-            SyntaxError: If the value of the Option is neither 'on' nor 'off'.
+            SyntaxError: If the value of the Option is neither 'on' nor 'off', the routes are given twice or a route is both 'on' and 'off'.
         """
         self.app = app
+        if has_routes(Option):
+            if set(Option.keys()) - {'X-DNS-Prefetch-Control', 'routes'}:
+                raise SyntaxError('XDNSPrefetchControl with routes has 2 options 1> "X-DNS-Prefetch-Control" 2> "routes"')
+            if Routes:
+                raise SyntaxError('XDNSPrefetchControl routes can be given in the Option or in Routes but not in both')
+            Option, Routes = Option.get('X-DNS-Prefetch-Control', 'off'), Option['routes']
         self.Option = Option
+        if set(Routes.keys()) - {'on', 'off'}:
+            raise SyntaxError('XDNSPrefetchControl Routes has two keys only 1> "on" 2> "off"')
+        overlap = set(Routes.get('on', ())) & set(Routes.get('off', ()))
+        if overlap:
+            raise SyntaxError(f'The routes {sorted(overlap)} cannot be both "on" and "off"')
+        self.off = RouteMatcher(Routes.get('off', []))
+        self.on = RouteMatcher(Routes.get('on', []))
         if not isinstance(self.Option, str):
             warn('XDNSPrefetchControl middleware will now accept string rather than dictonary eg. Option={"X-DNS-Prefetch-Control": "off"} will be Option="off"', SyntaxWarning, 2)
             if self.Option['X-DNS-Prefetch-Control'] != 'on' and self.Option['X-DNS-Prefetch-Control'] != 'off':
@@ -60,9 +104,15 @@ class XDNSPrefetchControl:
         Returns:
             None
         """
-        if scope["type"] != "http":
+        if scope["type"] != "http" or already_applied(scope, b'x-dns-prefetch-control'):
             return await self.app(scope, receive, send)
 
+        value = self.Option if isinstance(self.Option, str) else self.Option['X-DNS-Prefetch-Control']
+        if self.off and self.off.match(scope["path"]):
+            value = 'off'
+        elif self.on and self.on.match(scope["path"]):
+            value = 'on'
+
         async def set_x_DNS_Prefetch_Control(message: Message):
             """
             Sets the value of the `X-DNS-Prefetch-Control` header in the response headers.
@@ -75,7 +125,7 @@ class XDNSPrefetchControl:
             """
             if message["type"] == "http.response.start":
                 headers = MutableHeaders(scope=message)
-                headers.append('X-DNS-Prefetch-Control', self.Option if isinstance(self.Option, str) else self.Option['X-DNS-Prefetch-Control'])
+                headers.append('X-DNS-Prefetch-Control', value)
 
             await send(message)
 
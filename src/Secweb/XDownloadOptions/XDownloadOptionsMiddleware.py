@@ -4,8 +4,10 @@
 
   Copyright 2021-2026, Motagamwala Taha Arif Ali '''
 
-from starlette.datastructures import MutableHeaders
-from starlette.types import Send, Receive, Scope, Message, ASGIApp
+from ..datastructures import MutableHeaders
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..dedupe import already_applied
 
 
 class XDownloadOptions:
@@ -35,7 +37,7 @@ class XDownloadOptions:
         Returns:
             None
         """
-        if scope["type"] != "http":
+        if scope["type"] != "http" or already_applied(scope, b'x-download-options'):
             return await self.app(scope, receive, send)
 
         async def set_x_Download_Options(message: Message):
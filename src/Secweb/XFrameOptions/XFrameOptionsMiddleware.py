@@ -6,8 +6,10 @@
 
 from typing import Literal, Union
 from warnings import warn
-from starlette.datastructures import MutableHeaders
-from starlette.types import Send, Receive, Scope, Message, ASGIApp
+from ..datastructures import MutableHeaders
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..dedupe import already_applied
 
 XFrameLiteral = Literal['SAMEORIGIN', 'DENY']
 
@@ -59,7 +61,7 @@ class XFrame:
         Returns:
             None
         """
-        if scope["type"] != "http":
+        if scope["type"] != "http" or already_applied(scope, b'x-frame-options'):
             return await self.app(scope, receive, send)
 
         async def set_x_Frame_Options(message: Message):
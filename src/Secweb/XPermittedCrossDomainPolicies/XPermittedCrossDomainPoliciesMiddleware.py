@@ -6,8 +6,10 @@
 
 from typing import Literal, Union
 from warnings import warn
-from starlette.datastructures import MutableHeaders
-from starlette.types import Send, Receive, Scope, Message, ASGIApp
+from ..datastructures import MutableHeaders
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..dedupe import already_applied
 
 XPermittedCrossDomainPoliciesLiteral = Literal['none', 'master-only', 'by-content-type', 'all']
 
@@ -60,7 +62,7 @@ class XPermittedCrossDomainPolicies:
         Returns:
             None
         """
-        if scope["type"] != "http":
+        if scope["type"] != "http" or already_applied(scope, b'x-permitted-cross-domain-policies'):
             return await self.app(scope, receive, send)
 
         async def set_x_Permitted_Cross_Domain_Policies(message: Message):
@@ -1 +1,3 @@
-from .index import SecWeb as SecWeb
\ No newline at end of file
+from .index import SecWeb as SecWeb
+from .policy import Policy as Policy
+from .providers import register_header as register_header
@@ -0,0 +1,61 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from argparse import ArgumentParser
+from json import dumps, load
+from typing import Optional, Sequence
+
+from .offload import EXPORTERS, export
+from .scanner import EXTENSIONS, scan
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    The command line of Secweb.
+
+    Example :
+        python -m Secweb scan templates/ static/ --workers 8 --cache .secweb-scan.json --self https://example.com
+        python -m Secweb offload nginx --config secweb.json --key hsts --key xcto
+
+    Args:
+        argv (Sequence[str], optional): The arguments, sys.argv is used when it is None. Defaults to None.
+
+    Returns:
+        int: The exit status.
+    """
+    parser = ArgumentParser(prog='python -m Secweb', description='Secweb command line tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    scanner = commands.add_parser('scan', help='scan template and static trees and propose a Content-Security-Policy allowlist')
+    scanner.add_argument('paths', nargs='+', help='the directories or files to scan')
+    scanner.add_argument('--workers', type=int, default=None, help='the number of processes, 0 scans in this process (default: number of CPUs)')
+    scanner.add_argument('--cache', default=None, help='the incremental cache file, unchanged files are not scanned again')
+    scanner.add_argument('--self', dest='exclude', action='append', default=[], help="an origin of the site itself, covered by 'self' (repeatable)")
+    scanner.add_argument('--ext', action='append', default=None, help='a file extension to scan eg. .html (repeatable, default: templates, scripts and stylesheets)')
+    scanner.add_argument('--counts', action='store_true', help='print the occurrence count of every source')
+
+    offload = commands.add_parser('offload', help='export the constant headers of the SecWeb options as server or proxy configuration')
+    offload.add_argument('format', choices=list(EXPORTERS), help='the configuration format')
+    offload.add_argument('--config', default=None, help='a JSON file with the SecWeb options (default: the SecWeb defaults)')
+    offload.add_argument('--key', dest='keys', action='append', default=None, help='a SecWeb key to offload eg. hsts (repeatable, default: every constant header except cacheControl)')
+    offload.add_argument('--nonce', action='store_true', help='the CSP uses nonces or is report only and stays in Python')
+
+    args = parser.parse_args(argv)
+    if args.command == 'scan':
+        extensions = frozenset(ext if ext.startswith('.') else f'.{ext}' for ext in args.ext) if args.ext else EXTENSIONS
+        report = scan(args.paths, Workers=args.workers, Cache=args.cache, Exclude=args.exclude, extensions=extensions)
+        print(dumps(report if args.counts else report['policy'], indent=4))
+    elif args.command == 'offload':
+        Option = {}
+        if args.config is not None:
+            with open(args.config) as file:
+                Option = load(file)
+        print(export(Option, args.format, args.keys, args.nonce))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,277 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable, Mapping, Optional
+
+from .WsStrictTransportSecurity.WsStrictTransportSecurityMiddleware import WsHSTS
+from .XFrameOptions.XFrameOptionsMiddleware import XFrame
+from .CrossOriginEmbedderPolicy.CrossOriginEmbedderPolicyMiddleware import CrossOriginEmbedderPolicy
+from .CrossOriginOpenerPolicy.CrossOriginOpenerPolicyMiddleware import CrossOriginOpenerPolicy
+from .CrossOriginResourcePolicy.CrossOriginResourcePolicyMiddleware import CrossOriginResourcePolicy
+from .xXSSProtection.xXSSProtectionMiddleware import xXSSProtection
+from .StrictTransportSecurity.StrictTransportSecurityMiddleware import HSTS
+from .XPermittedCrossDomainPolicies.XPermittedCrossDomainPoliciesMiddleware import XPermittedCrossDomainPolicies
+from .XDownloadOptions.XDownloadOptionsMiddleware import XDownloadOptions
+from .XDNSPrefetchControl.XDNSPrefetchControlMiddleware import XDNSPrefetchControl, has_routes
+from .XContentTypeOptions.XContentTypeOptionsMiddleware import XContentTypeOptions
+from .ReferrerPolicy.ReferrerPolicyMiddleware import ReferrerPolicy
+from .OriginAgentCluster.OriginAgentClusterMiddleware import OriginAgentCluster
+from .ContentSecurityPolicy.ContentSecurityPolicyMiddleware import ContentSecurityPolicy
+from .CacheControl.CacheControlMiddleware import CacheControl
+from .policy import bounded_setdefault, freeze_key
+from .providers import HeaderProvider, ScopeTypeLiteral, registered_headers
+
+if TYPE_CHECKING:
+    from .index import SecWebOptions
+
+Header = tuple[bytes, bytes]
+HeaderTuple = tuple[Header, ...]
+CompiledHeaders = tuple[HeaderTuple, HeaderTuple]
+
+
+def __option_value__(header: str) -> Callable[[Any], str]:
+    """
+    Build a reader for the middlewares that keep their validated value in `Option`.
+
+    Args:
+        header (str): The legacy dictionary key used by the middleware.
+
+    Returns:
+        Callable: A function returning the header value of a middleware instance.
+    """
+    return lambda m: m.Option if isinstance(m.Option, str) else m.Option[header]
+
+
+HEADER_SOURCES: dict[str, tuple[str, type, Callable[[Any], str]]] = {
+    "xdo": ('X-Download-Options', XDownloadOptions, lambda m: 'noopen'),
+    "xcto": ('X-Content-Type-Options', XContentTypeOptions, lambda m: 'nosniff'),
+    "oac": ('Origin-Agent-Cluster', OriginAgentCluster, lambda m: '?1'),
+    "xss": ('X-XSS-Protection', xXSSProtection, lambda m: '0'),
+    "coop": ('Cross-Origin-Opener-Policy', CrossOriginOpenerPolicy, __option_value__('Cross-Origin-Opener-Policy')),
+    "coep": ('Cross-Origin-Embedder-Policy', CrossOriginEmbedderPolicy, __option_value__('Cross-Origin-Embedder-Policy')),
+    "corp": ('Cross-Origin-Resource-Policy', CrossOriginResourcePolicy, __option_value__('Cross-Origin-Resource-Policy')),
+    "referrer": ('Referrer-Policy', ReferrerPolicy, lambda m: m.policystring),
+    "xdns": ('X-DNS-Prefetch-Control', XDNSPrefetchControl, __option_value__('X-DNS-Prefetch-Control')),
+    "xcdp": ('X-Permitted-Cross-Domain-Policies', XPermittedCrossDomainPolicies, __option_value__('X-Permitted-Cross-Domain-Policies')),
+    "hsts": ('Strict-Transport-Security', HSTS, lambda m: m.PolicyString),
+    "wshsts": ('Strict-Transport-Security', WsHSTS, lambda m: m.PolicyString),
+    "xframe": ('X-Frame-Options', XFrame, __option_value__('X-Frame-Options')),
+    "cacheControl": ('Cache-Control', CacheControl, lambda m: m.policyString),
+    "csp": ('Content-Security-Policy', ContentSecurityPolicy, lambda m: m.PolicyString),
+}
+
+WEBSOCKET_SOURCES = frozenset(["wshsts", "csp", "corp", "xcto"])
+
+# Bounded by MAX_INTERNED, MultiTenant fills these tables at runtime
+__INTERNED_HEADERS__: dict[Header, Header] = {}
+__INTERNED_TUPLES__: dict[HeaderTuple, HeaderTuple] = {}
+__COMPILED_HEADER__: dict[tuple[str, Hashable], Header] = {}
+__COMPILED_HEADERS__: dict[Hashable, CompiledHeaders] = {}
+__COMPILED_PROVIDERS__: dict[tuple[CompiledHeaders, tuple[HeaderProvider, ...]], CompiledHeaders] = {}
+
+
+def intern_header(header: Header) -> Header:
+    """
+    Return the canonical instance of a header pair so equal pairs share one object.
+
+    Args:
+        header (Header): The (name, value) byte pair.
+
+    Returns:
+        Header: The interned header pair.
+    """
+    return bounded_setdefault(__INTERNED_HEADERS__, header, header)
+
+
+def intern_headers(headers: HeaderTuple) -> HeaderTuple:
+    """
+    Return the canonical instance of a header tuple, interning every pair in it.
+
+    Args:
+        headers (HeaderTuple): The header pairs.
+
+    Returns:
+        HeaderTuple: The interned header tuple.
+    """
+    headers = tuple(intern_header(header) for header in headers)
+    return bounded_setdefault(__INTERNED_TUPLES__, headers, headers)
+
+
+def compile_header(key: str, Option: Any = None) -> Header:
+    """
+    Validate the option of a single middleware and compile it to a raw ASGI header pair.
+
+    The result is memoized by the typed frozen option in a bounded process-wide table so equal options are only compiled once.
+
+    Args:
+        key (str): The SecWeb option key, eg. 'hsts'.
+        Option (Any, optional): The middleware option, None uses the middleware default.
+
+    Raises:
+        SyntaxError: If the key is unknown or the option is not valid for the middleware.
+
+    Returns:
+        Header: The lower-cased header name and the header value as latin-1 bytes.
+    """
+    if key not in HEADER_SOURCES:
+        raise SyntaxError(f'The option {key} cannot be compiled to a static header')
+
+    memo = (key, freeze_key(Option))
+    header = __COMPILED_HEADER__.get(memo)
+    if header is None:
+        name, cls, value = HEADER_SOURCES[key]
+        middleware = cls(None) if Option is None else cls(None, Option=Option)
+        header = bounded_setdefault(__COMPILED_HEADER__, memo, intern_header((name.lower().encode('latin-1'), value(middleware).encode('latin-1'))))
+    return header
+
+
+def compile_providers(kind: ScopeTypeLiteral, Providers: Optional[Iterable[HeaderProvider]] = None) -> tuple[HeaderTuple, tuple[HeaderProvider, ...]]:
+    """
+    Split the header providers of a scope type into the static headers compiled next to the built-in headers and the providers applied per response.
+
+    Static values with the 'append' conflict policy do not depend on the response and are compiled once. Static values with the 'keep'
+    or 'replace' policy need the headers set by the application and value functions need the scope, they are applied when the response starts.
+
+    Args:
+        kind (ScopeTypeLiteral): 'http' or 'websocket'.
+        Providers (Iterable[HeaderProvider], optional): The header providers, the providers registered with `register_header` are used when it is None. Defaults to None.
+
+    Returns:
+        tuple[HeaderTuple, tuple[HeaderProvider, ...]]: The interned static headers and the providers applied per response.
+    """
+    providers = [provider for provider in (registered_headers() if Providers is None else Providers) if kind in provider.types]
+    static = tuple((provider.name, provider.value) for provider in providers if provider.function is None and provider.conflict == 'append' and provider.value is not None)
+    return intern_headers(static), tuple(provider for provider in providers if provider.function is not None or provider.conflict != 'append')
+
+
+def __compile_sources__(Option: 'SecWebOptions') -> CompiledHeaders:
+    """
+    Compile the built-in headers of a SecWeb option dictionary, memoized by the typed frozen option in a bounded table.
+
+    Args:
+        Option (SecWebOptions): The SecWeb option dictionary.
+
+    Raises:
+        SyntaxError: If the options are not valid or contain 'clearSiteData' or 'xdns' routes.
+
+    Returns:
+        CompiledHeaders: The headers for HTTP responses and the headers for websocket accept messages.
+    """
+    memo = freeze_key(Option)
+    compiled = __COMPILED_HEADERS__.get(memo)
+    if compiled is not None:
+        return compiled
+
+    if isinstance(Option.get('clearSiteData'), Mapping):
+        raise SyntaxError('clearSiteData is route based and cannot be compiled to a static header')
+    if has_routes(Option.get('xdns')):
+        raise SyntaxError('xdns with routes is route based and cannot be compiled to a static header')
+
+    http: list[Header] = []
+    websocket: list[Header] = []
+    for key in HEADER_SOURCES:
+        val = Option.get(key)
+        if val is False:
+            continue
+
+        header = compile_header(key, val)
+        if key in WEBSOCKET_SOURCES:
+            websocket.append(header)
+        if key != 'wshsts':
+            http.append(header)
+
+    return bounded_setdefault(__COMPILED_HEADERS__, memo, (intern_headers(tuple(http)), intern_headers(tuple(websocket))))
+
+
+def __add_providers__(Option: 'SecWebOptions', compiled: CompiledHeaders) -> CompiledHeaders:
+    """
+    Append the static headers of the registered providers to the compiled built-in headers unless 'providers' is False.
+
+    Args:
+        Option (SecWebOptions): The SecWeb option dictionary.
+        compiled (CompiledHeaders): The compiled built-in headers.
+
+    Returns:
+        CompiledHeaders: The compiled headers with the static provider headers appended.
+    """
+    providers = registered_headers() if Option.get('providers') is not False else ()
+    if not providers:
+        return compiled
+
+    memo = (compiled, providers)
+    merged = __COMPILED_PROVIDERS__.get(memo)
+    if merged is None:
+        http, websocket = compiled
+        merged = bounded_setdefault(__COMPILED_PROVIDERS__, memo, (intern_headers(http + compile_providers('http', providers)[0]), intern_headers(websocket + compile_providers('websocket', providers)[0])))
+    return merged
+
+
+def compile_headers(Option: 'SecWebOptions') -> CompiledHeaders:
+    """
+    Compile a SecWeb option dictionary into the static headers it emits.
+
+    Missing keys use the middleware defaults exactly like the SecWeb class does and the static values of the registered header providers
+    with the 'append' conflict policy are added after the built-in headers unless 'providers' is False. Nonce based CSP, the route based
+    Clear-Site-Data and per-route X-DNS-Prefetch-Control headers and the providers applied per response depend on the request and are not supported here. The result is
+    memoized by the typed frozen option and the registered providers in bounded tables so tenants and sub-apps sharing a policy share the compiled tuples.
+
+    Args:
+        Option (SecWebOptions): The SecWeb option dictionary.
+
+    Raises:
+        SyntaxError: If the options are not valid or contain 'clearSiteData' or 'xdns' routes.
+
+    Returns:
+        CompiledHeaders: The headers for HTTP responses and the headers for websocket accept messages, the websocket
+            headers only contain 'wshsts', 'csp', 'corp', 'xcto' and the providers set on the websocket handshake.
+    """
+    return __add_providers__(Option, __compile_sources__(Option))
+
+
+def compile_websocket_headers(Option: 'SecWebOptions') -> HeaderTuple:
+    """
+    Compile only the headers of a SecWeb option dictionary that apply to websocket accept messages.
+
+    The static values of the registered header providers set on the websocket handshake with the 'append' conflict policy are added
+    unless 'providers' is False.
+
+    Args:
+        Option (SecWebOptions): The SecWeb option dictionary.
+
+    Raises:
+        SyntaxError: If the options are not valid.
+
+    Returns:
+        HeaderTuple: The interned websocket headers.
+    """
+    headers = tuple(compile_header(key, Option.get(key)) for key in HEADER_SOURCES if key in WEBSOCKET_SOURCES and Option.get(key) is not False)
+    if Option.get('providers') is not False:
+        headers += compile_providers('websocket')[0]
+    return intern_headers(headers)
+
+
+def compile_many(Options: Mapping[str, 'SecWebOptions'], Workers: int = 0) -> dict[str, CompiledHeaders]:
+    """
+    Compile many SecWeb option dictionaries, optionally across a process pool.
+
+    The workers only compile the built-in headers, the registered providers of this process are added afterwards.
+
+    Args:
+        Options (Mapping[str, SecWebOptions]): The option dictionaries keyed by name.
+        Workers (int, optional): The number of worker processes, 0 or 1 compiles in this process. (Default: 0)
+
+    Returns:
+        dict[str, CompiledHeaders]: The compiled headers keyed by name, with every header interned.
+    """
+    keys = list(Options.keys())
+    if Workers > 1 and len(keys) > 1:
+        with ProcessPoolExecutor(max_workers=Workers) as pool:
+            compiled = [__add_providers__(Options[key], sources) for key, sources in zip(keys, pool.map(__compile_sources__, [Options[key] for key in keys], chunksize=max(1, len(keys) // (Workers * 4))))]
+    else:
+        compiled = [compile_headers(Options[key]) for key in keys]
+
+    return {key: (intern_headers(http), intern_headers(websocket)) for key, (http, websocket) in zip(keys, compiled)}
@@ -0,0 +1,105 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from typing import Optional
+
+from .asgi import Message
+
+
+class MutableHeaders:
+    ''' MutableHeaders class edits the raw header list of an ASGI message in place.
+
+    It only has the operations the Secweb middlewares use and works on any ASGI framework, the header names are stored lower-cased as latin-1 bytes.
+
+    Example :
+        MutableHeaders(scope=message).append('X-Content-Type-Options', 'nosniff')
+
+    Parameter :
+        scope (Message): The ASGI message, eg. the http.response.start message.
+
+    '''
+    __slots__ = ('raw',)
+
+    def __init__(self, scope: Message):
+        """
+        Initializes the class, the headers of the message are converted to a list when they are another iterable.
+
+        Args:
+            scope (Message): The ASGI message.
+
+        Returns:
+            None
+        """
+        headers = scope.get("headers")
+        if not isinstance(headers, list):
+            headers = scope["headers"] = list(headers or ())
+        self.raw: list[tuple[bytes, bytes]] = headers
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Returns the first value of the header.
+
+        Args:
+            key (str): The header name.
+            default (str, optional): The value returned when the header is missing. Defaults to None.
+
+        Returns:
+            Optional[str]: The header value.
+        """
+        name = key.lower().encode('latin-1')
+        for item, value in self.raw:
+            if item == name:
+                return value.decode('latin-1')
+        return default
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __setitem__(self, key: str, value: str) -> None:
+        """
+        Sets the header, replacing the first entry in place and removing the duplicates.
+
+        Args:
+            key (str): The header name.
+            value (str): The header value.
+
+        Returns:
+            None
+        """
+        header = (key.lower().encode('latin-1'), value.encode('latin-1'))
+        found = [idx for idx, (item, _) in enumerate(self.raw) if item == header[0]]
+        for idx in reversed(found[1:]):
+            del self.raw[idx]
+        if found:
+            self.raw[found[0]] = header
+        else:
+            self.raw.append(header)
+
+    def append(self, key: str, value: str) -> None:
+        """
+        Appends the header, keeping the existing entries with the same name.
+
+        Args:
+            key (str): The header name.
+            value (str): The header value.
+
+        Returns:
+            None
+        """
+        self.raw.append((key.lower().encode('latin-1'), value.encode('latin-1')))
+
+    def add_vary_header(self, vary: str) -> None:
+        """
+        Adds the header names to the Vary header of the response.
+
+        Args:
+            vary (str): The comma separated header names.
+
+        Returns:
+            None
+        """
+        existing = self.get('vary')
+        self['vary'] = vary if existing is None else f'{existing}, {vary}'
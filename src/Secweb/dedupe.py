@@ -0,0 +1,78 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from .asgi import Scope
+
+APPLIED = "secweb.applied"
+
+
+def already_applied(scope: Scope, header: bytes) -> bool:
+    """
+    Check if an outer Secweb layer already handles the header for this request and mark it otherwise.
+
+    The marker is a set of lower-cased header names kept in the scope, mounted sub-apps get the same scope so their
+    Secweb layers see the headers of the outer app and pass straight through.
+
+    Args:
+        scope (Scope): The scope of the request.
+        header (bytes): The lower-cased header name.
+
+    Returns:
+        bool: True if an outer layer already handles the header.
+    """
+    applied = scope.get(APPLIED)
+    if applied is None:
+        scope[APPLIED] = {header}
+        return False
+    if header in applied:
+        return True
+    applied.add(header)
+    return False
+
+
+def unapplied_headers(scope: Scope, headers: tuple[tuple[bytes, bytes], ...]) -> tuple[tuple[bytes, bytes], ...]:
+    """
+    Filter out the headers an outer Secweb layer already handles and mark the remaining ones.
+
+    Args:
+        scope (Scope): The scope of the request.
+        headers (tuple[tuple[bytes, bytes], ...]): The compiled headers of the layer.
+
+    Returns:
+        tuple[tuple[bytes, bytes], ...]: The headers this layer still has to set.
+    """
+    applied = scope.get(APPLIED)
+    if applied is None:
+        scope[APPLIED] = {name for name, _ in headers}
+        return headers
+    if applied.isdisjoint([name for name, _ in headers]):
+        applied.update([name for name, _ in headers])
+        return headers
+    headers = tuple([header for header in headers if header[0] not in applied])
+    applied.update([name for name, _ in headers])
+    return headers
+
+
+def claimed_headers(scope: Scope, headers: tuple[tuple[bytes, bytes], ...], names: frozenset[bytes]) -> tuple[tuple[bytes, bytes], ...]:
+    """
+    Filter out the headers an outer Secweb layer already handles and mark every header name this layer owns, including the ones it prunes.
+
+    Args:
+        scope (Scope): The scope of the request.
+        headers (tuple[tuple[bytes, bytes], ...]): The compiled headers of the layer for this request.
+        names (frozenset[bytes]): The lower-cased names of all the headers the layer owns.
+
+    Returns:
+        tuple[tuple[bytes, bytes], ...]: The headers this layer still has to set.
+    """
+    applied = scope.get(APPLIED)
+    if applied is None:
+        scope[APPLIED] = set(names)
+        return headers
+    if not applied.isdisjoint(names):
+        headers = tuple([header for header in headers if header[0] not in applied])
+    applied.update(names)
+    return headers
@@ -4,10 +4,12 @@
 
   Copyright 2021-2026, Motagamwala Taha Arif Ali '''
 
-from typing import Any, Literal, TypedDict, Union
-from starlette.applications import Starlette
+from typing import TYPE_CHECKING, Any, Literal, Mapping, TypedDict, Union
 
-from .WsStrictTransportSecurity.WsStrictTransportSecurityMiddleware import WsHSTS, WsHSTSOptions
+from .asgi import ASGIApp
+
+from .WsStrictTransportSecurity.WsStrictTransportSecurityMiddleware import WsHSTSOptions
+from .WsSecurityHeaders.WsSecurityHeadersMiddleware import WsSecurityHeaders
 from .XFrameOptions.XFrameOptionsMiddleware import XFrame, XFrameOptions
 from .CrossOriginEmbedderPolicy.CrossOriginEmbedderPolicyMiddleware import CrossOriginEmbedderPolicy, CrossOriginEmbedderPolicyOptions
 from .CrossOriginOpenerPolicy.CrossOriginOpenerPolicyMiddleware import CrossOriginOpenerPolicy, CrossOriginOpenerPolicyOptions
@@ -16,14 +18,44 @@ from .xXSSProtection.xXSSProtectionMiddleware import xXSSProtection
 from .StrictTransportSecurity.StrictTransportSecurityMiddleware import HSTS, HSTSOptions
 from .XPermittedCrossDomainPolicies.XPermittedCrossDomainPoliciesMiddleware import XPermittedCrossDomainPolicies, XPermittedCrossDomainPoliciesOptions
 from .XDownloadOptions.XDownloadOptionsMiddleware import XDownloadOptions
-from .XDNSPrefetchControl.XDNSPrefetchControlMiddleware import XDNSPrefetchControl, XDNSPrefetchControlOptions
+from .XDNSPrefetchControl.XDNSPrefetchControlMiddleware import XDNSPrefetchControl, XDNSPrefetchControlOptions, has_routes
 from .XContentTypeOptions.XContentTypeOptionsMiddleware import XContentTypeOptions
 from .ReferrerPolicy.ReferrerPolicyMiddleware import ReferrerPolicy, ReferrerPolicyOptions
 from .OriginAgentCluster.OriginAgentClusterMiddleware import OriginAgentCluster
 from .ContentSecurityPolicy.ContentSecurityPolicyMiddleware import ContentSecurityPolicy, ContentSecurityPolicyOptions
 from .ClearSiteData.ClearSiteDataMiddleware import ClearSiteData, ClearSiteDataOptions
 from .CacheControl.CacheControlMiddleware import CacheControl, CacheControlOptions
-
+from .ClientHints.ClientHintsMiddleware import ClientHints, ClientHintsOptions
+from .SubresourceIntegrity.SubresourceIntegrityMiddleware import IntegrityPolicy, IntegrityPolicyOptions
+from .StaticHeaders.StaticHeadersMiddleware import StaticHeaders
+from .compiler import HEADER_SOURCES
+from .providers import registered_headers
+from .Bypass.BypassMiddleware import Bypass, BypassOptions
+from .Offload.OffloadMiddleware import Offload, OffloadOptions
+from .ServerTiming.ServerTimingMiddleware import ServerTiming, ServerTimingOptions, TimingProbe
+from .offload import offload_headers, offload_keys
+
+if TYPE_CHECKING:
+    from starlette.applications import Starlette
+
+
+MIDDLEWARE_REGISTRY: dict[str, tuple[type, bool]] = {
+    "xdo": (XDownloadOptions, True),
+    "xcto": (XContentTypeOptions, True),
+    "oac": (OriginAgentCluster, True),
+    "xss": (xXSSProtection, True),
+    "coop": (CrossOriginOpenerPolicy, True),
+    "coep": (CrossOriginEmbedderPolicy, True),
+    "corp": (CrossOriginResourcePolicy, True),
+    "referrer": (ReferrerPolicy, True),
+    "xdns": (XDNSPrefetchControl, True),
+    "xcdp": (XPermittedCrossDomainPolicies, True),
+    "hsts": (HSTS, True),
+    "xframe": (XFrame, True),
+    "cacheControl": (CacheControl, True),
+    "clientHints": (ClientHints, False),
+    "integrityPolicy": (IntegrityPolicy, False),
+}
 
 SecWebOptions = TypedDict(
     'SecWebOptions',
@@ -40,15 +72,109 @@ SecWebOptions = TypedDict(
         'xframe': Union[Literal[False], XFrameOptions],
         'clearSiteData': Union[Literal[False], ClearSiteDataOptions],
         'cacheControl': Union[Literal[False], CacheControlOptions],
+        'clientHints': Union[Literal[False], ClientHintsOptions],
+        'integrityPolicy': Union[Literal[False], IntegrityPolicyOptions],
         'xcto': Literal[False],
         'xdo': Literal[False],
         'xss': Literal[False],
-        'oac': Literal[False]
+        'oac': Literal[False],
+        'providers': Literal[False],
+        'bypass': BypassOptions,
+        'offload': OffloadOptions,
+        'serverTiming': ServerTimingOptions
     },
     total=False
 )
 
 
+def __layers__(
+    Option: SecWebOptions,
+    Routes: list[str],
+    script_nonce: bool,
+    style_nonce: bool,
+    report_only: bool
+) -> list[tuple[type, tuple[Any, ...], dict[str, Any]]]:
+    """
+    Lists the middlewares selected by the SecWeb options from the innermost to the outermost layer.
+
+    Args:
+        Option (SecWebOptions): The SecWeb options.
+        Routes (list[str]): The routes for the Clear-Site-Data header.
+        script_nonce (bool): Whether to include script nonce.
+        style_nonce (bool): Whether to include style nonce.
+        report_only (bool): Whether to use Content-Security-Policy-Report-Only header instead of Content-Security-Policy.
+
+    Returns:
+        list: The middleware class with its positional and keyword arguments for every layer.
+    """
+    layers: list[tuple[type, tuple[Any, ...], dict[str, Any]]] = []
+    offload_val = Option.get("offload")
+    nonce = script_nonce or style_nonce or report_only
+    offloaded = offload_keys(Option, offload_val.get("keys"), nonce) if offload_val is not None else frozenset()
+
+    # The constant headers and the providers share one compiled layer, innermost so ClientHints can claim Cache-Control for Save-Data clients
+    xdns_val = Option.get("xdns")
+    routed = {'xdns'} if has_routes(xdns_val) else set()
+    static_val: SecWebOptions = {key: False if key in offloaded or key in routed or key in ('csp', 'wshsts') else Option.get(key) for key in HEADER_SOURCES}
+    if Option.get("providers") is False:
+        static_val['providers'] = False
+    if any(static_val[key] is not False for key in HEADER_SOURCES) or (static_val.get('providers') is not False and registered_headers()):
+        layers.append((StaticHeaders, (static_val,), {}))
+    if routed:
+        layers.append((XDNSPrefetchControl, (xdns_val,), {}))
+
+    for key, (cls, default) in MIDDLEWARE_REGISTRY.items():
+        val = Option.get(key)
+        if val is False or key in offloaded or key in HEADER_SOURCES:
+            continue
+
+        if val is not None:
+            layers.append((cls, (val,), {}))
+        elif default:
+            layers.append((cls, (), {}))
+
+    csp_val = Option.get("csp")
+    if csp_val is not False and "csp" not in offloaded:
+        csp_args: dict[str, Any] = {
+            "script_nonce": script_nonce,
+            "style_nonce": style_nonce,
+            "report_only": report_only,
+        }
+        if isinstance(csp_val, Mapping):
+            csp_args.update([("Option", csp_val)])
+        layers.append((ContentSecurityPolicy, (), csp_args))
+
+    csd_val = Option.get("clearSiteData")
+    if csd_val is not False:
+        if isinstance(csd_val, Mapping):
+            layers.append((ClearSiteData, (csd_val,), {"Routes": Routes}))
+        elif len(Routes) > 0:
+            layers.append((ClearSiteData, (), {"Routes": Routes}))
+
+    ws_val: SecWebOptions = {key: Option[key] for key in ('wshsts', 'csp', 'corp', 'xcto', 'providers') if key in Option}
+    if script_nonce or style_nonce or report_only:
+        ws_val['csp'] = False
+    if Option.get("wshsts") is False:
+        # 'wshsts': False keeps its meaning of turning off every built-in header of the websocket handshake
+        ws_val['csp'] = ws_val['corp'] = ws_val['xcto'] = False
+    if any(ws_val.get(key) is not False for key in ('wshsts', 'csp', 'corp', 'xcto')) or (ws_val.get('providers') is not False and registered_headers()):
+        layers.append((WsSecurityHeaders, (ws_val,), {}))
+
+    if offloaded:
+        layers.append((Offload, (offload_val,), {"Headers": offload_headers(Option, offloaded, nonce)}))
+
+    timing_val = Option.get("serverTiming")
+    if timing_val:
+        layers.insert(0, (TimingProbe, (), {}))
+        layers.append((ServerTiming, (), dict(timing_val)))
+
+    bypass_val = Option.get("bypass")
+    if bypass_val:
+        layers.append((Bypass, (bypass_val,), {}))
+
+    return layers
+
+
 class SecWeb:
     """This Class is used for initializing all the middlewares CSP, COOP, etc. you can also activate/deactivate any of the middlewares by supplying them boolean values in the Option parameter.
 
@@ -80,13 +206,13 @@ class SecWeb:
 
         'referrer' for ReferrerPolicy
 
-        'xdns' for XDNSPrefetchControl
+        'xdns' for XDNSPrefetchControl, {'X-DNS-Prefetch-Control': 'off', 'routes': {'on': ['/docs/{page:path}']}} sets it per route from its own layer
 
         'xcdp' for XPermittedCrossDomainPolicies
 
         'hsts' for HSTS/StrictTransportSecurity
 
-        'wshsts' for HSTS/StrictTransportSecurity for websockets
+        'wshsts' for HSTS/StrictTransportSecurity for websockets, the websocket handshake also gets the 'csp', 'corp' and 'xcto' headers from one outermost layer, False turns off all of them
 
         'xframe' for XFrame
 
@@ -94,6 +220,10 @@ class SecWeb:
 
         'cacheControl' for Cache-Control
 
+        'clientHints' for Accept-CH/Critical-CH client hints, not set unless a value is given
+
+        'integrityPolicy' for Integrity-Policy, not set unless a value is given
+
         'xcto' for X-Content-Type-Options
 
         'xdo' for X-Download-Options
@@ -102,13 +232,21 @@ class SecWeb:
 
         'oac' for Origin-Agent-Cluster
 
+        'providers' for the custom headers registered with register_header, their static values are compiled with the constant built-in headers into one layer
+
+        'bypass' for the paths and prefixes that skip every Secweb middleware eg. {'paths': ['/healthz'], 'prefixes': ['/metrics']}
+
+        'offload' for the constant headers set by the server or the proxy instead, eg. {'keys': ['hsts', 'xcto'], 'probe': 'http://127.0.0.1:8080/healthz'}
+
+        'serverTiming' for Server-Timing and Timing-Allow-Origin, the ServerTiming arguments eg. {'SampleRate': 0.01, 'TimingAllowOrigin': ['https://rum.example.com']}
+
     This Values are for the Option parameter
     
     """
 
     def __init__(
         self,
-        app: Starlette,
+        app: 'Starlette',
         Option: SecWebOptions = {},
         Routes: list[str] = [],
         script_nonce: bool = False,
@@ -120,7 +258,7 @@ class SecWeb:
         Initializes an instance of the class.
 
         Args:
-            app: The application object.
+            app: The application object, any app with an add_middleware method like Starlette or FastAPI.
             Option: A dictionary of options (default: {}).
             Routes: A list of routes for the Clear-Site-Data header (default: []).
             script_nonce: Whether to include script nonce (default: False).
@@ -130,48 +268,42 @@ class SecWeb:
         Returns:
             None
         """
-        
-        MIDDLEWARE_REGISTRY: dict[str, tuple[type, bool]] = {
-            "xdo": (XDownloadOptions, True),
-            "xcto": (XContentTypeOptions, True),
-            "oac": (OriginAgentCluster, True),
-            "xss": (xXSSProtection, True),
-            "coop": (CrossOriginOpenerPolicy, True),
-            "coep": (CrossOriginEmbedderPolicy, True),
-            "corp": (CrossOriginResourcePolicy, True),
-            "referrer": (ReferrerPolicy, True),
-            "xdns": (XDNSPrefetchControl, True),
-            "xcdp": (XPermittedCrossDomainPolicies, True),
-            "hsts": (HSTS, True),
-            "wshsts": (WsHSTS, True),
-            "xframe": (XFrame, True),
-            "cacheControl": (CacheControl, True),
-        }
+        for cls, args, kwargs in __layers__(Option, Routes, script_nonce, style_nonce, report_only):
+            app.add_middleware(cls, *args, **kwargs)
+
+    @staticmethod
+    def wrap(
+        app: ASGIApp,
+        Option: SecWebOptions = {},
+        Routes: list[str] = [],
+        script_nonce: bool = False,
+        style_nonce: bool = False,
+        report_only: bool = False
+    ) -> ASGIApp:
+
+        """
+        Wraps any ASGI application in the Secweb middlewares, eg. Quart, Litestar, Django ASGI or a bare ASGI callable.
+
+        The middlewares are built once around the application with the same options and order as the SecWeb class,
+        there is no add_middleware call and no rebuild of a middleware stack.
+
+        Example :
+            application = SecWeb.wrap(get_asgi_application(), Option={'hsts': {'max-age': 63072000}})
 
-        for key, (cls, default) in MIDDLEWARE_REGISTRY.items():
-            val = Option.get(key)
-            if val is False:
-                continue
-            
-            if val is not None:
-                app.add_middleware(cls, val)
-            elif default:
-                app.add_middleware(cls)
-
-        csp_val = Option.get("csp")
-        if csp_val is not False:
-            csp_args: dict[str, Any] = {
-                "script_nonce": script_nonce, 
-                "style_nonce": style_nonce, 
-                "report_only": report_only,
-            }
-            if isinstance(csp_val, dict):
-                csp_args.update([("Option", csp_val)])
-            app.add_middleware(ContentSecurityPolicy, **csp_args)
-
-        csd_val = Option.get("clearSiteData")
-        if csd_val is not False:
-            if isinstance(csd_val, dict):
-                app.add_middleware(ClearSiteData, csd_val, Routes=Routes)
-            elif len(Routes) > 0:
-                app.add_middleware(ClearSiteData, Routes=Routes)
+        Args:
+            app: The ASGI application.
+            Option: A dictionary of options (default: {}).
+            Routes: A list of routes for the Clear-Site-Data header (default: []).
+            script_nonce: Whether to include script nonce (default: False).
+            style_nonce: Whether to include style nonce (default: False).
+            report_only: Whether to use Content-Security-Policy-Report-Only header instead of Content-Security-Policy (default: False).
+
+        Raises:
+            SyntaxError: If the options are not valid.
+
+        Returns:
+            ASGIApp: The outermost Secweb middleware.
+        """
+        for cls, args, kwargs in __layers__(Option, Routes, script_nonce, style_nonce, report_only):
+            app = cls(app, *args, **kwargs)
+        return app
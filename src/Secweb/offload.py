@@ -0,0 +1,159 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from json import dumps
+from shlex import quote
+from typing import TYPE_CHECKING, Iterable, Literal, Optional
+
+from .XDNSPrefetchControl.XDNSPrefetchControlMiddleware import has_routes
+from .compiler import HEADER_SOURCES, HeaderTuple, compile_headers
+
+if TYPE_CHECKING:
+    from .index import SecWebOptions
+
+OffloadFormat = Literal['uvicorn', 'nginx', 'envoy']
+
+OFFLOADABLE = tuple(key for key in HEADER_SOURCES if key != 'wshsts')
+# Cache-Control is a per-route policy, it is only offloaded when asked for by name
+DEFAULT_OFFLOADED = tuple(key for key in OFFLOADABLE if key != 'cacheControl')
+
+
+def offload_keys(Option: 'SecWebOptions', Keys: Optional[Iterable[str]] = None, nonce: bool = False) -> frozenset[str]:
+    """
+    Select the SecWeb option keys whose headers are constant and can be set by the server or the proxy.
+
+    Args:
+        Option (SecWebOptions): The SecWeb options.
+        Keys (Iterable[str], optional): The keys to offload, None offloads every constant header that is not turned off except 'cacheControl'. Defaults to None.
+        nonce (bool, optional): Whether the CSP uses nonces or is report only, the CSP then changes per request and is never offloaded. Defaults to False.
+
+    Raises:
+        SyntaxError: If a key is not a constant header, the CSP is requested with nonces or the X-DNS-Prefetch-Control with routes.
+
+    Returns:
+        frozenset[str]: The offloaded keys.
+    """
+    routed = has_routes(Option.get('xdns'))
+    if Keys is None:
+        return frozenset(key for key in DEFAULT_OFFLOADED if Option.get(key) is not False and not (key == 'csp' and nonce) and not (key == 'xdns' and routed))
+
+    keys = frozenset(Keys)
+    if keys - set(OFFLOADABLE):
+        raise SyntaxError(f'Only the constant headers can be offloaded, {sorted(keys - set(OFFLOADABLE))} are not in {list(OFFLOADABLE)}')
+    if 'csp' in keys and nonce:
+        raise SyntaxError('A Content-Security-Policy with nonces or report_only cannot be offloaded')
+    if 'xdns' in keys and routed:
+        raise SyntaxError('An X-DNS-Prefetch-Control with routes cannot be offloaded')
+    return frozenset(key for key in keys if Option.get(key) is not False)
+
+
+def offload_headers(Option: 'SecWebOptions', Keys: Optional[Iterable[str]] = None, nonce: bool = False) -> list[tuple[str, str]]:
+    """
+    Compile the constant headers of the SecWeb options for the server or the proxy.
+
+    Args:
+        Option (SecWebOptions): The SecWeb options.
+        Keys (Iterable[str], optional): The keys to offload, None offloads every constant header that is not turned off except 'cacheControl'. Defaults to None.
+        nonce (bool, optional): Whether the CSP uses nonces or is report only. Defaults to False.
+
+    Raises:
+        SyntaxError: If the options are not valid.
+
+    Returns:
+        list[tuple[str, str]]: The header names and values, eg. [('Strict-Transport-Security', 'max-age=31536000; includeSubDomains')].
+    """
+    keys = offload_keys(Option, Keys, nonce)
+    compiled = compile_headers({**{key: Option.get(key) if key in keys else False for key in HEADER_SOURCES}, 'providers': False})[0]
+    names = {HEADER_SOURCES[key][0].lower().encode('latin-1'): HEADER_SOURCES[key][0] for key in keys}
+    return [(names[name], value.decode('latin-1')) for name, value in compiled]
+
+
+def encode_headers(headers: list[tuple[str, str]]) -> HeaderTuple:
+    """
+    Encode offloaded headers to raw ASGI header pairs.
+
+    Args:
+        headers (list[tuple[str, str]]): The header names and values.
+
+    Returns:
+        HeaderTuple: The lower-cased names and the values as latin-1 bytes.
+    """
+    return tuple((name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers)
+
+
+def export_uvicorn(headers: list[tuple[str, str]]) -> str:
+    """
+    Format the headers as uvicorn --header arguments, the same pairs can be passed to uvicorn.run(headers=...).
+
+    Args:
+        headers (list[tuple[str, str]]): The header names and values.
+
+    Returns:
+        str: The command line arguments.
+    """
+    return ' '.join(f'--header {quote(f"{name}:{value}")}' for name, value in headers)
+
+
+def export_nginx(headers: list[tuple[str, str]]) -> str:
+    """
+    Format the headers as nginx add_header directives, 'always' also sets them on error responses.
+
+    Args:
+        headers (list[tuple[str, str]]): The header names and values.
+
+    Returns:
+        str: The directives, one per line.
+    """
+    return '\n'.join('add_header {} "{}" always;'.format(name, value.replace('\\', '\\\\').replace('"', '\\"')) for name, value in headers)
+
+
+def export_envoy(headers: list[tuple[str, str]]) -> str:
+    """
+    Format the headers as an Envoy response_headers_to_add block for a route or virtual host.
+
+    Args:
+        headers (list[tuple[str, str]]): The header names and values.
+
+    Returns:
+        str: The YAML block.
+    """
+    lines = ['response_headers_to_add:']
+    for name, value in headers:
+        lines += [f'- header: {{key: {dumps(name)}, value: {dumps(value)}}}', '  append_action: OVERWRITE_IF_EXISTS_OR_ADD']
+    return '\n'.join(lines)
+
+
+EXPORTERS = {
+    'uvicorn': export_uvicorn,
+    'nginx': export_nginx,
+    'envoy': export_envoy,
+}
+
+
+def export(Option: 'SecWebOptions', Format: OffloadFormat, Keys: Optional[Iterable[str]] = None, nonce: bool = False) -> str:
+    """
+    Export the constant headers of the SecWeb options as server or proxy configuration.
+
+    Hypercorn has no setting for default response headers, put nginx or Envoy in front of it.
+
+    Example :
+        print(export({'hsts': {'max-age': 63072000, 'preload': True}}, 'nginx'))
+
+    Args:
+        Option (SecWebOptions): The SecWeb options.
+        Format (OffloadFormat): 'uvicorn', 'nginx' or 'envoy'.
+        Keys (Iterable[str], optional): The keys to offload, None offloads every constant header that is not turned off except 'cacheControl'. Defaults to None.
+        nonce (bool, optional): Whether the CSP uses nonces or is report only. Defaults to False.
+
+    Raises:
+        SyntaxError: If the format or the options are not valid.
+
+    Returns:
+        str: The configuration snippet.
+    """
+    if Format not in EXPORTERS:
+        raise SyntaxError(f'The offload formats are {list(EXPORTERS)}, hypercorn has no default response headers setting')
+    return EXPORTERS[Format](offload_headers(Option, Keys, nonce))
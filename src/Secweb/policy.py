@@ -0,0 +1,187 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from threading import Lock
+from typing import Any, Hashable, Iterator, Mapping, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+MAX_INTERNED = 4096
+
+__TABLE_LOCK__ = Lock()
+
+
+def bounded_setdefault(table: dict[K, V], key: K, value: V, limit: int = MAX_INTERNED) -> V:
+    """
+    Insert a value into a process-wide table unless the key is already there, evicting the oldest entries past the limit.
+
+    The interning and memo tables are filled at runtime by MultiTenant and other per-request policies, the limit keeps them bounded.
+    An evicted entry is only compiled or interned again on its next use.
+
+    Args:
+        table (dict): The table.
+        key (Hashable): The key.
+        value (Any): The value stored when the key is missing.
+        limit (int, optional): The maximum number of entries. Defaults to MAX_INTERNED.
+
+    Returns:
+        Any: The value stored for the key.
+    """
+    with __TABLE_LOCK__:
+        stored = table.setdefault(key, value)
+        while len(table) > limit:
+            del table[next(iter(table))]
+    return stored
+
+
+def freeze_key(value: Any) -> Hashable:
+    """
+    Convert an option value into a hashable key that keeps the type of the scalars.
+
+    True == 1 == 1.0 in Python but the middlewares test options with `is True`, the key keeps them apart so a memo never returns
+    the header compiled for an equal value of another type.
+
+    Args:
+        value (Any): The option value.
+
+    Returns:
+        Hashable: The typed key.
+    """
+    if isinstance(value, Mapping):
+        return Policy(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_key(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze_key(item) for item in value)
+    if isinstance(value, (bool, int, float)):
+        return (type(value), value)
+    return value
+
+
+def freeze(value: Any) -> Hashable:
+    """
+    Convert an option value into an immutable and hashable value.
+
+    Args:
+        value (Any): The option value, dictionaries become Policy objects, lists and tuples become tuples and sets become frozensets.
+
+    Returns:
+        Hashable: The frozen value.
+    """
+    if isinstance(value, Mapping):
+        return Policy(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    return value
+
+
+def __policy_key__(Option: Mapping[str, Any]) -> tuple[tuple[str, Hashable], ...]:
+    """
+    Build the typed key of an option dictionary, sorted by name so the same policy written in another key order is the same key.
+
+    Args:
+        Option (Mapping[str, Any]): The option dictionary.
+
+    Returns:
+        tuple[tuple[str, Hashable], ...]: The typed items sorted by name.
+    """
+    return tuple(sorted(((name, freeze_key(value)) for name, value in Option.items()), key=lambda item: item[0]))
+
+
+__INTERNED_POLICIES__: dict[tuple[tuple[str, Hashable], ...], 'Policy'] = {}
+"""The interned policies keyed by their typed items sorted by name, bounded by MAX_INTERNED."""
+
+
+class Policy(Mapping[str, Any]):
+    ''' Policy class is a frozen and hashable option dictionary.
+
+    Equal policies are interned in a process-wide table so they are the same object and their compiled headers are shared.
+    Equality and hashing keep the type of the scalars, Policy({'preload': 1}) and Policy({'preload': True}) are different policies, and ignore
+    the order of the keys like a dictionary does. Equal policies written in another key order are interned as the first one, the key order
+    is only kept for iteration and serialization.
+    A Policy can be used anywhere an option dictionary is accepted.
+
+    Example :
+        Policy({'max-age': 31536000, 'includeSubDomains': True, 'preload': False})
+
+    Parameter :
+        Option (Mapping[str, Any], optional): The option dictionary to freeze, nested dictionaries and lists are frozen too. Defaults to {}.
+
+    '''
+    __slots__ = ('items_', 'key_', 'index_', 'hash_')
+
+    items_: tuple[tuple[str, Hashable], ...]
+    key_: tuple[tuple[str, Hashable], ...]
+    index_: dict[str, Hashable]
+    hash_: int
+
+    def __new__(cls, Option: Mapping[str, Any] = {}) -> 'Policy':
+        """
+        Returns the interned policy equal to the option dictionary.
+
+        Parameters:
+            Option (Mapping[str, Any], optional): The option dictionary to freeze. Defaults to {}.
+
+        Returns:
+            Policy: The interned policy.
+        """
+        if isinstance(Option, Policy):
+            return Option
+
+        key = __policy_key__(Option)
+        policy = __INTERNED_POLICIES__.get(key)
+        if policy is None:
+            items = tuple((name, freeze(value)) for name, value in Option.items())
+            policy = object.__new__(cls)
+            object.__setattr__(policy, 'items_', items)
+            object.__setattr__(policy, 'key_', key)
+            object.__setattr__(policy, 'index_', dict(items))
+            object.__setattr__(policy, 'hash_', hash(key))
+            policy = bounded_setdefault(__INTERNED_POLICIES__, key, policy)
+        return policy
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError('Policy objects are immutable')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError('Policy objects are immutable')
+
+    def __getitem__(self, key: str) -> Any:
+        return self.index_[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index_)
+
+    def __len__(self) -> int:
+        return len(self.items_)
+
+    def __hash__(self) -> int:
+        return self.hash_
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Policy):
+            return self is other or self.key_ == other.key_
+        if isinstance(other, Mapping):
+            return self.key_ == __policy_key__(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'Policy({self.index_!r})'
+
+    def __reduce__(self) -> tuple[type, tuple[dict[str, Hashable]]]:
+        return (Policy, (self.index_,))
+
+    def copy(self) -> dict[str, Any]:
+        """
+        Returns a mutable shallow copy of the policy.
+
+        Returns:
+            dict[str, Any]: The option dictionary.
+        """
+        return dict(self.items_)
@@ -0,0 +1,173 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from re import compile
+from typing import Callable, Iterable, Literal, Optional, Union
+from .asgi import Scope
+
+ScopeTypeLiteral = Literal['http', 'websocket']
+ConflictLiteral = Literal['keep', 'replace', 'append']
+ValueFunction = Callable[[Scope], Optional[str]]
+
+TOKEN_RE = compile(r"^[!#$%&'*+\-.^_`|~0-9A-Za-z]+$")
+
+__PROVIDERS__: dict[bytes, 'HeaderProvider'] = {}
+
+
+class HeaderProvider:
+    ''' HeaderProvider class describes a custom header emitted by Secweb next to the built-in headers.
+
+    A static value is compiled once, a value function is called with the scope of the request when the response starts and returning
+    None leaves the header out of that response.
+
+    Example :
+        HeaderProvider('X-Robots-Tag', 'noindex', Types=('http',), Conflict='keep')
+
+    Parameters :
+        Name (str): The header name.
+        Value (Union[str, ValueFunction]): The static header value or a function returning the value for the request.
+        Types (Iterable[ScopeTypeLiteral], optional): The scope types the header is set on, 'websocket' sets it on the websocket handshake. Defaults to ('http',).
+        Conflict (ConflictLiteral, optional): What happens when the application already set the header, 'keep' keeps the value of the application, 'replace' replaces it and 'append' adds a second header. Defaults to 'keep'.
+
+    '''
+    __slots__ = ('name', 'value', 'function', 'types', 'conflict')
+
+    def __init__(self, Name: str, Value: Union[str, ValueFunction], Types: Iterable[ScopeTypeLiteral] = ('http',), Conflict: ConflictLiteral = 'keep'):
+        """
+        Initializes the class and validates the header.
+
+        Args:
+            Name (str): The header name.
+            Value (Union[str, ValueFunction]): The static header value or a function returning the value for the request.
+            Types (Iterable[ScopeTypeLiteral], optional): The scope types the header is set on. Defaults to ('http',).
+            Conflict (ConflictLiteral, optional): 'keep', 'replace' or 'append' when the application already set the header. Defaults to 'keep'.
+
+        Raises:
+            SyntaxError: If the name, the value, the types or the conflict policy are not valid.
+
+        Returns:
+            None
+        """
+        if not TOKEN_RE.match(Name):
+            raise SyntaxError(f'{Name} is not a valid header name')
+
+        types = frozenset(Types)
+        if not types or types - {'http', 'websocket'}:
+            raise SyntaxError('Types has 2 options 1> "http" 2> "websocket"')
+
+        if Conflict not in ('keep', 'replace', 'append'):
+            raise SyntaxError('Conflict has 3 options 1> "keep" 2> "replace" 3> "append"')
+
+        self.name = Name.lower().encode('latin-1')
+        self.types = types
+        self.conflict = Conflict
+        if callable(Value):
+            self.value: Optional[bytes] = None
+            self.function: Optional[ValueFunction] = Value
+        else:
+            self.value = encode_value(Value)
+            self.function = None
+
+
+def encode_value(value: str) -> bytes:
+    """
+    Encode a header value, rejecting values that could split the response headers.
+
+    Args:
+        value (str): The header value.
+
+    Raises:
+        SyntaxError: If the value contains CR, LF or NUL or is not latin-1.
+
+    Returns:
+        bytes: The latin-1 encoded value.
+    """
+    if '\r' in value or '\n' in value or '\x00' in value:
+        raise SyntaxError('Header values cannot contain CR, LF or NUL')
+    try:
+        return value.encode('latin-1')
+    except UnicodeEncodeError:
+        raise SyntaxError('Header values need to be latin-1') from None
+
+
+def apply_providers(raw: list[tuple[bytes, bytes]], scope: Scope, providers: Iterable[HeaderProvider]) -> list[tuple[bytes, bytes]]:
+    """
+    Apply the providers that depend on the response or the request to the headers of a response.
+
+    Args:
+        raw (list[tuple[bytes, bytes]]): The headers of the response, the compiled static headers already appended.
+        scope (Scope): The scope of the request.
+        providers (Iterable[HeaderProvider]): The providers with a value function or a 'keep' or 'replace' conflict policy.
+
+    Raises:
+        SyntaxError: If a value function returns a value that is not a valid header value.
+
+    Returns:
+        list[tuple[bytes, bytes]]: The headers of the response.
+    """
+    present = {name.lower() for name, _ in raw}
+    for provider in providers:
+        if provider.conflict == 'keep' and provider.name in present:
+            continue
+        value = provider.value
+        if provider.function is not None:
+            text = provider.function(scope)
+            if text is None:
+                continue
+            value = encode_value(text)
+        if provider.conflict == 'replace' and provider.name in present:
+            raw = [header for header in raw if header[0].lower() != provider.name]
+        raw.append((provider.name, value))
+        present.add(provider.name)
+    return raw
+
+
+def register_header(Name: str, Value: Union[str, ValueFunction], Types: Iterable[ScopeTypeLiteral] = ('http',), Conflict: ConflictLiteral = 'keep') -> HeaderProvider:
+    """
+    Register a custom header provider, it is emitted by every SecWeb set up after the registration.
+
+    Example :
+        register_header('Permissions-Policy', 'camera=(), microphone=()')
+        register_header('X-Tenant', lambda scope: scope['state'].get('tenant'), Conflict='replace')
+
+    Args:
+        Name (str): The header name, registering a name again replaces its provider.
+        Value (Union[str, ValueFunction]): The static header value or a function returning the value for the request.
+        Types (Iterable[ScopeTypeLiteral], optional): The scope types the header is set on. Defaults to ('http',).
+        Conflict (ConflictLiteral, optional): 'keep', 'replace' or 'append' when the application already set the header. Defaults to 'keep'.
+
+    Raises:
+        SyntaxError: If the header is not valid.
+
+    Returns:
+        HeaderProvider: The registered provider.
+    """
+    provider = HeaderProvider(Name, Value, Types, Conflict)
+    __PROVIDERS__[provider.name] = provider
+    return provider
+
+
+def unregister_header(Name: str) -> None:
+    """
+    Remove a custom header provider.
+
+    Args:
+        Name (str): The header name.
+
+    Returns:
+        None
+    """
+    __PROVIDERS__.pop(Name.lower().encode('latin-1'), None)
+
+
+def registered_headers() -> tuple[HeaderProvider, ...]:
+    """
+    The registered custom header providers in registration order.
+
+    Returns:
+        tuple[HeaderProvider, ...]: The providers.
+    """
+    return tuple(__PROVIDERS__.values())
@@ -0,0 +1,111 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from .ClearSiteData.ClearSiteDataMiddleware import __path_regex_builder__
+
+
+class RouteMatcher:
+    ''' RouteMatcher class matches request paths against static routes with a set lookup and against templated routes with regular expressions.
+
+    Example :
+        RouteMatcher(['/analytics', '/reports/{id:int}']).match('/reports/4')
+
+    Parameter :
+        Routes (list): The list of routes in the Clear-Site-Data route format.
+
+    '''
+    __slots__ = ('static', 'pathregex')
+
+    def __init__(self, Routes: list[str]):
+        """
+        Splits the routes into static and templated routes.
+
+        Args:
+            Routes (list[str]): The list of routes, eg. ['/analytics', '/reports/{id}'].
+
+        Returns:
+            None
+        """
+        self.static = frozenset(route for route in Routes if '{' not in route)
+        self.pathregex = [__path_regex_builder__(route) for route in Routes if '{' in route]
+
+    def __bool__(self) -> bool:
+        return bool(self.static or self.pathregex)
+
+    def match(self, path: str) -> bool:
+        """
+        Checks if the path matches one of the routes.
+
+        Args:
+            path (str): The request path.
+
+        Returns:
+            bool: True if the path matches.
+        """
+        if path in self.static:
+            return True
+        for i in self.pathregex:
+            if i.match(path):
+                return True
+        return False
+
+
+class PathTrie:
+    ''' PathTrie class matches request paths against path prefixes with a trie of path segments.
+
+    A prefix matches the path itself and every path below it, '/metrics' matches '/metrics' and '/metrics/jobs' but not '/metricsfoo'.
+
+    Example :
+        PathTrie(['/metrics', '/internal/debug']).match('/metrics/jobs')
+
+    Parameter :
+        Prefixes (list): The list of path prefixes.
+
+    '''
+    __slots__ = ('root',)
+
+    def __init__(self, Prefixes: list[str]):
+        """
+        Builds the trie of the prefixes.
+
+        Args:
+            Prefixes (list[str]): The list of path prefixes, eg. ['/metrics'].
+
+        Returns:
+            None
+        """
+        self.root: dict = {}
+        for prefix in Prefixes:
+            node = self.root
+            for segment in prefix.strip('/').split('/') if prefix.strip('/') else []:
+                node = node.setdefault(segment, {})
+            node[None] = True
+
+    def __bool__(self) -> bool:
+        return bool(self.root)
+
+    def match(self, path: str) -> bool:
+        """
+        Checks if the path is one of the prefixes or below one of them.
+
+        Args:
+            path (str): The request path.
+
+        Returns:
+            bool: True if the path matches.
+        """
+        node = self.root
+        start = 1
+        while True:
+            if None in node:
+                return True
+            end = path.find('/', start)
+            node = node.get(path[start:] if end == -1 else path[start:end])
+            if node is None:
+                return False
+            if end == -1:
+                return None in node
+            start = end + 1
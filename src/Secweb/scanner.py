@@ -0,0 +1,272 @@
+'''  This Source Code Form is subject to the terms of the Mozilla Public
+  License, v. 2.0. If a copy of the MPL was not distributed with this
+  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+  Copyright 2021-2026, Motagamwala Taha Arif Ali '''
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+from json import dump, load
+from mmap import ACCESS_READ, mmap
+from os import scandir, stat
+from re import IGNORECASE, compile
+from typing import Iterable, Iterator, Optional, TypedDict
+
+EXTENSIONS = frozenset(['.html', '.htm', '.jinja', '.jinja2', '.j2', '.tpl', '.xhtml', '.svg', '.vue', '.svelte', '.js', '.mjs', '.cjs', '.jsx', '.ts', '.tsx', '.css', '.scss', '.less'])
+MMAP_THRESHOLD = 1 << 20
+CACHE_VERSION = 1
+
+TAG_RE = compile(rb'<(script|img|iframe|frame|video|audio|source|track|embed|object|link|form)\b([^>]*)>', IGNORECASE)
+ATTR_RE = compile(rb'\b(src|href|data|action|srcset|poster|rel|as)\s*=\s*["\']([^"\']*)["\']', IGNORECASE)
+CONNECT_RE = compile(rb'(?:\bfetch\s*\(|\bnew\s+(?:WebSocket|EventSource)\s*\(|\.open\s*\(\s*["\'][A-Za-z]+["\']\s*,|\baxios(?:\.[a-z]+)?\s*\(|\bsendBeacon\s*\()\s*["\'`]([^"\'`]+)["\'`]')
+CSS_RE = compile(rb'@import\s+(?:url\(\s*)?["\']?(?P<imp>[^"\')\s;]+)|url\(\s*["\']?(?P<url>[^"\')\s]+)', IGNORECASE)
+ORIGIN_RE = compile(rb'^(?:(https?|wss?):)?//(?:[^/?#@]*@)?([^/?#\s]+)', IGNORECASE)
+FONT_RE = compile(rb'\.(?:woff2?|ttf|otf|eot)(?:[?#]|$)', IGNORECASE)
+
+TAG_DIRECTIVES = {
+    b'script': 'script-src',
+    b'img': 'img-src',
+    b'iframe': 'frame-src',
+    b'frame': 'frame-src',
+    b'video': 'media-src',
+    b'audio': 'media-src',
+    b'source': 'media-src',
+    b'track': 'media-src',
+    b'embed': 'object-src',
+    b'object': 'object-src',
+    b'form': 'form-action',
+}
+LINK_DIRECTIVES = {
+    b'stylesheet': 'style-src',
+    b'icon': 'img-src',
+    b'manifest': 'manifest-src',
+    b'modulepreload': 'script-src',
+}
+PRELOAD_DIRECTIVES = {
+    b'script': 'script-src',
+    b'style': 'style-src',
+    b'font': 'font-src',
+    b'image': 'img-src',
+    b'fetch': 'connect-src',
+}
+
+Finding = tuple[str, str, int]
+
+ScanReport = TypedDict(
+    'ScanReport',
+    {
+        'policy': dict[str, list[str]],
+        'counts': dict[str, dict[str, int]],
+        'files': int,
+        'scanned': int
+    }
+)
+
+
+def __origin__(url: bytes) -> Optional[str]:
+    """
+    Reduce an absolute or protocol relative URL to its CSP source.
+
+    Args:
+        url (bytes): The URL found in the file.
+
+    Returns:
+        Optional[str]: The scheme, host and port eg. 'https://cdn.example.com', the host for protocol relative URLs or None for relative URLs and template expressions.
+    """
+    if b'{' in url or b'$' in url or b'<' in url:
+        return None
+    match = ORIGIN_RE.match(url.strip())
+    if match is None:
+        return None
+    scheme, host = match.groups()
+    host = host.lower().decode('latin-1')
+    return host if scheme is None else f'{scheme.lower().decode("latin-1")}://{host}'
+
+
+def __link_directive__(attributes: dict[bytes, bytes]) -> Optional[str]:
+    """
+    Find the directive of a link element from its rel and as attributes.
+
+    Args:
+        attributes (dict[bytes, bytes]): The lower-cased attributes of the element.
+
+    Returns:
+        Optional[str]: The directive or None for links that are not loaded as subresources.
+    """
+    for rel in attributes.get(b'rel', b'').split():
+        if rel in LINK_DIRECTIVES:
+            return LINK_DIRECTIVES[rel]
+        if rel == b'preload' or rel == b'prefetch':
+            return PRELOAD_DIRECTIVES.get(attributes.get(b'as', b''))
+    return None
+
+
+def scan_buffer(buffer: bytes) -> list[Finding]:
+    """
+    Extract the origins used by the src, href, fetch and XHR calls, @import and url() of a file.
+
+    Args:
+        buffer (bytes): The contents of the file, a memory map works too.
+
+    Returns:
+        list[Finding]: The directive, the source and the number of occurrences.
+    """
+    found: Counter[tuple[str, str]] = Counter()
+
+    for tag in TAG_RE.finditer(buffer):
+        name = tag.group(1).lower()
+        attributes = {key.lower(): value for key, value in ATTR_RE.findall(tag.group(2))}
+        directive = __link_directive__(attributes) if name == b'link' else TAG_DIRECTIVES[name]
+        if directive is None:
+            continue
+        for key in (b'src', b'href', b'data', b'action'):
+            if key in attributes:
+                origin = __origin__(attributes[key])
+                if origin is not None:
+                    found[directive, origin] += 1
+        for candidate in attributes.get(b'srcset', b'').split(b','):
+            origin = __origin__(candidate.strip().split(b' ')[0])
+            if origin is not None:
+                found['img-src' if name != b'source' else directive, origin] += 1
+        if b'poster' in attributes:
+            origin = __origin__(attributes[b'poster'])
+            if origin is not None:
+                found['img-src', origin] += 1
+
+    for call in CONNECT_RE.finditer(buffer):
+        origin = __origin__(call.group(1))
+        if origin is not None:
+            found['connect-src', origin] += 1
+
+    for css in CSS_RE.finditer(buffer):
+        if css.group('imp') is not None:
+            directive, url = 'style-src', css.group('imp')
+        else:
+            url = css.group('url')
+            directive = 'font-src' if FONT_RE.search(url) else 'img-src'
+        origin = __origin__(url)
+        if origin is not None:
+            found[directive, origin] += 1
+
+    return [(directive, origin, count) for (directive, origin), count in found.items()]
+
+
+def scan_file(path: str) -> tuple[str, str, list[Finding]]:
+    """
+    Hash and scan a file, files larger than MMAP_THRESHOLD are memory mapped instead of read.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        tuple[str, str, list[Finding]]: The path, the content hash and the findings.
+    """
+    with open(path, 'rb') as file:
+        size = stat(file.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap(file.fileno(), 0, access=ACCESS_READ) as buffer:
+                return (path, blake2b(buffer, digest_size=16).hexdigest(), scan_buffer(buffer))
+        buffer = file.read()
+    return (path, blake2b(buffer, digest_size=16).hexdigest(), scan_buffer(buffer))
+
+
+def walk(paths: Iterable[str], extensions: frozenset[str] = EXTENSIONS) -> Iterator[tuple[str, int, int]]:
+    """
+    Walk the template and static trees.
+
+    Args:
+        paths (Iterable[str]): The directories or files to scan.
+        extensions (frozenset[str], optional): The file extensions that are scanned. Defaults to EXTENSIONS.
+
+    Returns:
+        Iterator[tuple[str, int, int]]: The path, modification time and size of every file.
+    """
+    stack = list(paths)
+    while stack:
+        path = stack.pop()
+        try:
+            entries = scandir(path)
+        except NotADirectoryError:
+            info = stat(path)
+            yield (path, info.st_mtime_ns, info.st_size)
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith('.') and entry.name != 'node_modules':
+                        stack.append(entry.path)
+                elif entry.is_file() and entry.name[entry.name.rfind('.'):].lower() in extensions:
+                    info = entry.stat()
+                    yield (entry.path, info.st_mtime_ns, info.st_size)
+
+
+def scan(paths: Iterable[str], Workers: Optional[int] = None, Cache: Optional[str] = None, Exclude: Iterable[str] = (), extensions: frozenset[str] = EXTENSIONS) -> ScanReport:
+    """
+    Scan the template and static trees in a process pool and propose a CSP allowlist.
+
+    Files whose modification time and size did not change since the last run reuse the findings stored in the cache,
+    the findings are keyed by content hash and duplicated files share one entry.
+
+    Args:
+        paths (Iterable[str]): The directories or files to scan.
+        Workers (int, optional): The number of processes, 0 scans in this process and None uses the number of CPUs. Defaults to None.
+        Cache (str, optional): The path of the incremental cache file. Defaults to None.
+        Exclude (Iterable[str], optional): The origins of the site itself, they are covered by 'self'. Defaults to ().
+        extensions (frozenset[str], optional): The file extensions that are scanned. Defaults to EXTENSIONS.
+
+    Returns:
+        ScanReport: The suggested policy, the occurrence count of every source, the number of files and the number of files scanned.
+    """
+    files: dict[str, list] = {}
+    results: dict[str, list[Finding]] = {}
+    if Cache is not None:
+        try:
+            with open(Cache) as file:
+                cache = load(file)
+            if cache.get('version') == CACHE_VERSION:
+                files, results = cache['files'], cache['results']
+        except (OSError, ValueError):
+            pass
+
+    seen: dict[str, list] = {}
+    pending: list[str] = []
+    for path, mtime, size in walk(paths, extensions):
+        entry = files.get(path)
+        if entry is not None and entry[0] == mtime and entry[1] == size and entry[2] in results:
+            seen[path] = entry
+        else:
+            seen[path] = [mtime, size, None]
+            pending.append(path)
+
+    if pending:
+        if Workers == 0 or len(pending) < 64:
+            scanned: Iterable[tuple[str, str, list[Finding]]] = map(scan_file, pending)
+            for path, digest, findings in scanned:
+                seen[path][2] = digest
+                results.setdefault(digest, findings)
+        else:
+            with ProcessPoolExecutor(Workers) as executor:
+                for path, digest, findings in executor.map(scan_file, pending, chunksize=64):
+                    seen[path][2] = digest
+                    results.setdefault(digest, findings)
+
+    live = {entry[2] for entry in seen.values()}
+    results = {digest: findings for digest, findings in results.items() if digest in live}
+    if Cache is not None:
+        with open(Cache, 'w') as file:
+            dump({'version': CACHE_VERSION, 'files': seen, 'results': results}, file)
+
+    exclude = {origin.rstrip('/').lower() for origin in Exclude}
+    counts: dict[str, Counter[str]] = {}
+    for entry in seen.values():
+        for directive, origin, count in results[entry[2]]:
+            if origin not in exclude:
+                counts.setdefault(directive, Counter())[origin] += count
+
+    return {
+        'policy': {directive: ["'self'", *[origin for origin, _ in counter.most_common()]] for directive, counter in sorted(counts.items())},
+        'counts': {directive: dict(counter.most_common()) for directive, counter in sorted(counts.items())},
+        'files': len(seen),
+        'scanned': len(pending),
+    }
@@ -4,8 +4,10 @@
 
   Copyright 2021-2026, Motagamwala Taha Arif Ali '''
 
-from starlette.datastructures import MutableHeaders
-from starlette.types import Send, Receive, Scope, Message, ASGIApp
+from ..datastructures import MutableHeaders
+from ..asgi import Send, Receive, Scope, Message, ASGIApp
+
+from ..dedupe import already_applied
 
 
 class xXSSProtection:
@@ -39,7 +41,7 @@ class xXSSProtection:
         Returns:
             None
         """ 
-        if scope["type"] != "http":
+        if scope["type"] != "http" or already_applied(scope, b'x-xss-protection'):
             return await self.app(scope, receive, send)
 
         async def set_x_XSS_Protection(message: Message):